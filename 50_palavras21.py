@@ -1,75 +1,82 @@
-import pandas as pd
 import re
 from collections import Counter
-from nltk.corpus import stopwords
-from nltk.util import ngrams 
-import nltk
-from wordcloud import WordCloud 
-import matplotlib.pyplot as plt 
-import matplotlib.font_manager as fm 
 import platform 
 import csv 
+from noticia import carregar_noticias
+from tokenizacao import carregar_stopwords, clean_and_tokenize as tokenizar
+
+# pandas, matplotlib e wordcloud são importados apenas dentro das funções que os usam,
+# para que importar este módulo (ex: pelo otempo.py ou pelo benchmark.py) seja rápido.
+
+
+def configurar_fonte_graficos():
+    """
+    Configuração para garantir que o Matplotlib use uma fonte que suporte acentuação.
+    Retorna o módulo matplotlib.pyplot já configurado.
+    """
+    import matplotlib.pyplot as plt
 
-# Configuração para garantir que o Matplotlib use uma fonte que suporte acentuação
-try:
-    plt.rcParams['font.family'] = 'DejaVu Sans'
-    plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
-except Exception as e:
-    print(f"Aviso: Não foi possível configurar a fonte para 'DejaVu Sans'. Acentuação em gráficos pode não aparecer. Erro: {e}")
     try:
-        if 'Windows' in platform.system():
-            plt.rcParams['font.family'] = 'Arial'
-            plt.rcParams['font.sans-serif'] = ['Arial']
-    except Exception as e_fallback:
-        print(f"Aviso: Fallback para Arial também falhou. Gráficos podem ter problemas de acentuação. Erro: {e_fallback}")
+        plt.rcParams['font.family'] = 'DejaVu Sans'
+        plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
+    except Exception as e:
+        print(f"Aviso: Não foi possível configurar a fonte para 'DejaVu Sans'. Acentuação em gráficos pode não aparecer. Erro: {e}")
+        try:
+            if 'Windows' in platform.system():
+                plt.rcParams['font.family'] = 'Arial'
+                plt.rcParams['font.sans-serif'] = ['Arial']
+        except Exception as e_fallback:
+            print(f"Aviso: Fallback para Arial também falhou. Gráficos podem ter problemas de acentuação. Erro: {e_fallback}")
+    return plt
+
 
+def ngrams(words, n):
+    """Sequência de n-grams (tuplas) de uma lista de palavras, como `nltk.util.ngrams`."""
+    return zip(*(words[i:] for i in range(n)))
 
-def encontrar_palavras_mais_usadas():
+
+def contar_ngrams(textos, n, stop_words):
+    """
+    Conta os n-grams de uma sequência de textos, aplicando as regras de limpeza de tokenizacao.py.
+    Retorna um Counter com os n-grams unidos por espaço.
+    """
+    ngram_counts = Counter()
+    for text in textos:
+        words = tokenizar(text, stop_words)
+        ngram_counts.update(' '.join(gram) for gram in ngrams(words, n))
+    return ngram_counts
+
+
+def encontrar_palavras_mais_usadas(csv_file_path=None, graficos='exibir'):
     """
     Este script encontra as palavras mais usadas, bigrams e trigrams nos títulos,
     subtítulos e texto completo das notícias de um arquivo CSV gerado pela raspagem.
     Também gera nuvens de palavras e gráficos de barras para as tags,
     e salva todos os resultados em um arquivo CSV consolidado.
+    Se `csv_file_path` não for informado, o nome do arquivo é pedido no terminal. Aceita também
+    um arquivo `.parquet` gravado por `LoteNoticias` (noticia.py), que já traz as tags separadas.
+    `graficos` pode ser 'exibir' (janelas do Matplotlib), 'salvar' (arquivos PNG) ou 'nenhum'.
+    Retorna True se a análise foi concluída e False em caso de erro (já exibido no terminal).
     """
-    csv_file_name_input = input("Por favor, digite o NOME COMPLETO do arquivo CSV a ser analisado (ex: noticias_otempo_cafe_com_politica_completo.csv): ")
-    
-    csv_file_path = csv_file_name_input 
+    if csv_file_path is None:
+        csv_file_path = input("Por favor, digite o NOME COMPLETO do arquivo CSV a ser analisado (ex: noticias_otempo_cafe_com_politica_completo.csv): ")
 
     print(f"\nTentando ler o arquivo CSV: {csv_file_path}")
 
     try:
-        df = pd.read_csv(csv_file_path, encoding='utf-8')
+        import pandas as pd
+
+        # Lê as notícias já tipadas: tags como listas e erros de coleta como valores nulos.
+        df = carregar_noticias(csv_file_path).para_pandas()
+        output_base_name = csv_file_path.rsplit('.', 1)[0]
 
         print("\nArquivo CSV lido com sucesso!")
         
-        # Garante que as stopwords do NLTK foram baixadas.
-        try:
-            stopwords.words('portuguese')
-        except LookupError:
-            print("Baixando stopwords do NLTK. Isso só acontecerá uma vez.")
-            nltk.download('stopwords')
-            
-        stop_words_pt = set(stopwords.words('portuguese'))
-        # === AQUI ESTÃO AS NOVAS STOPWORDS ADICIONADAS ===
-        stop_words_pt.update(['tempo', 'de acordo', 'noticia', 'notícias', 'diz', 'vai', 'pode', 'anos', 'um', 'uma', 'dois', 'duas', 'ser', 'ter', 'fazer', 'são', 'deve', 'feira', 'conforme', 'segundo', 'em']) # Adicionado 'em' também, que é muito comum.
-        # =================================================
-
-        # Função auxiliar para limpar e tokenizar o texto
-        def clean_and_tokenize(text):
-            clean_text = re.sub(r'[^a-zA-ZáéíóúãõâêôàçüÁÉÍÓÚÃÕÂÊÔÀÇÜ\s-]', '', text).lower()
-            words = clean_text.split()
-            filtered_words = [word for word in words if word not in stop_words_pt and len(word) > 2]
-            return filtered_words
+        stop_words_pt = carregar_stopwords()
 
         # Função auxiliar para processar e contar N-grams de uma coluna
         def processar_e_contar_ngrams(column_series, n=1, top_n=50, title_prefix=""):
-            all_ngrams = []
-            for text in column_series.dropna(): 
-                words = clean_and_tokenize(text)
-                current_ngrams = list(ngrams(words, n))
-                all_ngrams.extend([' '.join(gram) for gram in current_ngrams])
-            
-            ngram_counts = Counter(all_ngrams)
+            ngram_counts = contar_ngrams(column_series.dropna(), n, stop_words_pt)
             
             # Print no terminal
             print(f"\n--- Analisando os {top_n} {title_prefix} ({n}-grams) ---")
@@ -80,14 +87,28 @@ def encontrar_palavras_mais_usadas():
             print("---------------------------------\n")
             return ngram_counts.most_common(top_n) 
 
+        # Função auxiliar para exibir ou salvar a figura atual, conforme o parâmetro `graficos`
+        def finalizar_grafico(plt, title):
+            if graficos == 'salvar':
+                nome_grafico = re.sub(r'[^\w\s-]', '', title).strip().replace(' ', '_').lower()
+                plt.savefig(f'{output_base_name}_{nome_grafico}.png', bbox_inches='tight')
+                plt.close()
+            else:
+                plt.show()
+
         # Função auxiliar para gerar e exibir Nuvem de Palavras
         def gerar_e_exibir_nuvem(text_series, title, stop_words):
+            if graficos == 'nenhum':
+                return
             full_text = ' '.join(text_series.fillna('').astype(str).tolist())
             
             if not full_text.strip(): 
                 print(f"Não há texto suficiente na coluna '{title}' para gerar a nuvem de palavras. Pulando.")
                 return 
 
+            from wordcloud import WordCloud
+
+            plt = configurar_fonte_graficos()
             wordcloud = WordCloud(
                 width=800, 
                 height=400, 
@@ -102,10 +123,12 @@ def encontrar_palavras_mais_usadas():
             plt.imshow(wordcloud, interpolation='bilinear') 
             plt.axis('off') 
             plt.title(f"Nuvem de Palavras: {title}") 
-            plt.show() 
+            finalizar_grafico(plt, f"Nuvem de Palavras {title}")
 
         # Função auxiliar para gerar e exibir Gráfico de Barras (para tags)
         def gerar_e_exibir_grafico_barras(data, title, x_label, y_label, top_n=20):
+            if graficos == 'nenhum':
+                return
             if not data:
                 print(f"Não há dados para gerar o gráfico de barras para '{title}'. Pulando.")
                 return
@@ -113,6 +136,7 @@ def encontrar_palavras_mais_usadas():
             labels = [item[0] for item in data[:top_n]]
             counts = [item[1] for item in data[:top_n]]
 
+            plt = configurar_fonte_graficos()
             plt.figure(figsize=(12, 6))
             plt.barh(labels[::-1], counts[::-1], color='skyblue') 
             plt.xlabel(x_label)
@@ -120,7 +144,7 @@ def encontrar_palavras_mais_usadas():
             plt.title(title)
             plt.grid(axis='x', linestyle='--', alpha=0.7)
             plt.tight_layout() 
-            plt.show()
+            finalizar_grafico(plt, title)
 
         # === LISTAS PARA ARMAZENAR RESULTADOS PARA SALVAMENTO ===
         resultados_frequencia = []
@@ -160,33 +184,26 @@ def encontrar_palavras_mais_usadas():
         # === INÍCIO DA ANÁLISE DE TAGS E GERAÇÃO DE GRÁFICOS ===
         print("--- INÍCIO DA ANÁLISE DE TAGS ---")
         top_tags_results = [] # Para armazenar as tags mais comuns para salvamento
-        if 'tags_noticia' in df.columns and not df['tags_noticia'].isnull().all():
-            all_tags = []
-            for tags_str in df['tags_noticia'].dropna():
-                tags_list = [tag.strip() for tag in tags_str.split(',') if tag.strip()]
-                all_tags.extend(tags_list)
-            
-            if all_tags: 
-                tag_counts = Counter(all_tags)
-                top_tags_results = tag_counts.most_common(50) # Top 50 tags para lista e salvamento
-
-                # Exibir lista das tags mais frequentes no terminal
-                print("\n--- 50 Tags Mais Frequentes (Lista) ---")
-                print("Tag                 | Frequência")
-                print("---------------------------------")
-                for tag, count in top_tags_results:
-                    print(f"{tag:<19} | {count}")
-                print("---------------------------------\n")
-
-                # Gerar gráfico de barras para as tags (top 20 para visualização)
-                gerar_e_exibir_grafico_barras(top_tags_results, "20 Tags Mais Frequentes nas Notícias", "Frequência", "Tag", top_n=20)
-
-                # Gerar Nuvem de Palavras para Tags (top 100 para visualização)
-                gerar_e_exibir_nuvem(pd.Series(all_tags), "Tags das Notícias (Nuvem)", stop_words_pt)
-            else:
-                print("Coluna 'tags_noticia' encontrada, mas sem tags válidas para análise.\n")
+        all_tags = [tag for tags in df['tags'] for tag in tags]
+        if all_tags: 
+            tag_counts = Counter(all_tags)
+            top_tags_results = tag_counts.most_common(50) # Top 50 tags para lista e salvamento
+
+            # Exibir lista das tags mais frequentes no terminal
+            print("\n--- 50 Tags Mais Frequentes (Lista) ---")
+            print("Tag                 | Frequência")
+            print("---------------------------------")
+            for tag, count in top_tags_results:
+                print(f"{tag:<19} | {count}")
+            print("---------------------------------\n")
+
+            # Gerar gráfico de barras para as tags (top 20 para visualização)
+            gerar_e_exibir_grafico_barras(top_tags_results, "20 Tags Mais Frequentes nas Notícias", "Frequência", "Tag", top_n=20)
+
+            # Gerar Nuvem de Palavras para Tags (top 100 para visualização)
+            gerar_e_exibir_nuvem(pd.Series(all_tags), "Tags das Notícias (Nuvem)", stop_words_pt)
         else:
-            print("Coluna 'tags_noticia' não encontrada ou vazia no CSV. Pulando análise de tags.\n")
+            print("Nenhuma tag válida encontrada nas notícias. Pulando análise de tags.\n")
         print("\n--- FIM DA ANÁLISE DE TAGS ---\n")
 
         # === GERAÇÃO DE NUVEM DE PALAVRAS (para Títulos, Subtítulos e Texto Completo) ===
@@ -201,7 +218,6 @@ def encontrar_palavras_mais_usadas():
         print("\n--- FIM DA GERAÇÃO DE NUVEM DE PALAVRAS (geral) ---\n")
 
         # === SALVAR TODOS OS RESULTADOS DE FREQUÊNCIA EM UM CSV CONSOLIDADO ===
-        output_base_name = csv_file_path.rsplit('.', 1)[0]
         results_csv_path = f'{output_base_name}_analise_textual.csv'
         
         consolidated_data = []
@@ -224,13 +240,14 @@ def encontrar_palavras_mais_usadas():
             print("Resultados da análise textual salvos com sucesso!")
         else:
             print("Nenhum resultado de análise textual para salvar.")
-        
+        return True
 
     except FileNotFoundError:
         print(f"Erro: O arquivo '{csv_file_path}' não foi encontrado.")
         print("Verifique se o nome digitado está correto e se o arquivo está na mesma pasta do script.")
     except Exception as e:
         print(f"Ocorreu um erro ao ler ou processar o arquivo CSV: {e}")
+    return False
 
 if __name__ == "__main__":
     encontrar_palavras_mais_usadas()
\ No newline at end of file
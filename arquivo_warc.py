@@ -0,0 +1,222 @@
+import argparse
+from base64 import b32encode
+import glob
+import gzip
+import os
+import threading
+import uuid
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from hashlib import sha1
+
+"""
+Documentação do Script: arquivo_warc.py
+
+Propósito:
+----------
+Arquivamento das páginas baixadas pelo raspador em arquivos WARC compactados (`.warc.gz`)
+e reextração offline dos dados a partir desses arquivos.
+
+O layout do site O Tempo muda com frequência. Sem o HTML original, corrigir as classes do
+raspador exige repetir toda a raspagem (horas). Com as páginas arquivadas, basta corrigir
+`extrair_item_busca`/`extrair_detalhes_noticia` em `extracao.py` e rodar:
+
+    python arquivo_warc.py noticias_reextraidas.csv warc/*.warc.gz --processos 8
+
+A reextração distribui a leitura do HTML entre vários processos e reconstrói o CSV,
+na mesma ordem dos resultados de busca, com as mesmas colunas da raspagem. Não depende
+do Selenium. Itens de busca cuja página de notícia não foi arquivada (ex: raspagem limitada
+por número de notícias) ficam de fora do CSV, em vez de aparecerem como erros de coleta.
+Apenas algumas páginas por processo (REGISTROS_EM_ANDAMENTO_POR_PROCESSO) ficam na memória
+ao mesmo tempo, mesmo com arquivos WARC de vários GB.
+
+Formato:
+--------
+Cada página é um registro WARC/1.1 do tipo `resource` (o HTML vem do navegador, sem os
+cabeçalhos HTTP), compactado como um membro gzip independente, como é usual em `.warc.gz`.
+O cabeçalho `OTempo-Tipo-Pagina` indica se o registro é uma página de `busca` ou de `noticia`.
+Os arquivos são rotacionados ao atingir `tamanho_maximo` bytes.
+"""
+
+TAMANHO_MAXIMO_PADRAO = 1024 ** 3  # 1 GB por arquivo, como recomendado para WARC
+
+REGISTROS_EM_ANDAMENTO_POR_PROCESSO = 8  # Páginas enviadas aos processos e ainda não extraídas, por processo.
+
+
+def _cabecalhos(campos):
+    linhas = ['WARC/1.1'] + [f'{nome}: {valor}' for nome, valor in campos]
+    return ('\r\n'.join(linhas) + '\r\n\r\n').encode('utf-8')
+
+
+def _data_warc():
+    return datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class GravadorWarc:
+    """Grava páginas HTML em arquivos `<prefixo>-00001.warc.gz`, `<prefixo>-00002.warc.gz`, ..."""
+
+    def __init__(self, pasta, prefixo='otempo', tamanho_maximo=TAMANHO_MAXIMO_PADRAO):
+        self.pasta = pasta
+        self.prefixo = prefixo
+        self.tamanho_maximo = tamanho_maximo
+        self.numero_arquivo = 0
+        self.arquivo = None
+        self.caminho = None
+        self.registros = 0
+        self.trava = threading.Lock()  # Permite gravar a partir de várias threads (planejador_busca.py).
+        os.makedirs(pasta, exist_ok=True)
+
+    def _abrir_proximo(self):
+        self.fechar()
+        # Nunca sobrescreve arquivos de raspagens anteriores na mesma pasta.
+        while True:
+            self.numero_arquivo += 1
+            self.caminho = os.path.join(self.pasta, f'{self.prefixo}-{self.numero_arquivo:05d}.warc.gz')
+            if not os.path.exists(self.caminho):
+                break
+        self.arquivo = open(self.caminho, 'wb')
+        info = 'software: O Tempo Scraper News\r\nformat: WARC File Format 1.1\r\n'.encode('utf-8')
+        self._escrever_registro([
+            ('WARC-Type', 'warcinfo'),
+            ('WARC-Date', _data_warc()),
+            ('WARC-Filename', os.path.basename(self.caminho)),
+            ('WARC-Record-ID', f'<urn:uuid:{uuid.uuid4()}>'),
+            ('Content-Type', 'application/warc-fields'),
+        ], info)
+
+    def _escrever_registro(self, campos, conteudo):
+        campos = campos + [('Content-Length', str(len(conteudo)))]
+        # Cada registro é um membro gzip separado, o que permite acesso aleatório e leitura parcial.
+        self.arquivo.write(gzip.compress(_cabecalhos(campos) + conteudo + b'\r\n\r\n'))
+
+    def gravar(self, url, html, tipo_pagina):
+        """Grava o HTML de uma página (`tipo_pagina` é 'busca' ou 'noticia')."""
+        conteudo = html.encode('utf-8')
+        digest = 'sha1:' + b32encode(sha1(conteudo).digest()).decode('ascii')
+        with self.trava:
+            if self.arquivo is None or self.arquivo.tell() >= self.tamanho_maximo:
+                self._abrir_proximo()
+            self._escrever_registro([
+                ('WARC-Type', 'resource'),
+                ('WARC-Target-URI', url),
+                ('WARC-Date', _data_warc()),
+                ('WARC-Record-ID', f'<urn:uuid:{uuid.uuid4()}>'),
+                ('WARC-Block-Digest', digest),
+                ('Content-Type', 'text/html; charset=utf-8'),
+                ('OTempo-Tipo-Pagina', tipo_pagina),
+            ], conteudo)
+            self.registros += 1
+
+    def fechar(self):
+        if self.arquivo is not None:
+            self.arquivo.close()
+            self.arquivo = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def ler_registros(caminho):
+    """Percorre os registros `resource` de um `.warc.gz`, gerando (tipo_pagina, url, html)."""
+    with gzip.open(caminho, 'rb') as arquivo:
+        while True:
+            linha = arquivo.readline()
+            if not linha:
+                break
+            if not linha.strip():
+                continue
+            campos = {}
+            while True:
+                linha = arquivo.readline().rstrip(b'\r\n')
+                if not linha:
+                    break
+                nome, _, valor = linha.decode('utf-8').partition(':')
+                campos[nome.strip()] = valor.strip()
+            conteudo = arquivo.read(int(campos['Content-Length']))
+            if campos.get('WARC-Type') == 'resource':
+                yield campos.get('OTempo-Tipo-Pagina'), campos['WARC-Target-URI'], conteudo.decode('utf-8')
+
+
+def _extrair_registro(registro):
+    """Executado nos processos auxiliares: lê o HTML e aplica o extrator correspondente."""
+    from bs4 import BeautifulSoup
+    from extracao import extrair_detalhes_noticia, extrair_item_busca
+
+    tipo_pagina, url, html = registro
+    soup = BeautifulSoup(html, 'html.parser')
+    if tipo_pagina == 'busca':
+        return tipo_pagina, url, [extrair_item_busca(item, url) for item in soup.find_all('li', class_='ais-Hits-item')]
+    return tipo_pagina, url, extrair_detalhes_noticia(soup, url)
+
+
+def _extrair_em_paralelo(executor, registros, registros_em_andamento):
+    """
+    Como `executor.map`, mas sem enviar todos os registros de uma vez: no máximo `registros_em_andamento`
+    páginas (e o HTML delas) ficam pendentes, e os resultados saem na ordem dos registros.
+    """
+    pendentes = deque()
+    for registro in registros:
+        pendentes.append(executor.submit(_extrair_registro, registro))
+        if len(pendentes) >= registros_em_andamento:
+            yield pendentes.popleft().result()
+    while pendentes:
+        yield pendentes.popleft().result()
+
+
+def reextrair(caminhos, csv_saida, processos=None):
+    """
+    Reconstrói o CSV da raspagem a partir de arquivos WARC, distribuindo a extração entre processos.
+    As notícias saem na ordem em que aparecem nas páginas de busca arquivadas, sem repetições;
+    itens de busca sem a página da notícia arquivada são ignorados.
+    """
+    from noticia import LoteNoticias, Noticia
+
+    def registros():
+        for caminho in caminhos:
+            yield from ler_registros(caminho)
+
+    itens_busca = []
+    detalhes_por_link = {}
+    processos = processos or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        registros_em_andamento = processos * REGISTROS_EM_ANDAMENTO_POR_PROCESSO
+        for tipo_pagina, url, resultado in _extrair_em_paralelo(executor, registros(), registros_em_andamento):
+            if tipo_pagina == 'busca':
+                itens_busca.extend(resultado)
+            else:
+                detalhes_por_link[url] = resultado
+
+    lista_noticias = LoteNoticias()
+    links_vistos = set()
+    nao_arquivadas = 0
+    for titulo, subtitulo, link_noticia in itens_busca:
+        if not (titulo and link_noticia) or link_noticia in links_vistos:
+            continue
+        links_vistos.add(link_noticia)
+        if link_noticia not in detalhes_por_link:
+            nao_arquivadas += 1
+            continue
+        detalhes = detalhes_por_link[link_noticia]
+        lista_noticias.acrescentar(Noticia.de_dict({'titulo': titulo, 'subtitulo': subtitulo, 'link_noticia': link_noticia, **detalhes}))
+    if nao_arquivadas:
+        print(f"{nao_arquivadas} item(ns) de busca sem a página da notícia arquivada foram ignorados.")
+
+    lista_noticias.gravar_csv(csv_saida)
+    return lista_noticias
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reextrai as notícias de arquivos WARC gerados pelo raspador.")
+    parser.add_argument('saida', help="Arquivo CSV a ser gerado.")
+    parser.add_argument('arquivos', nargs='+', help="Arquivos .warc.gz (aceita curingas, ex: warc/*.warc.gz).")
+    parser.add_argument('--processos', type=int, default=None, help="Número de processos (padrão: número de CPUs).")
+    args = parser.parse_args()
+
+    caminhos = sorted(caminho for padrao in args.arquivos for caminho in (glob.glob(padrao) or [padrao]))
+    print(f"Reextraindo notícias de {len(caminhos)} arquivo(s) WARC...")
+    noticias = reextrair(caminhos, args.saida, args.processos)
+    print(f"{len(noticias)} notícias salvas em '{args.saida}'")
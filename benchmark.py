@@ -0,0 +1,343 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import urllib.request
+from datetime import datetime
+
+from corpus_sintetico import TAMANHOS_PADRAO, gravar_corpus_csv
+from servidor_fixtures import NOTICIAS_POR_PAGINA, ServidorFixtures
+
+"""
+Documentação do Script: benchmark.py
+
+Propósito:
+----------
+Suíte de benchmarks offline do projeto. Nada aqui acessa o site real:
+-   **raspagem:** executa `raspar_noticias_otempo` (Selenium + Firefox headless) contra o
+    servidor local de `servidor_fixtures.py`, com latência configurável. Usa um geckodriver
+    local (`--geckodriver`, variável GECKODRIVER ou PATH); sem ele, o benchmark é ignorado,
+    em vez de baixar o driver. O tempo é informado também sem as pausas fixas do raspador
+    (`duracao_sem_pausas_s`), que de outro modo dominam a medida.
+-   **extracao:** mede a leitura do HTML (BeautifulSoup) e a extração dos campos de páginas
+    de busca e de notícia (`extrair_item_busca` e `extrair_detalhes_noticia`).
+-   **ngrams:** mede a contagem de palavras, bigrams e trigrams de `50_palavras21.py`
+    sobre corpora sintéticos (`corpus_sintetico.py`).
+-   **inicializacao:** mede o tempo de partida (processo novo) do `otempo.py` e da importação
+    dos scripts de análise, para acompanhar o custo das dependências pesadas.
+-   **datas:** mede o caminho de datas da análise temporal (`otempo.py temporal`): leitura do CSV
+    com `noticia.carregar_noticias` (que interpreta cada data uma vez, com `interpretar_data`,
+    sem depender do locale), conversão para o pandas e `adicionar_colunas_de_data`, sobre os
+    mesmos corpora. O resultado traz também quantas datas foram interpretadas, para que uma
+    regressão que transforme todas em NaT não passe por ganho de desempenho.
+-   **registros:** compara a memória por notícia das linhas do CSV em dicionários com a dos
+    registros `Noticia` e do `LoteNoticias` (`noticia.py`), mede a conversão para o pandas e confere
+    que o CSV regravado a partir dos registros é igual ao original (`verificar_ida_e_volta`).
+
+Os resultados são salvos em JSON (com o commit do git, a versão do Python e a data), para que
+execuções de versões diferentes do código possam ser comparadas com `--comparar`. Um benchmark
+que falha é registrado como ignorado (com o erro) e os demais continuam.
+
+Uso:
+----
+    python benchmark.py                                    # todos os benchmarks, corpora de 1 mil a 100 mil
+    python benchmark.py ngrams datas --tamanhos 1000000    # só as análises, com 1 milhão de linhas
+    python benchmark.py raspagem --geckodriver /usr/local/bin/geckodriver
+    python benchmark.py --comparar antes.json depois.json  # compara duas execuções
+
+Os corpora sintéticos são gerados uma vez e guardados em `dados_benchmark/`.
+"""
+
+PASTA_DADOS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados_benchmark')
+
+BENCHMARKS = ('inicializacao', 'raspagem', 'extracao', 'ngrams', 'datas', 'registros')
+
+# Comandos cujo tempo de partida é medido pelo benchmark 'inicializacao'.
+COMANDOS_INICIALIZACAO = {
+    'otempo --help': ['otempo.py', '--help'],
+    'otempo ngrams --help': ['otempo.py', 'ngrams', '--help'],
+    'import 50_palavras21': ['-c', "import importlib; importlib.import_module('50_palavras21')"],
+    'import trabalho_dados_dinamico_pandas': ['-c', 'import trabalho_dados_dinamico_pandas'],
+}
+
+
+def medir(funcao, repeticoes=3):
+    """Executa `funcao` `repeticoes` vezes e retorna as estatísticas de tempo (em segundos)."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return {
+        'repeticoes': repeticoes,
+        'min_s': round(min(tempos), 6),
+        'mediana_s': round(statistics.median(tempos), 6),
+        'media_s': round(statistics.mean(tempos), 6),
+    }
+
+
+def caminho_corpus(n_linhas):
+    """Retorna o CSV sintético com `n_linhas` notícias, gerando-o na primeira vez."""
+    os.makedirs(PASTA_DADOS, exist_ok=True)
+    caminho = os.path.join(PASTA_DADOS, f'corpus_{n_linhas}.csv')
+    if not os.path.exists(caminho):
+        print(f"  Gerando corpus sintético com {n_linhas} notícias em '{caminho}'...")
+        gravar_corpus_csv(caminho, n_linhas)
+    return caminho
+
+
+def benchmark_inicializacao(repeticoes=3):
+    """Tempo de partida de um processo Python novo para cada comando de COMANDOS_INICIALIZACAO."""
+    pasta = os.path.dirname(os.path.abspath(__file__))
+    resultados = []
+    for nome, argumentos in COMANDOS_INICIALIZACAO.items():
+        def executar_comando():
+            subprocess.run([sys.executable] + argumentos, cwd=pasta, capture_output=True, check=True)
+        try:
+            estatisticas = medir(executar_comando, repeticoes)
+        except subprocess.CalledProcessError as e:
+            print(f"  {nome}: falhou ({e.stderr.decode('utf-8', 'replace').strip().splitlines()[-1:]})")
+            resultados.append({'benchmark': 'inicializacao', 'parametros': {'comando': nome}, 'ignorado': 'comando falhou'})
+            continue
+        resultados.append({'benchmark': 'inicializacao', 'parametros': {'comando': nome}, **estatisticas})
+        print(f"  {nome}: {estatisticas['mediana_s']:.3f} s")
+    return resultados
+
+
+def benchmark_raspagem(total_paginas=2, latencia=0.1):
+    """
+    Raspagem completa (Selenium) contra o servidor local. `duracao_s` inclui as pausas fixas do
+    raspador (1,5 s + 0,5 s por notícia e 2 s por página); `duracao_sem_pausas_s` as desconta.
+    """
+    from instrumentacao import Instrumentacao
+    from otemposcrapern13 import VARIAVEL_GECKODRIVER, raspar_noticias_otempo
+
+    if not (os.environ.get(VARIAVEL_GECKODRIVER) or shutil.which('geckodriver')):
+        motivo = f"geckodriver local não encontrado (use --geckodriver ou a variável {VARIAVEL_GECKODRIVER})"
+        print(f"  Benchmark 'raspagem' ignorado: {motivo}.")
+        return [{'benchmark': 'raspagem', 'ignorado': motivo}]
+
+    metricas = Instrumentacao()
+    with ServidorFixtures(total_paginas=total_paginas, latencia=latencia) as servidor:
+        inicio = time.perf_counter()
+        noticias = raspar_noticias_otempo('benchmark', metricas=metricas, url_base=servidor.url_base,
+                                          headless=True, interativo=False, limite_paginas=total_paginas)
+        duracao = time.perf_counter() - inicio
+    pausas = metricas.etapas['pausa_fixa'].soma if 'pausa_fixa' in metricas.etapas else 0.0
+    print(f"  raspagem | {total_paginas} páginas: {duracao:.2f} s ({duracao - pausas:.2f} s sem as pausas fixas)")
+    return [{
+        'benchmark': 'raspagem',
+        'parametros': {'paginas': total_paginas, 'latencia_s': latencia},
+        'noticias': len(noticias),
+        'duracao_s': round(duracao, 6),
+        'duracao_sem_pausas_s': round(duracao - pausas, 6),
+        'metricas': metricas.como_dict(),
+    }]
+
+
+def benchmark_extracao(n_noticias=200, repeticoes=3):
+    """Leitura do HTML e extração dos campos, sobre páginas baixadas uma vez do servidor local."""
+    from bs4 import BeautifulSoup
+    from extracao import extrair_detalhes_noticia, extrair_item_busca
+
+    total_paginas = max(1, n_noticias // NOTICIAS_POR_PAGINA)
+    with ServidorFixtures(total_paginas=total_paginas) as servidor:
+        paginas_busca = [urllib.request.urlopen(f"{servidor.url_base}/busca?q=benchmark&page={p}").read().decode('utf-8')
+                         for p in range(1, total_paginas + 1)]
+        paginas_noticia = [urllib.request.urlopen(f"{servidor.url_base}/noticias/materia-{i}").read().decode('utf-8')
+                           for i in range(n_noticias)]
+        url_base = servidor.url_base
+
+    def extrair_buscas():
+        for html in paginas_busca:
+            soup = BeautifulSoup(html, 'html.parser')
+            for item in soup.find_all('li', class_='ais-Hits-item'):
+                extrair_item_busca(item, url_base)
+
+    def extrair_noticias():
+        for html in paginas_noticia:
+            extrair_detalhes_noticia(BeautifulSoup(html, 'html.parser'), url_base)
+
+    return [
+        {'benchmark': 'extracao_busca', 'parametros': {'paginas': total_paginas}, **medir(extrair_buscas, repeticoes)},
+        {'benchmark': 'extracao_noticia', 'parametros': {'noticias': n_noticias}, **medir(extrair_noticias, repeticoes)},
+    ]
+
+
+def benchmark_ngrams(tamanhos, repeticoes=3):
+    """Contagem de n-grams de `50_palavras21.py` (títulos e texto completo, n = 1, 2 e 3)."""
+    import pandas as pd
+    from tokenizacao import carregar_stopwords
+
+    palavras21 = importlib.import_module('50_palavras21')
+    stop_words = carregar_stopwords()
+    resultados = []
+    for n_linhas in tamanhos:
+        df = pd.read_csv(caminho_corpus(n_linhas), encoding='utf-8')
+        for coluna in ('titulo', 'texto_completo'):
+            textos = df[coluna].dropna()
+            for n in (1, 2, 3):
+                estatisticas = medir(lambda: palavras21.contar_ngrams(textos, n, stop_words), repeticoes)
+                resultados.append({'benchmark': 'ngrams', 'parametros': {'linhas': n_linhas, 'coluna': coluna, 'n': n}, **estatisticas})
+                print(f"  ngrams | {n_linhas} linhas | {coluna} | n={n}: {estatisticas['mediana_s']:.3f} s")
+    return resultados
+
+
+def benchmark_datas(tamanhos, repeticoes=3):
+    """Leitura tipada das datas (`noticia.py`) e colunas derivadas (`trabalho_dados_dinamico_pandas.py`)."""
+    from noticia import carregar_noticias
+
+    trabalho = importlib.import_module('trabalho_dados_dinamico_pandas')
+    resultados = []
+    for n_linhas in tamanhos:
+        caminho = caminho_corpus(n_linhas)
+
+        def converter():
+            return trabalho.adicionar_colunas_de_data(carregar_noticias(caminho).para_pandas())
+
+        estatisticas = medir(converter, repeticoes)
+        datas_interpretadas = int(converter()['data_dt'].notna().sum())
+        resultados.append({'benchmark': 'datas', 'parametros': {'linhas': n_linhas},
+                           'datas_interpretadas': datas_interpretadas, **estatisticas})
+        print(f"  datas | {n_linhas} linhas: {estatisticas['mediana_s']:.3f} s ({datas_interpretadas} datas interpretadas)")
+    return resultados
+
+
+def _memoria_por_registro(carregar, n_linhas):
+    """Bytes alocados por notícia para manter em memória o resultado de `carregar()`."""
+    tracemalloc.start()
+    resultado = carregar()
+    memoria = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del resultado
+    return memoria // n_linhas
+
+
+def benchmark_registros(tamanhos, repeticoes=3):
+    """Memória por notícia (dicionários do CSV x `Noticia` x `LoteNoticias`) e conversão do lote para o pandas."""
+    import csv
+    from noticia import LoteNoticias, Noticia, verificar_ida_e_volta
+
+    resultados = []
+    for n_linhas in tamanhos:
+        caminho = caminho_corpus(n_linhas)
+
+        def linhas_csv():
+            with open(caminho, newline='', encoding='utf-8') as csv_file:
+                return list(csv.DictReader(csv_file))
+
+        memoria = {
+            'dict': _memoria_por_registro(linhas_csv, n_linhas),
+            'noticia': _memoria_por_registro(lambda: [Noticia.de_dict(linha) for linha in linhas_csv()], n_linhas),
+            'lote': _memoria_por_registro(lambda: LoteNoticias.ler_csv(caminho), n_linhas),
+        }
+        lote = LoteNoticias.ler_csv(caminho)
+        estatisticas = medir(lote.para_pandas, repeticoes)
+        # Os registros só valem a troca se regravarem o CSV sem perder nada (ver `verificar_ida_e_volta`).
+        diferencas = len(verificar_ida_e_volta(caminho))
+        resultados.append({'benchmark': 'registros', 'parametros': {'linhas': n_linhas},
+                           'bytes_por_registro': memoria, 'diferencas_ida_e_volta': diferencas, **estatisticas})
+        print(f"  registros | {n_linhas} linhas: {memoria['dict']} bytes/registro (dict), {memoria['noticia']} (Noticia), "
+              f"{memoria['lote']} (LoteNoticias); para_pandas {estatisticas['mediana_s']:.3f} s; "
+              f"{diferencas} diferença(s) na ida e volta do CSV")
+    return resultados
+
+
+def _commit_git():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def executar(benchmarks, tamanhos, repeticoes, paginas, latencia):
+    resultados = []
+    for nome in benchmarks:
+        print(f"\n--- Benchmark: {nome} ---")
+        try:
+            if nome == 'inicializacao':
+                resultados.extend(benchmark_inicializacao(repeticoes))
+            elif nome == 'raspagem':
+                resultados.extend(benchmark_raspagem(paginas, latencia))
+            elif nome == 'extracao':
+                resultados.extend(benchmark_extracao(repeticoes=repeticoes))
+            elif nome == 'ngrams':
+                resultados.extend(benchmark_ngrams(tamanhos, repeticoes))
+            elif nome == 'datas':
+                resultados.extend(benchmark_datas(tamanhos, repeticoes))
+            elif nome == 'registros':
+                resultados.extend(benchmark_registros(tamanhos, repeticoes))
+        except ImportError as e:
+            print(f"  Benchmark '{nome}' ignorado: dependência ausente ({e}).")
+            resultados.append({'benchmark': nome, 'ignorado': str(e)})
+        except Exception as e:
+            print(f"  Benchmark '{nome}' falhou: {type(e).__name__}: {e}")
+            resultados.append({'benchmark': nome, 'ignorado': f"{type(e).__name__}: {e}"})
+    return {
+        'commit': _commit_git(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'resultados': resultados,
+    }
+
+
+def _chave(resultado):
+    return (resultado['benchmark'], json.dumps(resultado.get('parametros', {}), sort_keys=True))
+
+
+def comparar(caminho_antes, caminho_depois):
+    """Compara as medianas de duas execuções salvas em JSON (razão depois/antes)."""
+    with open(caminho_antes, encoding='utf-8') as arquivo:
+        antes = {_chave(r): r for r in json.load(arquivo)['resultados']}
+    with open(caminho_depois, encoding='utf-8') as arquivo:
+        depois = json.load(arquivo)['resultados']
+
+    print(f"{'Benchmark':<18} | {'Parâmetros':<48} | {'Antes (s)':>10} | {'Depois (s)':>10} | {'Razão':>6}")
+    print("-" * 104)
+    for resultado in depois:
+        anterior = antes.get(_chave(resultado))
+        campo = next((c for c in ('mediana_s', 'duracao_sem_pausas_s', 'duracao_s') if c in resultado), None)
+        if not anterior or campo not in resultado or campo not in anterior:
+            continue
+        razao = resultado[campo] / anterior[campo] if anterior[campo] else float('inf')
+        print(f"{resultado['benchmark']:<18} | {json.dumps(resultado.get('parametros', {}), ensure_ascii=False):<48} | "
+              f"{anterior[campo]:>10.3f} | {resultado[campo]:>10.3f} | {razao:>6.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks offline do O Tempo Scraper News.")
+    parser.add_argument('benchmarks', nargs='*', default=list(BENCHMARKS),
+                        help=f"Benchmarks a executar: {', '.join(BENCHMARKS)} (padrão: todos).")
+    parser.add_argument('--tamanhos', nargs='+', type=int, default=list(TAMANHOS_PADRAO[:3]),
+                        help="Tamanhos dos corpora sintéticos, em linhas (padrão: 1000 10000 100000).")
+    parser.add_argument('--repeticoes', type=int, default=3)
+    parser.add_argument('--paginas', type=int, default=2, help="Páginas de busca no benchmark de raspagem.")
+    parser.add_argument('--latencia', type=float, default=0.1, help="Latência do servidor local, em segundos.")
+    parser.add_argument('--geckodriver', default=None, help="Caminho do geckodriver usado no benchmark de raspagem.")
+    parser.add_argument('--saida', default=None, help="Arquivo JSON de saída (padrão: benchmark_<data>.json).")
+    parser.add_argument('--comparar', nargs=2, metavar=('ANTES', 'DEPOIS'), help="Compara dois resultados em JSON.")
+    args = parser.parse_args()
+    desconhecidos = [nome for nome in args.benchmarks if nome not in BENCHMARKS]
+    if desconhecidos:
+        parser.error(f"benchmark(s) desconhecido(s): {', '.join(desconhecidos)}")
+
+    if args.geckodriver:
+        os.environ['GECKODRIVER'] = args.geckodriver
+
+    if args.comparar:
+        comparar(*args.comparar)
+    else:
+        relatorio = executar(args.benchmarks, args.tamanhos, args.repeticoes, args.paginas, args.latencia)
+        saida = args.saida or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(saida, mode='w', encoding='utf-8') as arquivo:
+            json.dump(relatorio, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultados salvos em '{saida}'")
@@ -0,0 +1,123 @@
+import csv
+import random
+import sys
+from datetime import date, timedelta
+from itertools import accumulate
+
+from noticia import CAMPOS_CSV, DETALHES_ERRO, formatar_data
+
+"""
+Documentação do Script: corpus_sintetico.py
+
+Propósito:
+----------
+Gera corpora sintéticos de notícias, com as mesmas colunas do CSV produzido por `otemposcrapern13.py`,
+para medir o desempenho das análises sem depender de uma raspagem real.
+
+-   As palavras seguem uma distribuição de Zipf sobre um vocabulário em português, de modo que
+    poucas palavras são muito frequentes e a maioria é rara (como num corpus jornalístico real).
+-   As datas seguem o formato do site ("11 de junho de 2025") e uma pequena fração das linhas
+    traz as mesmas strings de erro gravadas pelo raspador, para exercitar a limpeza de dados.
+-   A geração é determinística: a mesma semente e o mesmo índice sempre produzem a mesma notícia.
+
+Uso:
+----
+    python corpus_sintetico.py 100000 corpus_100k.csv
+"""
+
+# Tamanhos usados pelo benchmark (de 1 mil a 1 milhão de linhas).
+TAMANHOS_PADRAO = (1_000, 10_000, 100_000, 1_000_000)
+
+VOCABULARIO = (
+    'governo prefeitura cidade estado minas belo horizonte polícia saúde educação escola hospital '
+    'presidente deputado vereador senador eleição eleições campanha partido candidato voto urna '
+    'economia inflação preço gasolina salário emprego trabalho empresa mercado dólar juros banco '
+    'chuva calor frio temperatura clima seca rio barragem mineração ambiental floresta amazônia '
+    'futebol galo cruzeiro américa jogo partida campeonato torcida estádio técnico jogador gol '
+    'música show festival cultura cinema teatro livro poesia artista exposição museu carnaval '
+    'trânsito acidente rodovia ônibus metrô aeroporto obra ponte avenida bairro região centro '
+    'justiça tribunal processo investigação operação prisão crime violência segurança denúncia '
+    'vacina doença vírus dengue médico paciente atendimento fila cirurgia remédio tratamento '
+    'projeto lei proposta votação câmara assembleia ministério secretaria programa recurso verba '
+    'pesquisa estudo universidade ufmg ufop estudante professor aluno curso ciência tecnologia '
+    'internet celular aplicativo dados rede plataforma inteligência digital sistema serviço '
+    'família criança mulher homem jovem idoso morador população comunidade grupo moradores '
+    'queijo café pão cozinha restaurante bar feira produtor agricultura leite carne alimento '
+    'mariana ouro preto contagem betim uberlândia juiz fora montes claros ipatinga sabará '
+    'brasil país mundo internacional estados unidos china argentina europa guerra acordo'
+).split()
+
+PALAVRAS_FUNCIONAIS = 'de a o que e do da em um para com não uma os no se na por mais as dos como mas ao ele das à seu sua ou quando muito nos já também só pelo pela até isso'.split()
+
+REPORTERES = ['Ana Souza', 'Bruno Lima', 'Carla Mendes', 'Diego Rocha', 'Elisa Castro', 'Felipe Nunes',
+              'Gabriela Alves', 'Henrique Dias', 'Isabela Torres', 'João Pereira', 'Redação O Tempo']
+
+TAGS = ['Política', 'Economia', 'Cidades', 'Esportes', 'Cultura', 'Saúde', 'Educação', 'Meio Ambiente',
+        'Eleições 2024', 'Belo Horizonte', 'Minas Gerais', 'Brasil', 'Mundo', 'Segurança', 'Trânsito',
+        'Clima', 'Tecnologia', 'Galo', 'Cruzeiro', 'Música', 'Gastronomia', 'Mineração', 'Justiça']
+
+DATA_INICIAL = date(2023, 1, 1)
+DIAS_NO_PERIODO = (date(2025, 6, 30) - DATA_INICIAL).days
+
+# Pesos acumulados da distribuição de Zipf (calculados uma única vez).
+_PESOS_ACUMULADOS = list(accumulate(1 / posto for posto in range(1, len(VOCABULARIO) + 1)))
+
+
+def _frase(rng, minimo, maximo):
+    quantidade = rng.randint(minimo, maximo)
+    palavras = rng.choices(VOCABULARIO, cum_weights=_PESOS_ACUMULADOS, k=quantidade)
+    # Intercala palavras funcionais (stopwords) como num texto real.
+    for posicao in range(1, len(palavras), 3):
+        palavras[posicao] = f"{rng.choice(PALAVRAS_FUNCIONAIS)} {palavras[posicao]}"
+    return ' '.join(palavras).capitalize()
+
+
+def gerar_noticia(indice, semente=0, url_base="https://www.otempo.com.br", taxa_erro=0.02):
+    """Gera uma notícia sintética (dict com as colunas de CAMPOS_CSV), determinística para (indice, semente)."""
+    rng = random.Random(semente * 1_000_003 + indice)
+    titulo = _frase(rng, 6, 14)
+    noticia = {
+        'titulo': titulo,
+        'subtitulo': _frase(rng, 12, 25),
+        'link_noticia': f"{url_base}/noticias/materia-{indice}",
+    }
+    if rng.random() < taxa_erro:
+        noticia.update(DETALHES_ERRO)
+        return noticia
+
+    dia = DATA_INICIAL + timedelta(days=rng.randint(0, DIAS_NO_PERIODO))
+    paragrafos = [_frase(rng, 30, 60) + '.' for _ in range(rng.randint(3, 8))]
+    noticia.update({
+        'data_pura': formatar_data(dia),
+        # Como no site, algumas notícias não informam o horário (o raspador grava "N/A").
+        'horario': f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}" if rng.random() >= 0.05 else "N/A",
+        'texto_completo': '\n'.join(paragrafos),
+        'link_imagem_principal': f"{url_base}/imagens/{indice % 5000}.jpg",
+        'tem_video': rng.random() < 0.15,
+        'nome_reporter': rng.choice(REPORTERES),
+        'tags_noticia': ", ".join(rng.sample(TAGS, rng.randint(1, 5))),
+    })
+    return noticia
+
+
+def gerar_corpus(n_linhas, semente=0):
+    """Gera as notícias uma a uma (sem manter o corpus inteiro em memória)."""
+    for indice in range(n_linhas):
+        yield gerar_noticia(indice, semente)
+
+
+def gravar_corpus_csv(caminho, n_linhas, semente=0):
+    """Grava um corpus sintético de `n_linhas` notícias em CSV, com as colunas do raspador."""
+    with open(caminho, mode='w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CAMPOS_CSV)
+        writer.writeheader()
+        writer.writerows(gerar_corpus(n_linhas, semente))
+    return caminho
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Uso: python corpus_sintetico.py <número de linhas> <arquivo.csv>")
+        sys.exit(1)
+    gravar_corpus_csv(sys.argv[2], int(sys.argv[1]))
+    print(f"Corpus sintético com {sys.argv[1]} notícias salvo em '{sys.argv[2]}'")
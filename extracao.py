@@ -0,0 +1,145 @@
+import re
+from urllib.parse import urljoin
+
+"""
+Documentação do Script: extracao.py
+
+Propósito:
+----------
+Extratores dos campos das páginas do portal O Tempo a partir do HTML já lido pelo BeautifulSoup:
+itens da página de busca, total de páginas do paginador e detalhes da página de uma notícia.
+
+Ficam separados de `otemposcrapern13.py` para não dependerem do Selenium: a reextração offline
+de arquivos WARC (`arquivo_warc.py`) e os benchmarks de extração importam só este módulo. Se o
+layout do site mudar, é aqui que as classes e IDs devem ser atualizados.
+"""
+
+URL_BASE = "https://www.otempo.com.br"
+
+
+def extrair_item_busca(noticia_element, url_base=URL_BASE):
+    """
+    Extrai título, subtítulo e link (absoluto) de um item da página de busca (`li.ais-Hits-item`).
+    Retorna (titulo, subtitulo, link_noticia); campos não encontrados ficam como None.
+    """
+    titulo = None
+    subtitulo = None
+    link_noticia = None
+
+    link_tag = noticia_element.find('a', class_='search-results')
+    if link_tag:
+        link_noticia_rel = link_tag['href']
+        link_noticia = urljoin(url_base, link_noticia_rel) 
+
+        titulo_tag = link_tag.find('h2', class_='search-results__texto--title')
+        if titulo_tag:
+            titulo = titulo_tag.get_text(separator=' ', strip=True)
+
+        subtitulo_tag = link_tag.find('h3', class_='search-results__texto--subtitle')
+        if subtitulo_tag:
+            subtitulo = subtitulo_tag.get_text(separator=' ', strip=True)
+
+    return titulo, subtitulo, link_noticia
+
+
+def extrair_detalhes_noticia(noticia_soup, url_base=URL_BASE):
+    """
+    Extrai os detalhes de uma página de notícia já lida pelo BeautifulSoup: repórter, data e horário,
+    texto completo, imagem principal, presença de vídeo e tags.
+    Não depende do Selenium, podendo ser usada também sobre HTML salvo em disco.
+    """
+    data_publicacao_completa = None 
+    data_pura = None 
+    horario = None 
+    texto_completo = None 
+    link_imagem_principal = None 
+    tem_video = False 
+    nome_reporter = None 
+
+    author_info_div = noticia_soup.find('div', class_='cmp__author-info')
+    if author_info_div:
+        author_name_span = author_info_div.find('span', class_='cmp__author-name')
+        if author_name_span:
+            inner_name_span = author_name_span.find('span') 
+            if inner_name_span:
+                nome_reporter = inner_name_span.get_text(strip=True)
+            else:
+                author_link = author_name_span.find('a')
+                if author_link:
+                    nome_reporter = author_link.get_text(strip=True)
+                else:
+                    nome_reporter = author_name_span.get_text(strip=True)
+
+            nome_reporter = re.sub(r'^(Por|Redação)\s*', '', nome_reporter, flags=re.IGNORECASE).strip()
+            nome_reporter = ' '.join(nome_reporter.split())
+
+    publication_span = noticia_soup.find('span', class_='cmp__author-publication')
+    if publication_span:
+        date_value_span = publication_span.find('span')
+        if date_value_span:
+            data_publicacao_completa = date_value_span.get_text(strip=True)
+            data_publicacao_completa = data_publicacao_completa.split(' - ')[0].strip()
+
+            if '|' in data_publicacao_completa:
+                partes = data_publicacao_completa.split('|')
+                data_pura = partes[0].strip()
+                horario = partes[1].strip()
+            else: 
+                data_pura = data_publicacao_completa
+                horario = "N/A" 
+
+    texto_principal_div = noticia_soup.find('div', class_='read-controller materia__tts article-whole article-body') 
+    if texto_principal_div:
+        paragrafos = texto_principal_div.find_all('p')
+        texto_completo = '\n'.join([p.get_text(strip=True) for p in paragrafos if p.get_text(strip=True)])
+
+    gallery_container = noticia_soup.find('div', class_='gallery__container gallery_highlight')
+    if gallery_container:
+        img_tag_principal = gallery_container.find('img', class_='gallery__image')
+        if img_tag_principal and 'src' in img_tag_principal.attrs:
+            link_imagem_principal = img_tag_principal['src']
+            if not link_imagem_principal.startswith('http'):
+                link_imagem_principal = urljoin(url_base, link_imagem_principal)
+
+    video_iframe = noticia_soup.find('iframe', class_='c-video__frame') 
+    video_tag = noticia_soup.find('video')
+
+    iframes_no_corpo = noticia_soup.find('div', class_='c-news-body')
+    if iframes_no_corpo:
+        for iframe in iframes_no_corpo.find_all('iframe'):
+            src = iframe.get('src', '')
+            if 'https://www.youtube.com/embed/G8jXv_yjVVI?si=A-jPxoZqLkP8I1Ry' in src or 'vimeo.com' in src or 'cdn.jornalotempo.com.br/videos' in src:
+                tem_video = True
+                break
+    if video_iframe or video_tag: 
+        tem_video = True
+
+    tags_div_container = noticia_soup.find('div', class_='tags')
+    tags_list = [] 
+    if tags_div_container:
+        ul_tagbox = tags_div_container.find('ul', class_='cmp__tagbox')
+        if ul_tagbox:
+            tags_a_elements = ul_tagbox.find_all('a', class_='label__tag')
+            for tag_a in tags_a_elements:
+                tags_list.append(tag_a.get_text(strip=True))
+    tags_noticia_str = ", ".join(tags_list) if tags_list else "N/A"
+
+    return {
+        'data_pura': data_pura, 
+        'horario': horario, 
+        'texto_completo': texto_completo, 
+        'link_imagem_principal': link_imagem_principal, 
+        'tem_video': tem_video,
+        'nome_reporter': nome_reporter,
+        'tags_noticia': tags_noticia_str 
+    }
+
+
+def total_paginas_busca(soup):
+    """Número total de páginas informado no paginador ("Página 1 de N"), ou None se não encontrado."""
+    pagination_info_div = soup.find('div', class_='pagination__info')
+    if pagination_info_div:
+        match = re.search(r'Página \d+ de (\d+)', pagination_info_div.get_text(strip=True))
+        if match:
+            return int(match.group(1))
+    return None
@@ -0,0 +1,541 @@
+import argparse
+import csv
+import hmac
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from noticia import CAMPOS_CSV, STATUS_ERRO_COLETA, Noticia
+
+"""
+Documentação do Script: fila_raspagem.py
+
+Propósito:
+----------
+Raspagem distribuída: uma fila durável de notícias a coletar, compartilhada por vários processos
+de trabalho (workers) na mesma máquina ou em máquinas diferentes.
+
+-   **Coordenador:** executa a busca (com o planejador por fatias de datas de `planejador_busca.py`)
+    e coloca os links das notícias na fila. Enfileirar de novo o mesmo termo não duplica tarefas.
+-   **Workers:** cada um aluga (lease) um pequeno lote de links por um tempo limitado, acessa e
+    extrai as notícias com o seu próprio Firefox e grava o resultado. Se um worker morrer, seus
+    links voltam para a fila quando o aluguel expira: o trabalho só atrasa, nunca se perde. Cada
+    aluguel conta como tentativa, inclusive os que expiram; depois de MAXIMO_TENTATIVAS a tarefa
+    é marcada como falha, para que uma notícia que derruba o navegador não circule para sempre.
+    Depois de ERROS_SEGUIDOS_REINICIAR falhas seguidas, o worker reinicia o seu Firefox e devolve
+    a tarefa sem gastar uma tentativa (o problema provavelmente era o navegador, não a notícia).
+-   **Gravação idempotente:** as notícias são gravadas com "upsert" pela chave `link_noticia`;
+    se dois workers coletarem a mesma notícia (aluguel expirado), resta um único registro.
+-   **Fila:** `FilaSQLite` guarda tudo num arquivo SQLite (modo WAL), suficiente para vários processos
+    na mesma máquina. Para várias máquinas, `servir` expõe a mesma fila por HTTP e os workers usam
+    `FilaRemota`, que tem a mesma interface. Os prazos dos aluguéis são sempre calculados pelo dono
+    do arquivo, então os relógios das máquinas não precisam estar sincronizados. O servidor escuta
+    só em 127.0.0.1, a menos que `--host` diga outro endereço; fora da máquina local, use um token
+    compartilhado (`--token` ou a variável FILA_RASPAGEM_TOKEN), exigido em todas as requisições.
+
+Uso:
+----
+    python fila_raspagem.py coordenar "eleições" --fila fila.db --workers 4
+    python fila_raspagem.py worker --fila fila.db --processos 4 --headless
+
+    # Várias máquinas: na máquina da fila...
+    export FILA_RASPAGEM_TOKEN=um-segredo-compartilhado
+    python fila_raspagem.py servir --fila fila.db --host 0.0.0.0 --porta 8765
+    # ...e em cada máquina de trabalho (com a mesma variável FILA_RASPAGEM_TOKEN):
+    python fila_raspagem.py worker --fila http://maquina-da-fila:8765 --processos 4 --headless
+
+    python fila_raspagem.py status --fila fila.db
+    python fila_raspagem.py exportar --fila fila.db noticias_eleicoes.csv
+"""
+
+DURACAO_ALUGUEL_PADRAO = 300  # segundos
+MAXIMO_TENTATIVAS = 3
+ERROS_SEGUIDOS_REINICIAR = 3  # Falhas seguidas de um worker antes de reiniciar o seu Firefox.
+TENTATIVAS_FILA = 5  # Tentativas de cada chamada do worker à fila (erros de rede, banco bloqueado...).
+HOST_PADRAO = '127.0.0.1'
+PORTA_PADRAO = 8765
+VARIAVEL_TOKEN = 'FILA_RASPAGEM_TOKEN'
+
+ESQUEMA = f"""
+CREATE TABLE IF NOT EXISTS tarefas (
+    link_noticia TEXT PRIMARY KEY,
+    termo TEXT,
+    titulo TEXT,
+    subtitulo TEXT,
+    ordem INTEGER,
+    estado TEXT NOT NULL DEFAULT 'pendente',  -- pendente, alugada, concluida ou falhou
+    tentativas INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    prazo_aluguel REAL,
+    erro TEXT
+);
+CREATE INDEX IF NOT EXISTS tarefas_estado ON tarefas (estado, prazo_aluguel, ordem);
+-- As notícias são guardadas com as mesmas colunas (e o mesmo formato de texto) do CSV da raspagem.
+CREATE TABLE IF NOT EXISTS noticias (
+    {', '.join(f'{campo} TEXT PRIMARY KEY' if campo == 'link_noticia' else f'{campo} TEXT' for campo in CAMPOS_CSV)},
+    worker TEXT,
+    atualizado_em REAL
+);
+"""
+
+
+class FilaSQLite:
+    """Fila de notícias a raspar num arquivo SQLite, segura para vários processos e threads."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.conexao = sqlite3.connect(caminho, timeout=60, isolation_level=None, check_same_thread=False)
+        self.conexao.row_factory = sqlite3.Row
+        self.trava = threading.Lock()
+        with self.trava:
+            self.conexao.execute('PRAGMA journal_mode=WAL')
+            self.conexao.executescript(ESQUEMA)
+
+    def _transacao(self, funcao):
+        """Executa `funcao(cursor)` numa transação exclusiva de escrita (BEGIN IMMEDIATE)."""
+        with self.trava:
+            cursor = self.conexao.cursor()
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                resultado = funcao(cursor)
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+            return resultado
+
+    def enfileirar(self, itens, termo=None):
+        """Acrescenta itens da busca ({'titulo', 'subtitulo', 'link_noticia'}); links já na fila são ignorados."""
+        def inserir(cursor):
+            ordem = cursor.execute('SELECT COALESCE(MAX(ordem), 0) FROM tarefas').fetchone()[0]
+            novos = 0
+            for posicao, item in enumerate(itens, start=ordem + 1):
+                cursor.execute(
+                    'INSERT OR IGNORE INTO tarefas (link_noticia, termo, titulo, subtitulo, ordem) VALUES (?, ?, ?, ?, ?)',
+                    (item['link_noticia'], termo, item.get('titulo'), item.get('subtitulo'), posicao),
+                )
+                novos += cursor.rowcount
+            return novos
+        return self._transacao(inserir)
+
+    def alugar(self, worker, quantidade=1, duracao=DURACAO_ALUGUEL_PADRAO, maximo_tentativas=MAXIMO_TENTATIVAS):
+        """
+        Aluga até `quantidade` tarefas pendentes (ou com aluguel expirado) para `worker` por `duracao` segundos.
+        Cada aluguel conta uma tentativa; aluguéis expirados que já esgotaram `maximo_tentativas` viram falha.
+        """
+        def alugar_tarefas(cursor):
+            agora = time.time()
+            cursor.execute(
+                "UPDATE tarefas SET estado = 'falhou', prazo_aluguel = NULL, "
+                "erro = 'Aluguel expirado em todas as tentativas (worker encerrado durante a coleta?)' "
+                "WHERE estado = 'alugada' AND prazo_aluguel < ? AND tentativas >= ?",
+                (agora, maximo_tentativas),
+            )
+            linhas = cursor.execute(
+                "SELECT link_noticia, titulo, subtitulo FROM tarefas "
+                "WHERE estado = 'pendente' OR (estado = 'alugada' AND prazo_aluguel < ?) ORDER BY ordem LIMIT ?",
+                (agora, quantidade),
+            ).fetchall()
+            for linha in linhas:
+                cursor.execute(
+                    "UPDATE tarefas SET estado = 'alugada', worker = ?, prazo_aluguel = ?, tentativas = tentativas + 1 "
+                    "WHERE link_noticia = ?",
+                    (worker, agora + duracao, linha['link_noticia']),
+                )
+            return [dict(linha) for linha in linhas]
+        return self._transacao(alugar_tarefas)
+
+    def renovar(self, worker, links, duracao=DURACAO_ALUGUEL_PADRAO):
+        """Estende o aluguel das tarefas de `worker` que ainda estão com ele."""
+        def renovar_tarefas(cursor):
+            prazo = time.time() + duracao
+            for link in links:
+                cursor.execute(
+                    "UPDATE tarefas SET prazo_aluguel = ? WHERE link_noticia = ? AND worker = ? AND estado = 'alugada'",
+                    (prazo, link, worker),
+                )
+        return self._transacao(renovar_tarefas)
+
+    def concluir(self, worker, noticia):
+        """Grava a notícia (upsert por `link_noticia`) e marca a tarefa como concluída."""
+        valores = [noticia.get(campo) for campo in CAMPOS_CSV]
+        valores[CAMPOS_CSV.index('tem_video')] = str(noticia.get('tem_video'))
+        atualizacoes = ', '.join(f'{campo} = excluded.{campo}' for campo in CAMPOS_CSV if campo != 'link_noticia')
+
+        def gravar(cursor):
+            cursor.execute(
+                f"INSERT INTO noticias ({', '.join(CAMPOS_CSV)}, worker, atualizado_em) "
+                f"VALUES ({', '.join('?' * len(CAMPOS_CSV))}, ?, ?) "
+                f"ON CONFLICT (link_noticia) DO UPDATE SET {atualizacoes}, worker = excluded.worker, "
+                "atualizado_em = excluded.atualizado_em",
+                valores + [worker, time.time()],
+            )
+            cursor.execute(
+                "UPDATE tarefas SET estado = 'concluida', worker = ?, prazo_aluguel = NULL, erro = NULL WHERE link_noticia = ?",
+                (worker, noticia['link_noticia']),
+            )
+        return self._transacao(gravar)
+
+    def falhar(self, worker, link, erro='', maximo_tentativas=MAXIMO_TENTATIVAS):
+        """Devolve a tarefa à fila ou, depois de `maximo_tentativas`, a marca como falha definitiva."""
+        def registrar_falha(cursor):
+            cursor.execute(
+                "UPDATE tarefas SET estado = CASE WHEN tentativas >= ? THEN 'falhou' ELSE 'pendente' END, "
+                "prazo_aluguel = NULL, erro = ? WHERE link_noticia = ? AND worker = ? AND estado = 'alugada'",
+                (maximo_tentativas, erro, link, worker),
+            )
+        return self._transacao(registrar_falha)
+
+    def liberar(self, worker, link):
+        """Devolve a tarefa à fila sem contar a tentativa (a falha foi do worker, não da notícia)."""
+        def devolver(cursor):
+            cursor.execute(
+                "UPDATE tarefas SET estado = 'pendente', prazo_aluguel = NULL, tentativas = MAX(tentativas - 1, 0) "
+                "WHERE link_noticia = ? AND worker = ? AND estado = 'alugada'",
+                (link, worker),
+            )
+        return self._transacao(devolver)
+
+    def resumo(self):
+        """Número de tarefas em cada estado e de notícias gravadas."""
+        with self.trava:
+            estados = dict(self.conexao.execute('SELECT estado, COUNT(*) FROM tarefas GROUP BY estado').fetchall())
+            estados['noticias'] = self.conexao.execute('SELECT COUNT(*) FROM noticias').fetchone()[0]
+        return {estado: estados.get(estado, 0) for estado in ('pendente', 'alugada', 'concluida', 'falhou', 'noticias')}
+
+    def noticias(self):
+        """Notícias gravadas, na ordem em que foram enfileiradas."""
+        with self.trava:
+            linhas = self.conexao.execute(
+                f"SELECT {', '.join('n.' + campo for campo in CAMPOS_CSV)} FROM noticias n "
+                "LEFT JOIN tarefas t ON t.link_noticia = n.link_noticia ORDER BY t.ordem"
+            ).fetchall()
+        return [dict(linha) for linha in linhas]
+
+    def fechar(self):
+        self.conexao.close()
+
+
+# Operações da fila que podem ser chamadas remotamente.
+OPERACOES = ('enfileirar', 'alugar', 'renovar', 'concluir', 'falhar', 'liberar', 'resumo', 'noticias')
+
+
+class ErroFilaRemota(Exception):
+    """Erro informado pelo servidor da fila (token inválido, argumentos inválidos, erro do SQLite...)."""
+
+    def __init__(self, mensagem, status=None):
+        super().__init__(mensagem)
+        self.status = status  # Código HTTP da resposta.
+
+
+class FilaRemota:
+    """Cliente HTTP de uma fila servida por `criar_servidor_fila`; mesma interface de FilaSQLite."""
+
+    def __init__(self, url, timeout=60, token=None):
+        self.url = url.rstrip('/')
+        self.timeout = timeout
+        self.token = token
+
+    def _chamar(self, operacao, **argumentos):
+        cabecalhos = {'Content-Type': 'application/json'}
+        if self.token:
+            cabecalhos['Authorization'] = f'Bearer {self.token}'
+        requisicao = urllib.request.Request(
+            f'{self.url}/{operacao}', data=json.dumps(argumentos).encode('utf-8'), headers=cabecalhos, method='POST',
+        )
+        try:
+            with urllib.request.urlopen(requisicao, timeout=self.timeout) as resposta:
+                return json.loads(resposta.read().decode('utf-8'))
+        except urllib.error.HTTPError as e:
+            try:
+                erro = json.loads(e.read().decode('utf-8'))['erro']
+            except (ValueError, KeyError):
+                erro = e.reason
+            raise ErroFilaRemota(f"{operacao}: HTTP {e.code}: {erro}", e.code) from None
+
+    def enfileirar(self, itens, termo=None):
+        return self._chamar('enfileirar', itens=list(itens), termo=termo)
+
+    def alugar(self, worker, quantidade=1, duracao=DURACAO_ALUGUEL_PADRAO, maximo_tentativas=MAXIMO_TENTATIVAS):
+        return self._chamar('alugar', worker=worker, quantidade=quantidade, duracao=duracao,
+                            maximo_tentativas=maximo_tentativas)
+
+    def renovar(self, worker, links, duracao=DURACAO_ALUGUEL_PADRAO):
+        return self._chamar('renovar', worker=worker, links=list(links), duracao=duracao)
+
+    def concluir(self, worker, noticia):
+        return self._chamar('concluir', worker=worker, noticia=noticia)
+
+    def falhar(self, worker, link, erro='', maximo_tentativas=MAXIMO_TENTATIVAS):
+        return self._chamar('falhar', worker=worker, link=link, erro=erro, maximo_tentativas=maximo_tentativas)
+
+    def liberar(self, worker, link):
+        return self._chamar('liberar', worker=worker, link=link)
+
+    def resumo(self):
+        return self._chamar('resumo')
+
+    def noticias(self):
+        return self._chamar('noticias')
+
+    def fechar(self):
+        pass
+
+
+class _ManipuladorFila(BaseHTTPRequestHandler):
+    """
+    Recebe `POST /<operacao>` com os argumentos em JSON e responde com o resultado em JSON.
+    Erros também são respondidos em JSON: {"erro": "..."}.
+    """
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Silencia o log de cada requisição no terminal.
+
+    def _responder(self, status, resultado):
+        dados = json.dumps(resultado, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def do_POST(self):
+        corpo = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        token = self.server.token
+        if token and not hmac.compare_digest(self.headers.get('Authorization', ''), f'Bearer {token}'):
+            self._responder(401, {'erro': 'token ausente ou inválido'})
+            return
+        operacao = self.path.strip('/')
+        if operacao not in OPERACOES:
+            self._responder(404, {'erro': f"operação desconhecida: '{operacao}'"})
+            return
+        try:
+            argumentos = json.loads(corpo or b'{}')
+            resultado = getattr(self.server.fila, operacao)(**argumentos)
+        except (TypeError, ValueError, KeyError) as e:
+            self._responder(400, {'erro': str(e)})
+            return
+        except sqlite3.Error as e:
+            # Ex: banco bloqueado por muito tempo ou disco cheio; o worker pode tentar de novo mais tarde.
+            self._responder(503 if isinstance(e, sqlite3.OperationalError) else 500, {'erro': f'SQLite: {e}'})
+            return
+        self._responder(200, resultado)
+
+
+def criar_servidor_fila(fila, host=HOST_PADRAO, porta=PORTA_PADRAO, token=None):
+    """
+    Servidor HTTP (uma thread por requisição) que expõe `fila` para workers em outras máquinas.
+    Com `token`, toda requisição precisa do cabeçalho `Authorization: Bearer <token>`.
+    """
+    servidor = ThreadingHTTPServer((host, porta), _ManipuladorFila)
+    servidor.fila = fila
+    servidor.token = token
+    return servidor
+
+
+def abrir_fila(endereco, token=None):
+    """`endereco` é o caminho de um arquivo SQLite ou a URL (http://...) de uma fila servida por HTTP."""
+    if endereco.startswith(('http://', 'https://')):
+        return FilaRemota(endereco, token=token or os.environ.get(VARIAVEL_TOKEN))
+    return FilaSQLite(endereco)
+
+
+def coordenar(termo_busca, fila, workers=4, headless=True, **opcoes_planejador):
+    """Executa a busca com o planejador por fatias de datas e enfileira as notícias encontradas."""
+    from planejador_busca import PlanejadorBusca
+
+    with PlanejadorBusca(termo_busca, workers=workers, headless=headless, **opcoes_planejador) as planejador:
+        itens_busca = planejador.listar_resultados()
+    itens = [{'titulo': titulo, 'subtitulo': subtitulo, 'link_noticia': link} for titulo, subtitulo, link in itens_busca]
+    novos = fila.enfileirar(itens, termo_busca)
+    print(f"{len(itens)} notícias encontradas para '{termo_busca}'; {novos} novas na fila.")
+    return novos
+
+
+def _erro_transitorio(erro):
+    """Erros que podem passar sozinhos: rede, servidor da fila sobrecarregado e banco SQLite bloqueado."""
+    if isinstance(erro, ErroFilaRemota):
+        return erro.status is not None and erro.status >= 500
+    return isinstance(erro, (OSError, sqlite3.OperationalError))  # OSError inclui URLError e timeouts
+
+
+def _chamar_fila(operacao, *argumentos):
+    """Chama uma operação da fila, tentando de novo (com espera exponencial) em caso de erro transitório."""
+    for tentativa in range(TENTATIVAS_FILA):
+        try:
+            return operacao(*argumentos)
+        except Exception as e:
+            if not _erro_transitorio(e) or tentativa == TENTATIVAS_FILA - 1:
+                raise
+            espera = 0.5 * 2 ** tentativa
+            print(f"  Erro ao acessar a fila ({e}); nova tentativa em {espera:.1f} s.")
+            time.sleep(espera)
+
+
+def executar_worker(endereco_fila, nome=None, lote=4, duracao_aluguel=DURACAO_ALUGUEL_PADRAO,
+                    headless=True, enxuto=False, espera_fila_vazia=30, token=None):
+    """
+    Aluga lotes de notícias da fila, raspa cada uma e grava o resultado, até a fila se esvaziar.
+    Enquanto outros workers ainda tiverem tarefas alugadas, espera: se algum deles morrer, as
+    tarefas voltam a ficar disponíveis quando o aluguel expirar. Depois de ERROS_SEGUIDOS_REINICIAR
+    falhas seguidas, reinicia o Firefox e devolve a tarefa à fila sem contar a tentativa.
+    Chamadas à fila com erro transitório são repetidas (TENTATIVAS_FILA); se ainda falharem ao gravar
+    o resultado de uma notícia, o worker segue em frente e a tarefa volta à fila quando o aluguel expirar.
+    """
+    from instrumentacao import Instrumentacao
+    from navegador_enxuto import ProxyEnxuto
+    from otemposcrapern13 import criar_driver, raspar_detalhes_noticia
+
+    nome = nome or f'{socket.gethostname()}-{os.getpid()}'
+    fila = abrir_fila(endereco_fila, token)
+    metricas = Instrumentacao()
+    proxy = ProxyEnxuto().iniciar() if enxuto else None
+    driver = criar_driver(headless=headless, enxuto=enxuto, porta_proxy=proxy.porta if proxy else None)
+    erros_seguidos = 0
+
+    def registrar(operacao, *argumentos):
+        # O resultado de uma notícia que não chega à fila não derruba o worker: o aluguel expira e ela é refeita.
+        try:
+            _chamar_fila(operacao, nome, *argumentos)
+        except Exception as e:
+            metricas.contar('erros_fila')
+            print(f"  [{nome}] Não foi possível registrar na fila ({e}); a tarefa voltará quando o aluguel expirar.")
+
+    try:
+        while True:
+            tarefas = _chamar_fila(fila.alugar, nome, lote, duracao_aluguel)
+            if not tarefas:
+                resumo = _chamar_fila(fila.resumo)
+                if not resumo['pendente'] and not resumo['alugada']:
+                    break
+                time.sleep(espera_fila_vazia)
+                continue
+
+            links_restantes = [tarefa['link_noticia'] for tarefa in tarefas]
+            for tarefa in tarefas:
+                link_noticia = links_restantes.pop(0)
+                print(f"  [{nome}] Acessando notícia: {link_noticia}")
+                metricas.pausa(1.5)
+                detalhes = raspar_detalhes_noticia(driver, link_noticia, metricas)
+                noticia = Noticia.de_dict({'titulo': tarefa['titulo'], 'subtitulo': tarefa['subtitulo'],
+                                           'link_noticia': link_noticia, **detalhes})
+                if noticia.status != STATUS_ERRO_COLETA:
+                    registrar(fila.concluir, noticia.como_linha_csv())
+                    metricas.contar('noticias_coletadas')
+                    erros_seguidos = 0
+                elif erros_seguidos + 1 < ERROS_SEGUIDOS_REINICIAR:
+                    registrar(fila.falhar, link_noticia, "Erro ao acessar ou raspar detalhes da notícia")
+                    erros_seguidos += 1
+                else:
+                    # Várias notícias seguidas falharam: o mais provável é que o Firefox tenha travado ou morrido.
+                    print(f"  [{nome}] {ERROS_SEGUIDOS_REINICIAR} erros seguidos; reiniciando o navegador.")
+                    registrar(fila.liberar, link_noticia)
+                    metricas.contar('navegadores_reiniciados')
+                    try:
+                        driver.quit()
+                    except Exception:
+                        pass
+                    driver = criar_driver(headless=headless, enxuto=enxuto, porta_proxy=proxy.porta if proxy else None)
+                    erros_seguidos = 0
+                if links_restantes:
+                    registrar(fila.renovar, links_restantes, duracao_aluguel)
+    finally:
+        driver.quit()
+        if proxy is not None:
+            proxy.parar()
+        fila.fechar()
+    print(f"  [{nome}] Fila concluída: {metricas.contadores.get('noticias_coletadas', 0)} notícias coletadas "
+          f"({metricas.noticias_por_minuto():.1f} por minuto).")
+
+
+def executar_workers(endereco_fila, processos=1, **opcoes):
+    """Inicia `processos` workers nesta máquina, cada um num processo com o seu próprio Firefox."""
+    if processos == 1:
+        executar_worker(endereco_fila, **opcoes)
+        return
+    workers = [multiprocessing.Process(target=executar_worker, args=(endereco_fila,), kwargs=opcoes) for _ in range(processos)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def exportar_csv(fila, csv_saida):
+    """Grava as notícias da fila em CSV, com as mesmas colunas da raspagem."""
+    noticias = fila.noticias()
+    with open(csv_saida, mode='w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=CAMPOS_CSV)
+        writer.writeheader()
+        writer.writerows(noticias)
+    return len(noticias)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Raspagem distribuída do O Tempo com uma fila de notícias compartilhada.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    coordenador = subparsers.add_parser('coordenar', help="Busca um termo e enfileira as notícias encontradas.")
+    coordenador.add_argument('termo')
+    coordenador.add_argument('--workers', type=int, default=4, help="Navegadores em paralelo na busca (padrão: 4).")
+
+    worker = subparsers.add_parser('worker', help="Raspa as notícias da fila até ela se esvaziar.")
+    worker.add_argument('--processos', type=int, default=1, help="Workers nesta máquina (padrão: 1).")
+    worker.add_argument('--lote', type=int, default=4, help="Notícias alugadas por vez (padrão: 4).")
+    worker.add_argument('--aluguel', type=float, default=DURACAO_ALUGUEL_PADRAO, help="Duração do aluguel, em segundos.")
+    worker.add_argument('--enxuto', action='store_true', help="Navegador sem imagens/mídia, via proxy local.")
+
+    servidor = subparsers.add_parser('servir', help="Serve a fila por HTTP para workers em outras máquinas.")
+    servidor.add_argument('--host', default=HOST_PADRAO,
+                          help=f"Endereço de escuta (padrão: {HOST_PADRAO}; use 0.0.0.0 para outras máquinas, com --token).")
+    servidor.add_argument('--porta', type=int, default=PORTA_PADRAO)
+
+    subparsers.add_parser('status', help="Exibe o número de tarefas em cada estado.")
+
+    exportar = subparsers.add_parser('exportar', help="Grava as notícias coletadas em CSV.")
+    exportar.add_argument('saida')
+
+    for subparser in (coordenador, worker):
+        subparser.add_argument('--headless', action='store_true', help="Executa o Firefox sem interface gráfica.")
+    for subparser in subparsers.choices.values():
+        subparser.add_argument('--fila', default='fila_raspagem.db', help="Arquivo SQLite ou URL da fila (padrão: fila_raspagem.db).")
+        subparser.add_argument('--token', default=os.environ.get(VARIAVEL_TOKEN),
+                               help=f"Token compartilhado da fila HTTP (padrão: variável {VARIAVEL_TOKEN}).")
+    args = parser.parse_args()
+
+    if args.comando == 'worker':
+        executar_workers(args.fila, args.processos, lote=args.lote, duracao_aluguel=args.aluguel,
+                         headless=args.headless, enxuto=args.enxuto, token=args.token)
+    elif args.comando == 'servir':
+        if args.host not in ('127.0.0.1', 'localhost', '::1') and not args.token:
+            print(f"Aviso: a fila ficará acessível em {args.host} sem token; qualquer um na rede poderá alterá-la.")
+        servidor_fila = criar_servidor_fila(FilaSQLite(args.fila), args.host, args.porta, args.token)
+        print(f"Fila '{args.fila}' servida em {args.host}:{args.porta}. Ctrl+C para encerrar.")
+        try:
+            servidor_fila.serve_forever()
+        except KeyboardInterrupt:
+            servidor_fila.server_close()
+    else:
+        fila = abrir_fila(args.fila, args.token)
+        if args.comando == 'coordenar':
+            from planejador_busca import FiltroDatasIgnorado
+            try:
+                coordenar(args.termo, fila, workers=args.workers, headless=args.headless)
+            except FiltroDatasIgnorado as e:
+                print(f"Erro: {e}")
+                fila.fechar()
+                sys.exit(1)
+        elif args.comando == 'status':
+            print(json.dumps(fila.resumo(), ensure_ascii=False, indent=2))
+        elif args.comando == 'exportar':
+            print(f"{exportar_csv(fila, args.saida)} notícias salvas em '{args.saida}'")
+        fila.fechar()
@@ -0,0 +1,255 @@
+import argparse
+import csv
+import hashlib
+import io
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+"""
+Documentação do Script: imagens.py
+
+Propósito:
+----------
+Baixa as imagens principais das notícias (coluna `link_imagem_principal` do CSV da raspagem)
+para a análise visual, gera miniaturas e hashes perceptuais e liga o resultado a cada notícia.
+
+Funcionamento:
+--------------
+-   **Download concorrente:** várias threads compartilham uma única sessão `requests` com pool de
+    conexões (reaproveita conexões TCP/TLS com o servidor de imagens), limitadas por uma taxa
+    máxima de requisições por segundo para não sobrecarregar o site. As novas tentativas (erros
+    de rede, 429 e 5xx) também passam pelo limitador de taxa.
+-   **Deduplicação por URL:** cada URL é baixada uma única vez, mesmo que apareça em várias notícias.
+-   **Validação:** só são guardadas respostas que o Pillow consegue ler como imagem (uma página de
+    erro em HTML servida com status 200 vira `imagem_status` de erro, não um arquivo no acervo).
+    Imagens que falham na geração da miniatura ou do hash também ficam com status de erro.
+-   **Deduplicação por conteúdo:** os arquivos são guardados apenas pelo hash SHA-256 do conteúdo,
+    sem extensão (`imagens/originais/ab/abcdef...`); a mesma foto publicada em URLs diferentes, ou
+    servida com outro Content-Type, ocupa um único arquivo.
+-   **Miniaturas e hashes perceptuais:** gerados em um pool de processos (Pillow). O hash perceptual
+    (dHash de 64 bits) permite encontrar fotos quase iguais (recortes, compressões diferentes).
+-   **Resultado:** um novo CSV `<arquivo>_imagens.csv` com as colunas originais e
+    `imagem_sha256`, `imagem_arquivo`, `imagem_miniatura`, `imagem_dhash` e `imagem_status`.
+
+Uso:
+----
+    pip install requests pillow
+    python imagens.py noticias_otempo_galo_separado.csv --threads 8 --taxa 5
+"""
+
+COLUNAS_IMAGEM = ['imagem_sha256', 'imagem_arquivo', 'imagem_miniatura', 'imagem_dhash', 'imagem_status']
+
+# Valor gravado pelo raspador quando a imagem não pôde ser coletada (DETALHES_ERRO).
+ERRO_IMAGEM = "Erro ao coletar imagem"
+
+TAMANHO_MINIATURA = (256, 256)
+
+TENTATIVAS = 3  # Tentativas por imagem (a primeira e até duas novas tentativas).
+STATUS_NOVA_TENTATIVA = (429, 500, 502, 503, 504)
+
+
+class LimitadorTaxa:
+    """Limita o número de requisições por segundo, compartilhado entre as threads."""
+
+    def __init__(self, requisicoes_por_segundo):
+        self.intervalo = 1 / requisicoes_por_segundo if requisicoes_por_segundo else 0
+        self.proxima = time.monotonic()
+        self.trava = threading.Lock()
+
+    def aguardar(self):
+        with self.trava:
+            agora = time.monotonic()
+            espera = self.proxima - agora
+            self.proxima = max(agora, self.proxima) + self.intervalo
+        if espera > 0:
+            time.sleep(espera)
+
+
+def criar_sessao(conexoes):
+    """
+    Sessão HTTP com pool de conexões do tamanho do número de threads. Sem novas tentativas
+    automáticas: elas ficariam fora do limitador de taxa (ver `baixar_imagem`).
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    sessao = requests.Session()
+    sessao.headers['User-Agent'] = 'O Tempo Scraper News (pesquisa acadêmica)'
+    adaptador = HTTPAdapter(pool_connections=conexoes, pool_maxsize=conexoes, max_retries=0)
+    sessao.mount('http://', adaptador)
+    sessao.mount('https://', adaptador)
+    return sessao
+
+
+def _obter(sessao, limitador, url):
+    """
+    GET com até TENTATIVAS tentativas para erros de rede e STATUS_NOVA_TENTATIVA, com espera
+    exponencial entre elas. Cada tentativa passa pelo limitador de taxa.
+    """
+    import requests
+
+    for tentativa in range(TENTATIVAS):
+        if tentativa:
+            time.sleep(0.5 * 2 ** (tentativa - 1))
+        limitador.aguardar()
+        try:
+            resposta = sessao.get(url, timeout=30)
+        except (requests.ConnectionError, requests.Timeout):
+            if tentativa == TENTATIVAS - 1:
+                raise
+            continue
+        if resposta.status_code not in STATUS_NOVA_TENTATIVA or tentativa == TENTATIVAS - 1:
+            resposta.raise_for_status()
+            return resposta
+
+
+def _validar_imagem(resposta):
+    """Retorna None se a resposta traz uma imagem legível, ou o motivo da recusa."""
+    from PIL import Image
+
+    tipo = resposta.headers.get('Content-Type', '').split(';')[0].strip().lower()
+    if tipo and not tipo.startswith('image/') and tipo != 'application/octet-stream':
+        return f"conteúdo não é imagem ({tipo})"
+    try:
+        with Image.open(io.BytesIO(resposta.content)) as imagem:
+            imagem.verify()
+    except Exception as e:
+        return f"imagem inválida ({e})"
+    return None
+
+
+def baixar_imagem(sessao, limitador, url, pasta):
+    """
+    Baixa uma imagem e a guarda pelo hash do conteúdo. Se o arquivo já existir (mesma foto em
+    outra URL ou em execução anterior), não o grava de novo. Respostas que não são imagens
+    legíveis não são guardadas. Retorna (sha256, caminho, status).
+    """
+    try:
+        resposta = _obter(sessao, limitador, url)
+    except Exception as e:
+        return None, None, f"erro: {e}"
+    motivo = _validar_imagem(resposta)
+    if motivo:
+        return None, None, f"erro: {motivo}"
+
+    conteudo = resposta.content
+    sha256 = hashlib.sha256(conteudo).hexdigest()
+    # Só o hash no nome: a extensão viria da URL ou do Content-Type e separaria cópias do mesmo conteúdo.
+    caminho = os.path.join(pasta, sha256[:2], sha256)
+    if os.path.exists(caminho):
+        return sha256, caminho, 'duplicada'
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    temporario = f"{caminho}.{threading.get_ident()}.tmp"
+    with open(temporario, 'wb') as arquivo:
+        arquivo.write(conteudo)
+    os.replace(temporario, caminho)
+    return sha256, caminho, 'baixada'
+
+
+def dhash(imagem, tamanho=8):
+    """Hash perceptual por diferença (dHash): compara o brilho de pixels vizinhos numa versão reduzida."""
+    from PIL import Image
+
+    reduzida = imagem.convert('L').resize((tamanho + 1, tamanho), Image.LANCZOS)
+    pixels = list(reduzida.getdata())
+    bits = 0
+    for linha in range(tamanho):
+        for coluna in range(tamanho):
+            esquerda = pixels[linha * (tamanho + 1) + coluna]
+            direita = pixels[linha * (tamanho + 1) + coluna + 1]
+            bits = (bits << 1) | (esquerda > direita)
+    return f"{bits:0{tamanho * tamanho // 4}x}"
+
+
+def processar_imagem(caminho, pasta_miniaturas):
+    """Executado no pool de processos: gera a miniatura JPEG e o dHash de uma imagem."""
+    from PIL import Image
+
+    nome = os.path.splitext(os.path.basename(caminho))[0]
+    caminho_miniatura = os.path.join(pasta_miniaturas, nome[:2], nome + '.jpg')
+    with Image.open(caminho) as imagem:
+        hash_perceptual = dhash(imagem)
+        if not os.path.exists(caminho_miniatura):
+            os.makedirs(os.path.dirname(caminho_miniatura), exist_ok=True)
+            miniatura = imagem.convert('RGB')
+            miniatura.thumbnail(TAMANHO_MINIATURA)
+            miniatura.save(caminho_miniatura, 'JPEG', quality=85)
+    return caminho_miniatura, hash_perceptual
+
+
+def processar_imagens_csv(csv_entrada, pasta='imagens', threads=8, requisicoes_por_segundo=5, processos=None):
+    """Baixa, deduplica e processa as imagens de um CSV da raspagem; grava `<arquivo>_imagens.csv`."""
+    with open(csv_entrada, newline='', encoding='utf-8') as csv_file:
+        leitor = csv.DictReader(csv_file)
+        campos = leitor.fieldnames
+        noticias = list(leitor)
+
+    urls = []
+    urls_vistas = set()
+    for noticia in noticias:
+        url = (noticia.get('link_imagem_principal') or '').strip()
+        if url.startswith('http') and url not in urls_vistas:
+            urls_vistas.add(url)
+            urls.append(url)
+    print(f"{len(noticias)} notícias, {len(urls)} URLs de imagem distintas.")
+
+    pasta_originais = os.path.join(pasta, 'originais')
+    pasta_miniaturas = os.path.join(pasta, 'miniaturas')
+    sessao = criar_sessao(threads)
+    limitador = LimitadorTaxa(requisicoes_por_segundo)
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        baixadas = dict(zip(urls, executor.map(lambda url: baixar_imagem(sessao, limitador, url, pasta_originais), urls)))
+
+    arquivos = sorted({caminho for _, caminho, _ in baixadas.values() if caminho})
+    print(f"{len(arquivos)} imagens distintas pelo conteúdo. Gerando miniaturas e hashes perceptuais...")
+    processadas = {}
+    with ProcessPoolExecutor(max_workers=processos) as executor:
+        futuros = {caminho: executor.submit(processar_imagem, caminho, pasta_miniaturas) for caminho in arquivos}
+        for caminho, futuro in futuros.items():
+            try:
+                processadas[caminho] = futuro.result()
+            except Exception as e:
+                print(f"  Erro ao processar a imagem {caminho}: {e}")
+
+    for noticia in noticias:
+        url = (noticia.get('link_imagem_principal') or '').strip()
+        if url not in baixadas:
+            status = 'erro na coleta' if url == ERRO_IMAGEM else 'sem imagem'
+            noticia.update(dict.fromkeys(COLUNAS_IMAGEM[:-1], ''), imagem_status=status)
+            continue
+        sha256, caminho, status = baixadas[url]
+        miniatura, hash_perceptual = processadas.get(caminho, ('', ''))
+        if caminho and caminho not in processadas:
+            status = 'erro no processamento'
+        noticia.update({
+            'imagem_sha256': sha256 or '',
+            'imagem_arquivo': caminho or '',
+            'imagem_miniatura': miniatura,
+            'imagem_dhash': hash_perceptual,
+            'imagem_status': status,
+        })
+
+    csv_saida = f"{csv_entrada.rsplit('.', 1)[0]}_imagens.csv"
+    with open(csv_saida, mode='w', newline='', encoding='utf-8') as csv_file:
+        writer = csv.DictWriter(csv_file, fieldnames=campos + [c for c in COLUNAS_IMAGEM if c not in campos])
+        writer.writeheader()
+        writer.writerows(noticias)
+    return csv_saida
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Baixa e processa as imagens principais das notícias raspadas.")
+    parser.add_argument('csv', help="CSV gerado pela raspagem.")
+    parser.add_argument('--pasta', default='imagens', help="Pasta de destino das imagens (padrão: imagens).")
+    parser.add_argument('--threads', type=int, default=8, help="Downloads simultâneos (padrão: 8).")
+    parser.add_argument('--taxa', type=float, default=5, help="Máximo de requisições por segundo (padrão: 5).")
+    parser.add_argument('--processos', type=int, default=None, help="Processos para miniaturas/hashes (padrão: número de CPUs).")
+    args = parser.parse_args()
+
+    try:
+        saida = processar_imagens_csv(args.csv, args.pasta, args.threads, args.taxa, args.processos)
+        print(f"\nResultados salvos em '{saida}'")
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{args.csv}' não foi encontrado.")
@@ -0,0 +1,174 @@
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+
+"""
+Documentação do Script: instrumentacao.py
+
+Propósito:
+----------
+Instrumentação da raspagem: mede o tempo gasto em cada etapa (carregamento da página de busca,
+esperas do Selenium, pausas fixas, acesso às notícias, leitura do HTML e gravação do CSV),
+conta notícias, páginas e falhas e calcula a taxa de notícias por minuto. O tempo gasto
+esperando o usuário (perguntas no terminal, pausas para inspeção manual) fica fora da
+duração total e da taxa (ver `fora_do_relogio`).
+
+Uso:
+----
+    metricas = Instrumentacao()
+    with metricas.etapa('carregar_busca'):
+        driver.get(url)
+    metricas.contar('falhas_noticia')
+    metricas.imprimir_resumo()
+    metricas.exportar_json('metricas.json')
+    metricas.exportar_prometheus('metricas.prom')
+
+As etapas ficam guardadas como histogramas (p50/p95/p99) e podem ser exportadas em JSON
+ou no formato de texto do Prometheus. Uma mesma `Instrumentacao` pode ser compartilhada
+pelas threads de uma raspagem paralela (ver planejador_busca.py).
+"""
+
+# Limites (em segundos) dos buckets do histograma exportado para o Prometheus.
+BUCKETS_PROMETHEUS = (0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 45, 60, 120, 300)
+
+
+class Histograma:
+    """Guarda as durações observadas de uma etapa e calcula percentis."""
+
+    def __init__(self):
+        self.amostras = []
+        self.soma = 0.0
+
+    def observar(self, duracao):
+        self.amostras.append(duracao)
+        self.soma += duracao
+
+    def percentil(self, p):
+        """Percentil pelo método do posto mais próximo (p entre 0 e 100)."""
+        if not self.amostras:
+            return 0.0
+        ordenadas = sorted(self.amostras)
+        posto = max(1, math.ceil(p / 100 * len(ordenadas)))
+        return ordenadas[posto - 1]
+
+    def resumo(self):
+        return {
+            'contagem': len(self.amostras),
+            'total_s': round(self.soma, 4),
+            'media_s': round(self.soma / len(self.amostras), 4) if self.amostras else 0.0,
+            'p50_s': round(self.percentil(50), 4),
+            'p95_s': round(self.percentil(95), 4),
+            'p99_s': round(self.percentil(99), 4),
+            'max_s': round(max(self.amostras), 4) if self.amostras else 0.0,
+        }
+
+
+class Instrumentacao:
+    """Coleta os tempos por etapa e os contadores de uma execução da raspagem."""
+
+    def __init__(self):
+        self.etapas = {}      # nome da etapa -> Histograma
+        self.contadores = {}  # nome do contador -> valor
+        self.inicio = time.perf_counter()
+        self.tempo_fora_do_relogio = 0.0  # segundos esperando o usuário, descontados da duração total
+        self.trava = threading.Lock()
+
+    @contextmanager
+    def etapa(self, nome):
+        """Mede a duração do bloco `with` e a registra no histograma da etapa."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observar(nome, time.perf_counter() - inicio)
+
+    def observar(self, nome, duracao):
+        with self.trava:
+            self.etapas.setdefault(nome, Histograma()).observar(duracao)
+
+    def pausa(self, segundos, nome='pausa_fixa'):
+        """Substitui `time.sleep`, contabilizando o tempo de espera como uma etapa."""
+        with self.etapa(nome):
+            time.sleep(segundos)
+
+    def descontar(self, segundos):
+        """Exclui `segundos` (ex: o tempo esperando um `input()`) da duração total e da taxa de notícias."""
+        with self.trava:
+            self.tempo_fora_do_relogio += segundos
+
+    @contextmanager
+    def fora_do_relogio(self):
+        """Exclui a duração do bloco `with` da duração total e da taxa de notícias (ver `descontar`)."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.descontar(time.perf_counter() - inicio)
+
+    def contar(self, nome, quantidade=1):
+        with self.trava:
+            self.contadores[nome] = self.contadores.get(nome, 0) + quantidade
+
+    def duracao_total(self):
+        return time.perf_counter() - self.inicio - self.tempo_fora_do_relogio
+
+    def noticias_por_minuto(self):
+        duracao = self.duracao_total()
+        if duracao <= 0:
+            return 0.0
+        return self.contadores.get('noticias_coletadas', 0) / duracao * 60
+
+    def como_dict(self):
+        return {
+            'duracao_total_s': round(self.duracao_total(), 4),
+            'noticias_por_minuto': round(self.noticias_por_minuto(), 4),
+            'contadores': dict(self.contadores),
+            'etapas': {nome: hist.resumo() for nome, hist in self.etapas.items()},
+        }
+
+    def exportar_json(self, caminho):
+        with open(caminho, mode='w', encoding='utf-8') as arquivo:
+            json.dump(self.como_dict(), arquivo, ensure_ascii=False, indent=2)
+
+    def texto_prometheus(self):
+        """Gera as métricas no formato de exposição em texto do Prometheus."""
+        linhas = [
+            '# HELP otempo_etapa_duracao_segundos Duração de cada etapa da raspagem.',
+            '# TYPE otempo_etapa_duracao_segundos histogram',
+        ]
+        for nome, hist in self.etapas.items():
+            for limite in BUCKETS_PROMETHEUS:
+                acumulado = sum(1 for amostra in hist.amostras if amostra <= limite)
+                linhas.append(f'otempo_etapa_duracao_segundos_bucket{{etapa="{nome}",le="{limite}"}} {acumulado}')
+            linhas.append(f'otempo_etapa_duracao_segundos_bucket{{etapa="{nome}",le="+Inf"}} {len(hist.amostras)}')
+            linhas.append(f'otempo_etapa_duracao_segundos_sum{{etapa="{nome}"}} {hist.soma}')
+            linhas.append(f'otempo_etapa_duracao_segundos_count{{etapa="{nome}"}} {len(hist.amostras)}')
+
+        linhas.append('# HELP otempo_eventos_total Contadores de eventos da raspagem (notícias, páginas, falhas).')
+        linhas.append('# TYPE otempo_eventos_total counter')
+        for nome, valor in self.contadores.items():
+            linhas.append(f'otempo_eventos_total{{evento="{nome}"}} {valor}')
+
+        linhas.append('# HELP otempo_noticias_por_minuto Taxa de notícias coletadas por minuto.')
+        linhas.append('# TYPE otempo_noticias_por_minuto gauge')
+        linhas.append(f'otempo_noticias_por_minuto {self.noticias_por_minuto()}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar_prometheus(self, caminho):
+        with open(caminho, mode='w', encoding='utf-8') as arquivo:
+            arquivo.write(self.texto_prometheus())
+
+    def imprimir_resumo(self):
+        """Exibe no terminal uma tabela com o tempo de cada etapa, ordenada pelo tempo total."""
+        print("\n--- Resumo do tempo por etapa ---")
+        print(f"{'Etapa':<22} | {'N':>6} | {'Total (s)':>10} | {'p50 (s)':>8} | {'p95 (s)':>8} | {'p99 (s)':>8}")
+        print("-" * 78)
+        for nome, hist in sorted(self.etapas.items(), key=lambda item: item[1].soma, reverse=True):
+            r = hist.resumo()
+            print(f"{nome:<22} | {r['contagem']:>6} | {r['total_s']:>10.2f} | {r['p50_s']:>8.2f} | {r['p95_s']:>8.2f} | {r['p99_s']:>8.2f}")
+        print("-" * 78)
+        for nome, valor in self.contadores.items():
+            print(f"{nome:<22} | {valor}")
+        print(f"Duração total: {self.duracao_total():.1f} s | Notícias por minuto: {self.noticias_por_minuto():.2f}")
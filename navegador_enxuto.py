@@ -0,0 +1,349 @@
+import argparse
+import http.client
+import itertools
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+"""
+Documentação do Script: navegador_enxuto.py
+
+Propósito:
+----------
+Modo "enxuto" do navegador usado pelo raspador. O raspador só lê o DOM, mas o Firefox, por padrão,
+baixa todas as imagens, fontes, anúncios, scripts de analytics e players de vídeo das páginas do
+O Tempo. No modo enxuto:
+
+-   **Perfil do Firefox:** imagens, fontes baixáveis, autoplay de mídia e WebRTC desligados, e
+    estratégia de carregamento `eager` (o `driver.get` retorna no DOMContentLoaded; as esperas
+    do raspador continuam garantindo que os resultados da busca apareceram).
+-   **Proxy local (`ProxyEnxuto`):** todo o tráfego passa por um proxy em 127.0.0.1 que bloqueia
+    domínios de terceiros (só o O Tempo, o Algolia da busca e os DOMINIOS_EXTRAS passam) e conta
+    os bytes transferidos. O site usa só HTTPS e o proxy não intercepta TLS (apenas
+    repassa o túnel CONNECT), então ele não guarda nada em cache.
+-   **Cache em disco do Firefox:** cada Firefox usa um perfil temporário próprio (criado pelo
+    geckodriver), de modo que vários navegadores enxutos podem rodar ao mesmo tempo (`--fatiar
+    --workers N`, vários `fila_raspagem.py worker`). O cache em disco fica em subpastas
+    persistentes de PASTA_CACHE_FIREFOX (`0`, `1`, ...), que sobrevivem entre execuções. O cache do
+    Firefox supõe acesso exclusivo à sua pasta, então cada navegador reserva uma subpasta livre
+    (`reservar_pasta_cache`, com uma trava de arquivo liberada quando o navegador é descartado
+    ou o processo termina) e nunca divide a mesma pasta com outro Firefox em execução.
+
+Modo de medição:
+----------------
+    python navegador_enxuto.py https://www.otempo.com.br/busca?q=galo https://www.otempo.com.br/...
+
+Carrega as mesmas URLs com o navegador padrão e com o modo enxuto (ambos passando pelo proxy, que
+só bloqueia no modo enxuto) e exibe bytes transferidos e tempo médio por página em cada modo.
+"""
+
+PASTA_BASE = os.path.dirname(os.path.abspath(__file__))
+PASTA_CACHE_FIREFOX = os.path.join(PASTA_BASE, '.cache', 'firefox_enxuto')
+
+# Domínios próprios do site e o Algolia, que entrega os resultados da busca via AJAX.
+DOMINIOS_PERMITIDOS = ('otempo.com.br', 'jornalotempo.com.br', 'algolia.net', 'algolianet.com', 'algolia.io')
+DOMINIOS_LOCAIS = ('localhost', '127.0.0.1')
+
+# Cabeçalhos "hop-by-hop", que não devem ser repassados pelo proxy.
+CABECALHOS_HOP_BY_HOP = {'connection', 'keep-alive', 'proxy-authenticate', 'proxy-authorization',
+                         'proxy-connection', 'te', 'trailers', 'transfer-encoding', 'upgrade'}
+
+# Preferências do Firefox no modo enxuto.
+PREFERENCIAS_ENXUTAS = {
+    'permissions.default.image': 2,                 # não carrega imagens
+    'gfx.downloadable_fonts.enabled': False,        # não baixa fontes da web
+    'browser.display.use_document_fonts': 0,
+    'media.autoplay.default': 5,                    # bloqueia autoplay de áudio e vídeo
+    'media.autoplay.blocking_policy': 2,
+    'media.peerconnection.enabled': False,          # sem WebRTC
+    'media.navigator.enabled': False,
+    'dom.webnotifications.enabled': False,
+    'browser.cache.disk.enable': True,              # cache em disco, em PASTA_CACHE_FIREFOX
+    'browser.cache.disk.capacity': 512000,          # 500 MB
+    'browser.cache.disk.smart_size.enabled': False,
+}
+
+
+class _ManipuladorProxy(BaseHTTPRequestHandler):
+    """Repassa CONNECT (HTTPS) e requisições HTTP, bloqueando domínios de terceiros."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass  # Silencia o log de cada requisição no terminal.
+
+    @property
+    def proxy(self):
+        return self.server.proxy
+
+    def do_CONNECT(self):
+        host, _, porta = self.path.rpartition(':')
+        if not self.proxy.permitido(host):
+            self.proxy.registrar_bloqueio()
+            self.send_error(403, "Dominio bloqueado pelo modo enxuto")
+            return
+        try:
+            destino = socket.create_connection((host, int(porta or 443)), timeout=30)
+        except OSError:
+            self.send_error(502)
+            return
+        self.send_response(200, 'Connection Established')
+        self.end_headers()
+        self.close_connection = True
+        self.proxy.registrar(0, 0)
+        self._tunel(self.connection, destino)
+
+    def _tunel(self, cliente, destino):
+        seletor = selectors.DefaultSelector()
+        seletor.register(cliente, selectors.EVENT_READ, destino)
+        seletor.register(destino, selectors.EVENT_READ, cliente)
+        try:
+            while True:
+                eventos = seletor.select(timeout=60)
+                if not eventos:
+                    return
+                for chave, _ in eventos:
+                    dados = chave.fileobj.recv(65536)
+                    if not dados:
+                        return
+                    chave.data.sendall(dados)
+                    if chave.fileobj is destino:
+                        self.proxy.registrar(0, len(dados), contar_requisicao=False)
+                    else:
+                        self.proxy.registrar(len(dados), 0, contar_requisicao=False)
+        except OSError:
+            return
+        finally:
+            seletor.close()
+            destino.close()
+
+    def _repassar(self):
+        url = urlsplit(self.path)
+        host = url.hostname or ''
+        if not self.proxy.permitido(host):
+            self.proxy.registrar_bloqueio()
+            self.send_error(403, "Dominio bloqueado pelo modo enxuto")
+            return
+
+        tamanho_corpo = int(self.headers.get('Content-Length') or 0)
+        corpo = self.rfile.read(tamanho_corpo) if tamanho_corpo else None
+
+        caminho = url.path + (f'?{url.query}' if url.query else '')
+        cabecalhos = {nome: valor for nome, valor in self.headers.items() if nome.lower() not in CABECALHOS_HOP_BY_HOP}
+        classe = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+        conexao = classe(host, url.port, timeout=30)
+        try:
+            conexao.request(self.command, caminho or '/', body=corpo, headers=cabecalhos)
+            resposta = conexao.getresponse()
+            conteudo = resposta.read()
+            cabecalhos_resposta = [(nome, valor) for nome, valor in resposta.getheaders()
+                                   if nome.lower() not in CABECALHOS_HOP_BY_HOP | {'content-length'}]
+            status = resposta.status
+        except OSError:
+            self.send_error(502)
+            return
+        finally:
+            conexao.close()
+
+        self.proxy.registrar(len(corpo or b''), len(conteudo))
+        self._responder(status, cabecalhos_resposta, conteudo)
+
+    def _responder(self, status, cabecalhos, conteudo):
+        self.send_response(status)
+        for nome, valor in cabecalhos:
+            self.send_header(nome, valor)
+        self.send_header('Content-Length', str(len(conteudo)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(conteudo)
+
+    do_GET = _repassar
+    do_HEAD = _repassar
+    do_POST = _repassar
+
+
+class ProxyEnxuto:
+    """
+    Proxy HTTP local com bloqueio de domínios de terceiros e contagem dos bytes transferidos.
+    Use como gerenciador de contexto (`with`). Com `bloquear=False` apenas conta o tráfego (usado na medição).
+    """
+
+    def __init__(self, porta=0, bloquear=True, dominios_extras=()):
+        self.bloquear = bloquear
+        self.dominios = DOMINIOS_PERMITIDOS + DOMINIOS_LOCAIS + tuple(dominios_extras)
+        self.trava = threading.Lock()
+        self.zerar_contadores()
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', porta), _ManipuladorProxy)
+        self.servidor.daemon_threads = True
+        self.servidor.proxy = self
+        self.thread = None
+
+    @property
+    def porta(self):
+        return self.servidor.server_address[1]
+
+    def zerar_contadores(self):
+        self.requisicoes = 0
+        self.bloqueadas = 0
+        self.bytes_enviados = 0
+        self.bytes_recebidos = 0
+
+    def permitido(self, host):
+        if not self.bloquear:
+            return True
+        host = host.lower().strip('[]')
+        return any(host == dominio or host.endswith('.' + dominio) for dominio in self.dominios)
+
+    def registrar(self, enviados, recebidos, contar_requisicao=True):
+        with self.trava:
+            if contar_requisicao:
+                self.requisicoes += 1
+            self.bytes_enviados += enviados
+            self.bytes_recebidos += recebidos
+
+    def registrar_bloqueio(self):
+        with self.trava:
+            self.bloqueadas += 1
+
+    def resumo(self):
+        with self.trava:
+            return {
+                'requisicoes': self.requisicoes,
+                'bloqueadas': self.bloqueadas,
+                'bytes_enviados': self.bytes_enviados,
+                'bytes_recebidos': self.bytes_recebidos,
+            }
+
+    def iniciar(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+def _travar_arquivo(arquivo):
+    """Trava exclusiva e não bloqueante sobre `arquivo`; levanta OSError se outro processo ou navegador a tiver."""
+    try:
+        import fcntl
+    except ImportError:  # Windows
+        import msvcrt
+        msvcrt.locking(arquivo.fileno(), msvcrt.LK_NBLCK, 1)
+    else:
+        fcntl.flock(arquivo.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+
+def reservar_pasta_cache(pasta_base=PASTA_CACHE_FIREFOX):
+    """
+    Reserva a primeira subpasta de cache livre de `pasta_base` (`0`, `1`, ...). Retorna (pasta, trava):
+    a subpasta fica reservada até `trava.close()` ou o fim do processo.
+    """
+    for indice in itertools.count():
+        pasta = os.path.join(pasta_base, str(indice))
+        os.makedirs(pasta, exist_ok=True)
+        trava = open(os.path.join(pasta, '.trava'), 'a')
+        try:
+            _travar_arquivo(trava)
+        except OSError:
+            trava.close()
+            continue
+        return pasta, trava
+
+
+def configurar_opcoes_enxutas(options, porta_proxy=None, pasta_cache_firefox=None):
+    """
+    Aplica as preferências enxutas a um `webdriver.FirefoxOptions` (e o proxy local, se informado).
+    O perfil continua sendo o temporário criado pelo geckodriver para cada Firefox (um perfil fixo
+    fica travado pela primeira instância e impede as demais de abrir); só o cache em disco fica
+    na pasta persistente `pasta_cache_firefox`, que deve ser exclusiva deste Firefox
+    (ver `reservar_pasta_cache`).
+    """
+    options.page_load_strategy = 'eager'
+    for nome, valor in PREFERENCIAS_ENXUTAS.items():
+        options.set_preference(nome, valor)
+    if pasta_cache_firefox:
+        options.set_preference('browser.cache.disk.parent_directory', pasta_cache_firefox)
+    if porta_proxy:
+        configurar_proxy(options, porta_proxy)
+    return options
+
+
+def configurar_proxy(options, porta_proxy):
+    """Faz o Firefox usar o proxy local para HTTP e HTTPS (inclusive para localhost)."""
+    options.set_preference('network.proxy.type', 1)
+    options.set_preference('network.proxy.http', '127.0.0.1')
+    options.set_preference('network.proxy.http_port', porta_proxy)
+    options.set_preference('network.proxy.ssl', '127.0.0.1')
+    options.set_preference('network.proxy.ssl_port', porta_proxy)
+    options.set_preference('network.proxy.no_proxies_on', '')
+    options.set_preference('network.proxy.allow_hijacking_localhost', True)
+    return options
+
+
+def medir_modo_enxuto(urls, headless=True):
+    """
+    Carrega as URLs no modo padrão e no modo enxuto, sempre pelo proxy local (que só bloqueia no
+    modo enxuto), e retorna bytes transferidos e tempo por página em cada modo.
+    """
+    from otemposcrapern13 import criar_driver
+
+    resultados = {}
+    for modo in ('padrao', 'enxuto'):
+        enxuto = modo == 'enxuto'
+        with ProxyEnxuto(bloquear=enxuto) as proxy:
+            driver = criar_driver(headless=headless, enxuto=enxuto, porta_proxy=proxy.porta)
+            tempos = []
+            try:
+                for url in urls:
+                    inicio = time.perf_counter()
+                    driver.get(url)
+                    tempos.append(time.perf_counter() - inicio)
+            finally:
+                driver.quit()
+            resultados[modo] = {
+                **proxy.resumo(),
+                'paginas': len(urls),
+                'tempo_medio_pagina_s': round(sum(tempos) / len(tempos), 4) if tempos else 0.0,
+                'bytes_por_pagina': round(proxy.bytes_recebidos / len(urls)) if urls else 0,
+            }
+    return resultados
+
+
+def imprimir_comparacao(resultados):
+    padrao, enxuto = resultados['padrao'], resultados['enxuto']
+    print("\n--- Navegador padrão x modo enxuto ---")
+    print(f"{'Medida':<26} | {'Padrão':>14} | {'Enxuto':>14} | {'Redução':>8}")
+    print("-" * 72)
+    for chave, rotulo in (('bytes_recebidos', 'Bytes recebidos'), ('bytes_por_pagina', 'Bytes por página'),
+                          ('tempo_medio_pagina_s', 'Tempo médio/página (s)'), ('requisicoes', 'Requisições')):
+        reducao = f"{(1 - enxuto[chave] / padrao[chave]) * 100:.0f}%" if padrao[chave] else '-'
+        print(f"{rotulo:<26} | {padrao[chave]:>14} | {enxuto[chave]:>14} | {reducao:>8}")
+    print(f"{'Bloqueadas (enxuto)':<26} | {'':>14} | {enxuto['bloqueadas']:>14} |")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Mede a economia do modo enxuto do navegador em relação ao padrão.")
+    parser.add_argument('urls', nargs='+', help="URLs a carregar (ex: páginas de busca e de notícias do O Tempo).")
+    parser.add_argument('--com-interface', action='store_true', help="Mostra o Firefox (padrão: headless).")
+    parser.add_argument('--saida', default=None, help="Salva o resultado também em JSON.")
+    args = parser.parse_args()
+
+    resultados = medir_modo_enxuto(args.urls, headless=not args.com_interface)
+    imprimir_comparacao(resultados)
+    if args.saida:
+        with open(args.saida, mode='w', encoding='utf-8') as arquivo:
+            json.dump(resultados, arquivo, ensure_ascii=False, indent=2)
+        print(f"\nResultado salvo em '{args.saida}'")
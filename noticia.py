@@ -0,0 +1,305 @@
+import csv
+import io
+import re
+import sys
+from datetime import date, datetime, time
+
+"""
+Documentação do Script: noticia.py
+
+Propósito:
+----------
+Registro tipado de uma notícia, compartilhado pelo raspador e pelas análises.
+
+Antes, cada notícia circulava como um dicionário de 10 chaves com tudo em texto: erros de coleta
+eram strings mágicas ("Erro ao coletar data"), as tags eram uma string separada por vírgulas que
+`50_palavras21.py` separava de novo, e a data ("11 de junho de 2025") e o horário só viravam datas
+de verdade em `trabalho_dados_dinamico_pandas.py`. Aqui:
+
+-   **`Noticia`:** registro com `__slots__` (sem um dicionário por instância), com a `data` de
+    publicação já interpretada (date) e a `hora` (time, ou None quando o site não informa o
+    horário: ausente, não meia-noite), `tags` como tupla de strings, `tem_video` booleano, campos
+    ausentes como None e o estado da coleta explícito em `status` (STATUS_OK ou STATUS_ERRO_COLETA).
+    O texto original de `data_pura` e `horario` também é guardado, tal como veio da página.
+-   **`LoteNoticias`:** contêiner colunar (uma lista por campo) que converte para e a partir de
+    DataFrames do pandas e tabelas do Arrow coluna a coluna, sem montar um dicionário por linha,
+    e grava/lê Parquet, preservando os tipos entre as etapas.
+-   **CSV:** `como_linha_csv`/`de_dict` convertem para e a partir do formato de texto do CSV
+    da raspagem, que continua igual (mesmas colunas e as mesmas strings de erro). A data e o
+    horário são gravados com o texto original, não reconstruídos a partir dos valores
+    interpretados ("N/A", "18h05", "01 de Junho de 2025" ou uma data ilegível saem como entraram).
+    `python noticia.py arquivo.csv` confere que ler e regravar um CSV da raspagem, direto ou
+    passando pelo Arrow/Parquet, reproduz cada campo de cada linha.
+
+Uso:
+----
+    noticias = carregar_noticias('noticias_otempo_galo_separado.csv')   # ou .parquet
+    df = noticias.para_pandas()        # 'data' datetime64, 'tags' com listas de tags, 'status' categórico
+    noticias.gravar_parquet('noticias_otempo_galo.parquet')
+"""
+
+# Colunas do CSV gerado pela raspagem.
+CAMPOS_CSV = ['titulo', 'subtitulo', 'data_pura', 'horario', 'link_noticia',
+              'texto_completo', 'link_imagem_principal', 'tem_video', 'nome_reporter', 'tags_noticia']
+
+# Valores gravados no CSV quando a página da notícia não pôde ser acessada ou lida.
+DETALHES_ERRO = {
+    'data_pura': "Erro ao coletar data",
+    'horario': "Erro",
+    'texto_completo': "Erro ao coletar texto",
+    'link_imagem_principal': "Erro ao coletar imagem",
+    'tem_video': False,
+    'nome_reporter': "Erro ao coletar repórter",
+    'tags_noticia': "Erro ao coletar tags",
+}
+
+# As mesmas strings, para trocar por valores nulos em DataFrames lidos diretamente do CSV.
+STRINGS_DE_ERRO = tuple(valor for valor in DETALHES_ERRO.values() if isinstance(valor, str))
+
+STATUS_OK = 'ok'
+STATUS_ERRO_COLETA = 'erro_coleta'
+
+# Campos de Noticia, na ordem das colunas de LoteNoticias.
+CAMPOS = ('titulo', 'subtitulo', 'link_noticia', 'data', 'hora', 'texto_completo', 'link_imagem_principal',
+          'tem_video', 'nome_reporter', 'tags', 'status', 'data_pura', 'horario')
+
+MESES = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
+
+PADRAO_DATA_PURA = re.compile(r'(\d{1,2})\s+de\s+([a-zçã]+)\s+de\s+(\d{4})', re.IGNORECASE)
+PADRAO_HORARIO = re.compile(r'(\d{1,2})[:h](\d{2})')
+
+
+def interpretar_data(data_pura):
+    """Converte a data no formato do site ("11 de junho de 2025") em date; None se não puder ser interpretada."""
+    match = PADRAO_DATA_PURA.search(data_pura or '')
+    if not match or match.group(2).lower() not in MESES:
+        return None
+    try:
+        return date(int(match.group(3)), MESES.index(match.group(2).lower()) + 1, int(match.group(1)))
+    except ValueError:
+        return None
+
+
+def formatar_data(data):
+    """Formata uma data como no site: "11 de junho de 2025"."""
+    return f"{data.day} de {MESES[data.month - 1]} de {data.year}"
+
+
+def formatar_tags(tags):
+    """Tags no formato de texto do CSV da raspagem: "Política, Economia", ou "N/A" sem tags."""
+    return ", ".join(tags) if tags else "N/A"
+
+
+def interpretar_horario(horario):
+    """Converte o horário do site ("18:05" ou "18h05") em time; None se a notícia não tem horário ("N/A")."""
+    match = PADRAO_HORARIO.search(horario or '')
+    if not match:
+        return None
+    try:
+        return time(int(match.group(1)), int(match.group(2)))
+    except ValueError:
+        return None
+
+
+class Noticia:
+    """Uma notícia raspada, com campos tipados. Campos não encontrados na página ficam como None."""
+
+    __slots__ = CAMPOS
+
+    def __init__(self, titulo, subtitulo, link_noticia, data=None, hora=None, texto_completo=None,
+                 link_imagem_principal=None, tem_video=False, nome_reporter=None, tags=(), status=STATUS_OK,
+                 data_pura=None, horario=None):
+        self.titulo = titulo
+        self.subtitulo = subtitulo
+        self.link_noticia = link_noticia
+        self.data = data
+        self.hora = hora
+        self.texto_completo = texto_completo
+        self.link_imagem_principal = link_imagem_principal
+        self.tem_video = bool(tem_video)
+        self.nome_reporter = nome_reporter
+        self.tags = tuple(tags or ())
+        self.status = status
+        self.data_pura = data_pura  # Texto original da página, gravado de volta no CSV sem alterações.
+        self.horario = horario
+
+    @classmethod
+    def de_dict(cls, dados):
+        """
+        Cria a notícia a partir de um dicionário no formato do CSV da raspagem (ou de titulo,
+        subtitulo e link_noticia somados ao resultado de `extrair_detalhes_noticia`).
+        """
+        titulo, subtitulo, link_noticia = dados.get('titulo') or None, dados.get('subtitulo') or None, dados.get('link_noticia') or None
+        if all(dados.get(campo) == valor for campo, valor in DETALHES_ERRO.items() if isinstance(valor, str)):
+            return cls(titulo, subtitulo, link_noticia, status=STATUS_ERRO_COLETA)
+        tags_noticia = dados.get('tags_noticia') or ''
+        data_pura, horario = dados.get('data_pura') or None, dados.get('horario') or None
+        return cls(
+            titulo, subtitulo, link_noticia,
+            data=interpretar_data(data_pura),
+            hora=interpretar_horario(horario),
+            texto_completo=dados.get('texto_completo') or None,
+            link_imagem_principal=dados.get('link_imagem_principal') or None,
+            tem_video=dados.get('tem_video') in (True, 'True', 'true', '1'),
+            nome_reporter=sys.intern(dados['nome_reporter']) if dados.get('nome_reporter') else None,
+            # Repórteres e tags se repetem em muitas notícias: cada valor distinto fica uma única vez na memória.
+            tags=[sys.intern(tag.strip()) for tag in tags_noticia.split(',') if tag.strip() and tag.strip() != 'N/A'],
+            data_pura=data_pura,
+            horario=horario,
+        )
+
+    def como_linha_csv(self):
+        """Dicionário com as colunas de CAMPOS_CSV, no mesmo formato de texto gravado pela raspagem."""
+        if self.status == STATUS_ERRO_COLETA:
+            return {'titulo': self.titulo, 'subtitulo': self.subtitulo, 'link_noticia': self.link_noticia, **DETALHES_ERRO}
+        return {
+            'titulo': self.titulo,
+            'subtitulo': self.subtitulo,
+            'data_pura': self.data_pura,
+            'horario': self.horario,
+            'link_noticia': self.link_noticia,
+            'texto_completo': self.texto_completo,
+            'link_imagem_principal': self.link_imagem_principal,
+            'tem_video': self.tem_video,
+            'nome_reporter': self.nome_reporter,
+            'tags_noticia': formatar_tags(self.tags),
+        }
+
+    def __repr__(self):
+        return f"Noticia({self.titulo!r}, data={self.data!r}, hora={self.hora!r}, status={self.status!r})"
+
+
+class LoteNoticias:
+    """Notícias guardadas por colunas (uma lista por campo de CAMPOS)."""
+
+    def __init__(self, colunas=None):
+        self.colunas = colunas if colunas is not None else {campo: [] for campo in CAMPOS}
+
+    @classmethod
+    def de_noticias(cls, noticias):
+        lote = cls()
+        for noticia in noticias:
+            lote.acrescentar(noticia)
+        return lote
+
+    def acrescentar(self, noticia):
+        for campo in CAMPOS:
+            self.colunas[campo].append(getattr(noticia, campo))
+
+    def __len__(self):
+        return len(self.colunas['link_noticia'])
+
+    def __iter__(self):
+        for valores in zip(*(self.colunas[campo] for campo in CAMPOS)):
+            yield Noticia(*valores)
+
+    def para_pandas(self):
+        """
+        DataFrame com uma coluna por campo: 'data' em datetime64 (o dia), 'hora' com objetos time
+        (None sem horário), 'tem_video' booleano e 'status' categórico.
+        """
+        import pandas as pd
+
+        # dtype explícito: sem ele, as colunas de texto de um lote vazio sairiam como float64.
+        colunas = {campo: pd.Series(valores, dtype=object) for campo, valores in self.colunas.items()}
+        colunas['data'] = pd.to_datetime(colunas['data'])
+        colunas['tem_video'] = pd.array(colunas['tem_video'], dtype='boolean')
+        colunas['status'] = pd.Categorical(colunas['status'], categories=[STATUS_OK, STATUS_ERRO_COLETA])
+        return pd.DataFrame(colunas, columns=list(CAMPOS))
+
+    @classmethod
+    def de_pandas(cls, df):
+        """Cria o lote a partir de um DataFrame com as colunas de CAMPOS (ex: o de `para_pandas`)."""
+        colunas = {}
+        for campo in CAMPOS:
+            serie = df[campo].astype(object)
+            colunas[campo] = serie.where(serie.notna(), None).tolist()
+        colunas['data'] = [data.date() if isinstance(data, datetime) else data for data in colunas['data']]
+        colunas['tags'] = [tuple(tags) if tags is not None else () for tags in colunas['tags']]
+        return cls(colunas)
+
+    def para_arrow(self):
+        """Tabela do Arrow com tipos explícitos ('tags' como lista de strings, 'status' como dicionário)."""
+        import pyarrow as pa
+
+        tipos = {'data': pa.date32(), 'hora': pa.time32('s'), 'tem_video': pa.bool_(), 'tags': pa.list_(pa.string())}
+        tabela = {campo: pa.array(self.colunas[campo], tipos.get(campo, pa.string())) for campo in CAMPOS}
+        tabela['status'] = tabela['status'].dictionary_encode()
+        return pa.table(tabela)
+
+    @classmethod
+    def de_arrow(cls, tabela):
+        colunas = {campo: tabela.column(campo).to_pylist() for campo in CAMPOS}
+        colunas['tags'] = [tuple(tags or ()) for tags in colunas['tags']]
+        return cls(colunas)
+
+    def gravar_parquet(self, caminho):
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.para_arrow(), caminho)
+
+    @classmethod
+    def ler_parquet(cls, caminho):
+        import pyarrow.parquet as pq
+
+        return cls.de_arrow(pq.read_table(caminho, columns=list(CAMPOS)))
+
+    @classmethod
+    def ler_csv(cls, caminho):
+        """Lê um CSV da raspagem, interpretando datas, tags e erros uma única vez."""
+        with open(caminho, newline='', encoding='utf-8') as csv_file:
+            return cls.de_noticias(Noticia.de_dict(linha) for linha in csv.DictReader(csv_file))
+
+    def gravar_csv(self, caminho):
+        with open(caminho, mode='w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=CAMPOS_CSV)
+            writer.writeheader()
+            writer.writerows(noticia.como_linha_csv() for noticia in self)
+
+
+def carregar_noticias(caminho):
+    """Lê as notícias de um arquivo `.parquet` (tipos preservados) ou de um CSV da raspagem."""
+    if caminho.endswith('.parquet'):
+        return LoteNoticias.ler_parquet(caminho)
+    return LoteNoticias.ler_csv(caminho)
+
+
+def verificar_ida_e_volta(caminho):
+    """
+    Lê um CSV da raspagem como `LoteNoticias` e o regrava, direto e passando pelo Arrow (o caminho do
+    Parquet). Retorna as diferenças encontradas, como (linha, campo, valor original, valor regravado);
+    uma lista vazia significa que nenhuma informação do CSV se perde nas conversões.
+    """
+    with open(caminho, newline='', encoding='utf-8') as csv_file:
+        originais = list(csv.DictReader(csv_file))
+    lote = LoteNoticias.ler_csv(caminho)
+
+    diferencas = []
+    for lote_regravado in (lote, LoteNoticias.de_arrow(lote.para_arrow())):
+        saida = io.StringIO()
+        writer = csv.DictWriter(saida, fieldnames=CAMPOS_CSV)
+        writer.writeheader()
+        writer.writerows(noticia.como_linha_csv() for noticia in lote_regravado)
+        saida.seek(0)
+        for numero, (original, regravada) in enumerate(zip(originais, csv.DictReader(saida)), start=2):
+            for campo in CAMPOS_CSV:
+                if (original.get(campo) or '') != regravada[campo]:
+                    diferencas.append((numero, campo, original.get(campo), regravada[campo]))
+    return diferencas
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Confere que ler e regravar um CSV da raspagem não altera nenhum campo.")
+    parser.add_argument('csv', nargs='+', help="CSVs gerados pela raspagem.")
+    args = parser.parse_args()
+
+    total_diferencas = 0
+    for caminho_csv in args.csv:
+        diferencas = verificar_ida_e_volta(caminho_csv)
+        total_diferencas += len(diferencas)
+        for numero, campo, original, regravado in diferencas[:20]:
+            print(f"  {caminho_csv}, linha {numero}, {campo}: {original!r} -> {regravado!r}")
+        print(f"{caminho_csv}: {'ida e volta sem perdas' if not diferencas else f'{len(diferencas)} diferença(s)'}")
+    sys.exit(1 if total_diferencas else 0)
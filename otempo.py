@@ -0,0 +1,138 @@
+import argparse
+import importlib
+import sys
+
+"""
+Documentação do Script: otempo.py
+
+Propósito:
+----------
+Ponto de entrada único, não interativo, para as ferramentas do O Tempo Scraper News.
+Tudo é controlado por argumentos, sem `input()`, o que permite rodar as etapas em lote
+(scripts, agendadores, pipelines de dados).
+
+Cada subcomando importa apenas o que usa: `otempo.py --help` ou `otempo.py clean` não carregam
+Selenium, Matplotlib, WordCloud nem NLTK. A lista de stopwords do NLTK fica em cache local
+(ver `tokenizacao.py`), então o NLTK só é importado na primeira análise de n-grams.
+
+Subcomandos:
+------------
+    python otempo.py crawl "Pão de queijo" --paginas 3 --headless --enxuto --warc warc
+    python otempo.py crawl "eleições" --fatiar --workers 4 --headless
+    python otempo.py clean noticias_otempo_pão_de_queijo_separado.csv
+    python otempo.py temporal noticias_otempo_pão_de_queijo_separado.csv
+    python otempo.py ngrams noticias_otempo_pão_de_queijo_separado.csv --graficos salvar
+
+`ngrams` e `temporal` aceitam também o `.parquet` gravado por `crawl --saida arquivo.parquet`
+(ver `noticia.py`), em que datas e tags já vêm interpretadas.
+
+Os scripts originais (`otemposcrapern13.py`, `50_palavras21.py`, `trabalho_dados_dinamico_pandas.py`)
+continuam funcionando de forma interativa, como antes.
+"""
+
+
+def comando_crawl(args):
+    from instrumentacao import Instrumentacao
+    from otemposcrapern13 import nome_arquivo_csv, normalizar_termo, raspar_noticias_otempo, salvar_metricas, salvar_noticias_csv
+
+    gravador_warc = None
+    if args.warc:
+        from arquivo_warc import GravadorWarc
+        gravador_warc = GravadorWarc(args.warc, prefixo=f'otempo_{normalizar_termo(args.termo)}')
+
+    metricas = Instrumentacao()
+    if args.fatiar:
+        from planejador_busca import FiltroDatasIgnorado, raspar_noticias_fatiadas
+        try:
+            noticias_raspadas = raspar_noticias_fatiadas(
+                args.termo, metricas=metricas, workers=args.workers, headless=args.headless,
+                limite_noticias=args.noticias, gravador_warc=gravador_warc, enxuto=args.enxuto,
+            )
+        except FiltroDatasIgnorado as e:
+            print(f"\nErro: {e}")
+            return 1
+    else:
+        noticias_raspadas = raspar_noticias_otempo(
+            args.termo, metricas=metricas, headless=args.headless, interativo=False,
+            limite_paginas=args.paginas, limite_noticias=args.noticias, gravador_warc=gravador_warc, enxuto=args.enxuto,
+        )
+    if not noticias_raspadas:
+        print(f"\nNenhuma notícia foi raspada para o termo '{args.termo}'.")
+        return 1
+
+    csv_file_path = args.saida or nome_arquivo_csv(args.termo)
+    if csv_file_path.endswith('.parquet'):
+        with metricas.etapa('gravar_parquet'):
+            noticias_raspadas.gravar_parquet(csv_file_path)
+        print(f"\nDados salvos com sucesso em '{csv_file_path}'")
+    elif not salvar_noticias_csv(noticias_raspadas, csv_file_path, metricas):
+        return 1
+    salvar_metricas(metricas, csv_file_path)
+    # Páginas de busca que não carregaram (--fatiar): o arquivo foi salvo, mas está incompleto.
+    return 1 if metricas.contadores.get('paginas_busca_perdidas') else 0
+
+
+# As funções de análise exibem os erros (ex: arquivo não encontrado) e retornam False;
+# os subcomandos convertem isso em código de saída diferente de zero, para pipelines.
+
+def comando_clean(args):
+    trabalho = importlib.import_module('trabalho_dados_dinamico_pandas')
+    return 0 if trabalho.limpar_csv_noticias(args.csv) else 1
+
+
+def comando_temporal(args):
+    trabalho = importlib.import_module('trabalho_dados_dinamico_pandas')
+    return 0 if trabalho.processar_csv_noticias(args.csv) else 1
+
+
+def comando_ngrams(args):
+    palavras21 = importlib.import_module('50_palavras21')
+    return 0 if palavras21.encontrar_palavras_mais_usadas(args.csv, graficos=args.graficos) else 1
+
+
+def criar_parser():
+    parser = argparse.ArgumentParser(prog='otempo', description="O Tempo Scraper News: raspagem e análise de notícias do portal O Tempo.")
+    subparsers = parser.add_subparsers(dest='comando', required=True)
+
+    crawl = subparsers.add_parser('crawl', help="Raspa as notícias de um termo de busca e salva em CSV.")
+    crawl.add_argument('termo', help="Termo de busca (ex: 'Pão de queijo').")
+    limites = crawl.add_mutually_exclusive_group()
+    limites.add_argument('--paginas', type=int, default=None, help="Número máximo de páginas de busca (padrão: todas).")
+    limites.add_argument('--noticias', type=int, default=None, help="Número máximo de notícias (as mais recentes).")
+    crawl.add_argument('--headless', action='store_true', help="Executa o Firefox sem interface gráfica.")
+    crawl.add_argument('--enxuto', action='store_true', help="Navegador sem imagens/mídia, via proxy local que bloqueia terceiros.")
+    crawl.add_argument('--fatiar', action='store_true',
+                       help="Divide a busca em fatias de datas abaixo do limite de paginação do site e as percorre em paralelo.")
+    crawl.add_argument('--workers', type=int, default=4, help="Navegadores em paralelo com --fatiar (padrão: 4).")
+    crawl.add_argument('--warc', metavar='PASTA', default=None, help="Arquiva as páginas baixadas em WARC nesta pasta.")
+    crawl.add_argument('--saida', default=None,
+                       help="Arquivo de saída, CSV ou .parquet com os tipos preservados (padrão: noticias_otempo_<termo>_separado.csv).")
+    crawl.set_defaults(funcao=comando_crawl)
+
+    clean = subparsers.add_parser('clean', help="Limpa um CSV da raspagem e salva '<arquivo>_limpo.csv'.")
+    clean.add_argument('csv')
+    clean.set_defaults(funcao=comando_clean)
+
+    temporal = subparsers.add_parser('temporal', help="Limpeza e contagens por mês e por ano (trabalho_dados_dinamico_pandas).")
+    temporal.add_argument('csv')
+    temporal.set_defaults(funcao=comando_temporal)
+
+    ngrams = subparsers.add_parser('ngrams', help="Palavras, bigrams, trigrams e tags mais frequentes (50_palavras21).")
+    ngrams.add_argument('csv')
+    ngrams.add_argument('--graficos', choices=('nenhum', 'salvar', 'exibir'), default='nenhum',
+                        help="Nuvens de palavras e gráfico de tags: não gerar, salvar em PNG ou exibir em janelas (padrão: nenhum).")
+    ngrams.set_defaults(funcao=comando_ngrams)
+
+    return parser
+
+
+def main(argv=None):
+    parser = criar_parser()
+    args = parser.parse_args(argv)
+    if args.comando == 'crawl' and args.fatiar and args.paginas is not None:
+        parser.error("--paginas não se aplica a --fatiar (as páginas são por fatia de datas); use --noticias.")
+    return args.funcao(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
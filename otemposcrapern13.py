@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import re
 from selenium import webdriver
@@ -8,8 +7,16 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import time
 import csv
-from urllib.parse import quote, urljoin
+import os
+import shutil
+import weakref
+from urllib.parse import quote
 from webdriver_manager.firefox import GeckoDriverManager
+from instrumentacao import Instrumentacao
+from arquivo_warc import GravadorWarc
+from navegador_enxuto import ProxyEnxuto, configurar_opcoes_enxutas, configurar_proxy, reservar_pasta_cache
+from extracao import URL_BASE, extrair_detalhes_noticia, extrair_item_busca, total_paginas_busca
+from noticia import CAMPOS_CSV, DETALHES_ERRO, LoteNoticias, Noticia
 
 """
 Documentação do Script: otemposcrapern.py
@@ -40,9 +47,22 @@ Recursos Principais:
     -   `link_imagem_principal`: URL da imagem principal da notícia.
     -   `tem_video`: Booleano (True/False) indicando a presença de vídeo na notícia.
     -   `tags_noticia`: Lista de tags associadas à notícia (separadas por vírgulas).
+-   **Registro Tipado:** Cada notícia é um objeto `Noticia` (ver `noticia.py`), com a data já interpretada,
+    as tags em lista e o status da coleta explícito; o CSV gravado continua no mesmo formato.
 -   **Salvamento em CSV:** Todos os dados raspados são automaticamente exportados
     para um arquivo CSV com um nome baseado no termo de busca (ex: `noticias_otempo_meu_termo_separado.csv`),
     pronto para análise.
+-   **Métricas de Desempenho:** Mede o tempo de cada etapa (páginas de busca, esperas, pausas,
+    acesso às notícias, leitura do HTML e gravação do CSV), conta falhas e notícias por minuto,
+    exibe uma tabela-resumo ao final e salva as métricas em JSON e no formato do Prometheus
+    (`..._metricas.json` e `..._metricas.prom`). Ver `instrumentacao.py`.
+-   **Arquivamento em WARC (Opcional):** Guarda o HTML de todas as páginas baixadas em arquivos
+    `.warc.gz` na pasta `warc`. Se o layout do site mudar, basta corrigir os extratores e reextrair
+    o CSV com `arquivo_warc.py`, sem raspar o site novamente.
+-   **Busca por Fatias de Datas (Opcional):** Para termos amplos, que ultrapassam o limite de paginação
+    da busca do site, `planejador_busca.py` divide a busca em períodos menores e os percorre em paralelo.
+-   **Modo Enxuto (Opcional):** Firefox sem imagens, fontes e mídia, com carregamento `eager`, passando
+    por um proxy local que bloqueia domínios de terceiros (anúncios, analytics, players). Ver `navegador_enxuto.py`.
 -   **Feedback Visual:** Exibe mensagens de progresso no terminal e, opcionalmente,
     mostra o navegador Firefox em ação.
 
@@ -74,6 +94,7 @@ Mozilla Firefox instalado.
 3.  **Navegador Mozilla Firefox:**
     * Certifique-se de que o Firefox está instalado em seu sistema: [mozilla.org/firefox](https://www.mozilla.org/pt-BR/firefox/new/).
     * O `webdriver-manager` (instalado acima) irá baixar e gerenciar o `GeckoDriver` (o driver do Firefox) automaticamente, então você não precisa baixá-lo manualmente.
+      Se já houver um `geckodriver` no PATH, ou o caminho dele estiver na variável de ambiente `GECKODRIVER`, ele é usado sem acessar a rede.
 
 Como Usar o Programa:
 ---------------------
@@ -83,9 +104,9 @@ Como Usar o Programa:
     * Salve este arquivo como **`otemposcrapern.py`** dentro da sua pasta do projeto.
 3.  **Modo de Visualização (Opcional):**
     * Por padrão, o navegador Firefox abrirá visivelmente. Se você preferir que ele rode em segundo plano (sem interface gráfica, o que é mais rápido para grandes volumes de dados), edite o arquivo `otemposcrapern.py` no VS Code.
-    * **Descomente** (remova o `#`) da linha:
+    * Na chamada `raspar_noticias_otempo(...)` ao final do arquivo, passe `headless=True`:
         ```python
-        # options.add_argument('--headless')
+        raspar_noticias_otempo(termo_digitado, metricas=metricas, headless=True)
         ```
     * Salve o arquivo.
 4.  **Inicie o Programa:**
@@ -115,26 +136,158 @@ Como Usar o Programa:
 
 Observações Importantes:
 ------------------------
--   **Dependência do Layout do Site:** Este script é altamente dependente da estrutura HTML (classes CSS e IDs) do site `otempo.com.br`. Se o site mudar seu layout (o que pode acontecer frequentemente), as classes usadas no script precisarão ser atualizadas. Mensagens de erro no terminal (como `NoSuchElementException` ou `TimeoutException`) ajudarão a identificar esses problemas.
+-   **Dependência do Layout do Site:** Este script é altamente dependente da estrutura HTML (classes CSS e IDs) do site `otempo.com.br`. Se o site mudar seu layout (o que pode acontecer frequentemente), as classes usadas no script (nos extratores de `extracao.py`) precisarão ser atualizadas. Mensagens de erro no terminal (como `NoSuchElementException` ou `TimeoutException`) ajudarão a identificar esses problemas.
 -   **Velocidade da Raspagem:** A velocidade de raspagem é controlada por pequenas pausas (`time.sleep`) para evitar sobrecarregar o site e reduzir o risco de bloqueio. Para grandes volumes de dados (muitas páginas/notícias), a execução pode levar várias horas.
 -   **Tratamento de Erros:** O script inclui blocos `try-except` para lidar com erros comuns (como elementos não encontrados ou problemas de rede), imprimindo mensagens no terminal e, em caso de erros na paginação ou gerais, mantendo o navegador aberto por 5 minutos para depuração manual.
 
 """
 
 
-def raspar_noticias_otempo(termo_busca):
+# Parâmetros da URL de busca que restringem os resultados a um período (datas no formato AAAA-MM-DD).
+# Usados pelo planejador de busca (planejador_busca.py) para dividir buscas amplas em fatias de datas.
+PARAMETRO_DATA_INICIO = 'data_inicio'
+PARAMETRO_DATA_FIM = 'data_fim'
+
+# Variável de ambiente com o caminho de um geckodriver já instalado (dispensa o download pelo webdriver_manager).
+VARIAVEL_GECKODRIVER = 'GECKODRIVER'
+
+
+def caminho_geckodriver():
+    """
+    Caminho do geckodriver: o da variável de ambiente GECKODRIVER, o do PATH ou, sem nenhum dos
+    dois, o baixado (e guardado em cache) pelo webdriver_manager, que precisa de acesso à rede.
+    """
+    return os.environ.get(VARIAVEL_GECKODRIVER) or shutil.which('geckodriver') or GeckoDriverManager().install()
+
+
+def criar_driver(headless=False, enxuto=False, porta_proxy=None):
+    """
+    Cria o Firefox controlado pelo Selenium. Com `enxuto=True`, aplica o perfil enxuto de
+    navegador_enxuto.py (sem imagens/mídia, carregamento 'eager'); `porta_proxy` faz o tráfego
+    passar pelo proxy local nessa porta.
+    """
+    firefox_driver_path = caminho_geckodriver()
+    service = Service(executable_path=firefox_driver_path)
+    options = webdriver.FirefoxOptions()
+    # Mantenha headless=False para ver o navegador em ação!
+    if headless:
+        options.add_argument('--headless')
+    options.add_argument('--disable-gpu')
+    if enxuto:
+        pasta_cache, trava_cache = reservar_pasta_cache()
+        configurar_opcoes_enxutas(options, porta_proxy, pasta_cache)
+    elif porta_proxy:
+        configurar_proxy(options, porta_proxy)
+
+    driver = webdriver.Firefox(service=service, options=options)
+    if enxuto:
+        # A subpasta de cache fica reservada enquanto este Firefox existir (ver reservar_pasta_cache).
+        weakref.finalize(driver, trava_cache.close)
+    return driver
+
+
+def montar_url_busca(termo_busca, pagina=1, url_base=URL_BASE, intervalo=None):
+    """
+    URL da página `pagina` (base 1) da busca por `termo_busca`. `intervalo` é um par de datas
+    (inicio, fim), inclusivo, que restringe a busca às notícias publicadas nesse período.
+    """
+    url = f"{url_base}/busca?q={quote(termo_busca)}"
+    if intervalo is not None:
+        inicio, fim = intervalo
+        url += f"&{PARAMETRO_DATA_INICIO}={inicio.isoformat()}&{PARAMETRO_DATA_FIM}={fim.isoformat()}"
+    if pagina > 1: # Para páginas subsequentes, use o parâmetro 'page'
+        url += f"&page={pagina}"
+    return url
+
+
+def esperar_pagina_busca(driver, pagina_algolia_index, metricas):
+    """Espera os resultados da página de busca carregada no `driver`; levanta exceção se não aparecerem."""
+    # 1. Espera que o contêiner principal de hits seja visível
+    with metricas.etapa('espera_hits'):
+        WebDriverWait(driver, 45).until(
+            EC.visibility_of_element_located((By.ID, 'hits'))
+        )
+
+    # 2. Espera que pelo menos UM elemento de notícia esteja visível.
+    with metricas.etapa('espera_item'):
+        WebDriverWait(driver, 15).until( 
+            EC.visibility_of_element_located((By.CLASS_NAME, 'ais-Hits-item'))
+        )
+
+    # 3. Espera que o link da página ATUAL no paginador se torne 'active'.
+    paginator_data_page_index = pagina_algolia_index - 1 # Algolia index é 0-based
+    with metricas.etapa('espera_paginador'):
+        WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, f"a.pagination__link.active[data-page='{paginator_data_page_index}']"))
+        )
+
+    metricas.pausa(2) # Pausa final para garantir a estabilidade do DOM após todas as esperas
+
+
+def arquivar_pagina(driver, url, tipo_pagina, gravador_warc, metricas):
+    """
+    Grava o HTML atual do `driver` no WARC (se houver gravador). Também é chamada quando a espera
+    falha: se o layout do site mudou, é justamente essa página que a reextração precisa.
+    """
+    if gravador_warc is None:
+        return
+    try:
+        with metricas.etapa('gravar_warc'):
+            gravador_warc.gravar(url, driver.page_source, tipo_pagina)
+    except Exception as e:
+        print(f"    Erro ao arquivar a página {url}: {e}")
+
+
+def raspar_detalhes_noticia(driver, link_noticia, metricas, url_base=URL_BASE, gravador_warc=None):
+    """Abre a página de uma notícia no `driver` e extrai os detalhes; em caso de erro, retorna DETALHES_ERRO."""
+    try:
+        with metricas.etapa('carregar_noticia'):
+            driver.get(link_noticia)
+        try:
+            with metricas.etapa('espera_noticia'):
+                WebDriverWait(driver, 20).until(
+                    EC.presence_of_element_located((By.CLASS_NAME, 'cp023-assinatura-do-artigo')) 
+                )
+        finally:
+            # Arquiva mesmo se a espera falhar (ex: a classe mudou), para permitir a reextração.
+            arquivar_pagina(driver, link_noticia, 'noticia', gravador_warc, metricas)
+
+        noticia_page_source = driver.page_source
+        with metricas.etapa('parse_noticia'):
+            noticia_soup = BeautifulSoup(noticia_page_source, 'html.parser')
+        with metricas.etapa('extrair_noticia'):
+            return extrair_detalhes_noticia(noticia_soup, url_base)
+
+    except Exception as e_noticia:
+        metricas.contar('falhas_noticia')
+        print(f"    Erro ao acessar ou raspar detalhes da notícia {link_noticia}: {e_noticia}")
+        return dict(DETALHES_ERRO)
+
+
+def raspar_noticias_otempo(termo_busca, metricas=None, url_base=URL_BASE, headless=False,
+                           interativo=True, limite_paginas=None, limite_noticias=None, gravador_warc=None,
+                           enxuto=False):
     """
     Raspa informações do site O Tempo para um termo de busca específico,
     com opções de quantidade de raspagem (todas, por número de páginas ou por número de notícias).
     Extrai título, subtítulo, data de publicação (separada), link, texto completo, link da imagem,
     detecção de vídeo, nome do repórter e as tags da notícia.
     Implementa uma lógica de paginação robusta e otimizada por URL, iterando pelas páginas com índice base 1.
+    Retorna um `LoteNoticias` (ver noticia.py), com datas, tags e erros de coleta já interpretados.
+    Se `metricas` (uma `Instrumentacao`) for informada, o tempo de cada etapa é registrado nela.
+    Com `interativo=False` nenhuma pergunta é feita: usa-se `limite_paginas`/`limite_noticias`
+    (ou todas as páginas, se nenhum for informado). `url_base` permite apontar a raspagem
+    para outro servidor (ex: o servidor local de fixtures usado nos benchmarks).
+    Se `gravador_warc` (um `GravadorWarc`) for informado, o HTML de cada página de busca e de
+    notícia é arquivado (também quando a espera pelos elementos falha, como numa mudança de layout),
+    permitindo reextrair os dados depois sem raspar o site de novo.
+    Com `enxuto=True`, o Firefox usa o perfil enxuto e o proxy local que bloqueia domínios de
+    terceiros (ver navegador_enxuto.py); os bytes transferidos entram nas métricas.
     """
-    url_base = "https://www.otempo.com.br"
-    termo_busca_codificado = quote(termo_busca)
-    query_string = f"q={termo_busca_codificado}"
-    
-    lista_noticias = [] 
+    if metricas is None:
+        metricas = Instrumentacao()
+
+    lista_noticias = LoteNoticias() 
     
     # === AGORA AQUI: pagina_algolia_index e pagina_log_display JÁ ESTÃO NO ESCOPO CORRETO ===
     # Eles serão inicializados aqui e incrementados no final do loop.
@@ -145,73 +298,55 @@ def raspar_noticias_otempo(termo_busca):
     # Variáveis para controle de quantidade
     total_paginas_encontradas = 0
     total_noticias_estimadas = 0
-    limite_paginas_usuario = None
-    limite_noticias_usuario = None
+    limite_paginas_usuario = limite_paginas
+    limite_noticias_usuario = limite_noticias
     driver = None
+    proxy = None
 
     try:
-        firefox_driver_path = GeckoDriverManager().install()
-        service = Service(executable_path=firefox_driver_path)
-        options = webdriver.FirefoxOptions()
-        # Mantenha esta linha COMENTADA para ver o navegador em ação!
-        # options.add_argument('--headless')
-        options.add_argument('--disable-gpu')
-
-        driver = webdriver.Firefox(service=service, options=options)
+        if enxuto:
+            proxy = ProxyEnxuto().iniciar()
+        driver = criar_driver(headless=headless, enxuto=enxuto, porta_proxy=proxy.porta if proxy else None)
         
         while True: # Loop para navegar por todas as páginas de busca
             # Inicializa a variável para cada nova página
             noticias_processadas_nesta_pagina = 0 
 
             # Constrói o URL da página atual da busca
-            if pagina_algolia_index == 1: # Para a primeira página
-                current_search_url = f"{url_base}/busca?{query_string}"
-            else: # Para páginas subsequentes, use o parâmetro 'page'
-                current_search_url = f"{url_base}/busca?{query_string}&page={pagina_algolia_index}"
+            current_search_url = montar_url_busca(termo_busca, pagina_algolia_index, url_base)
 
             print(f"\n--- Acessando página de busca {pagina_log_display} para '{termo_busca}': {current_search_url} ---")
-            driver.get(current_search_url) 
+            inicio_pagina = time.perf_counter()
+            with metricas.etapa('carregar_busca'):
+                driver.get(current_search_url) 
 
             # === ESPERAS ROBUSTAS PARA GARANTIR O CARREGAMENTO DA PÁGINA DE BUSCA ATUAL ===
             try:
-                # 1. Espera que o contêiner principal de hits seja visível
-                WebDriverWait(driver, 45).until(
-                    EC.visibility_of_element_located((By.ID, 'hits'))
-                )
-                
-                # 2. Espera que pelo menos UM elemento de notícia esteja visível.
-                WebDriverWait(driver, 15).until( 
-                    EC.visibility_of_element_located((By.CLASS_NAME, 'ais-Hits-item'))
-                )
-                
-                # 3. Espera que o link da página ATUAL no paginador se torne 'active'.
-                paginator_data_page_index = pagina_algolia_index - 1 # Algolia index é 0-based
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, f"a.pagination__link.active[data-page='{paginator_data_page_index}']"))
-                )
-                
-                time.sleep(2) # Pausa final para garantir a estabilidade do DOM após todas as esperas
+                esperar_pagina_busca(driver, pagina_algolia_index, metricas)
                 print("Elementos de notícia detectados e visíveis na página de busca.")
             except Exception as e:
+                metricas.contar('falhas_pagina_busca')
+                arquivar_pagina(driver, current_search_url, 'busca', gravador_warc, metricas)
                 print(f"Erro ao carregar elementos da página de busca {pagina_log_display} para '{termo_busca}'. O site pode ter mudado ou não há mais resultados visíveis.")
                 print(f"Detalhes do erro na espera: {e}")
                 print("\n**ATENÇÃO:** Página de busca não carregou como esperado. Navegador permanecerá aberto para INSPEÇÃO MANUAL.")
                 print("Por favor, verifique se há pop-ups, se a página carregou corretamente ou se as classes HTML mudaram.")
-                time.sleep(300) 
+                if interativo:
+                    with metricas.fora_do_relogio():
+                        time.sleep(300) 
                 break 
 
             # === OBTER INFORMAÇÕES TOTAIS E PERGUNTAR AO USUÁRIO (SOMENTE NA PRIMEIRA PÁGINA) ===
             # Este bloco só executa para pagina_algolia_index == 1 (primeira página real do site)
-            if pagina_algolia_index == 1:
+            if pagina_algolia_index == 1 and interativo:
+                inicio_perguntas = time.perf_counter()
                 page_source_initial = driver.page_source
                 soup_initial = BeautifulSoup(page_source_initial, 'html.parser')
                 
                 pagination_info_div = soup_initial.find('div', class_='pagination__info')
                 if pagination_info_div:
-                    info_text = pagination_info_div.get_text(strip=True)
-                    match = re.search(r'Página \d+ de (\d+)', info_text)
-                    if match:
-                        total_paginas_encontradas = int(match.group(1))
+                    total_paginas_encontradas = total_paginas_busca(soup_initial)
+                    if total_paginas_encontradas is not None:
                         total_noticias_estimadas = total_paginas_encontradas * 8 # Assumimos 8 notícias por página
                         
                         print(f"\nForam encontradas aproximadamente {total_noticias_estimadas} notícias em {total_paginas_encontradas} páginas com este termo.")
@@ -253,13 +388,20 @@ def raspar_noticias_otempo(termo_busca):
                     print("Informação de paginação não encontrada. Prosseguindo com todas as páginas.")
                 
                 print("\nObrigado! Vamos iniciar a coleta.")
-                time.sleep(2) 
+                # O tempo esperando as respostas não entra na duração da página nem na taxa de notícias.
+                espera_usuario = time.perf_counter() - inicio_perguntas
+                metricas.descontar(espera_usuario)
+                inicio_pagina += espera_usuario
+                metricas.pausa(2) 
             # === FIM DA SEÇÃO DE OBTENÇÃO DE INFORMAÇÕES TOTAIS ===
 
             page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
+            arquivar_pagina(driver, current_search_url, 'busca', gravador_warc, metricas)
 
-            noticias_elements = soup.find_all('li', class_='ais-Hits-item')
+            with metricas.etapa('parse_busca'):
+                soup = BeautifulSoup(page_source, 'html.parser')
+
+                noticias_elements = soup.find_all('li', class_='ais-Hits-item')
 
             if not noticias_elements:
                 print(f"Nenhuma notícia encontrada na página de busca {pagina_log_display} para '{termo_busca}' com as classes atuais. Finalizando raspagem.")
@@ -270,136 +412,34 @@ def raspar_noticias_otempo(termo_busca):
                     print(f"Limite total de {limite_noticias_usuario} notícias atingido. Finalizando raspagem.")
                     break 
                 
-                titulo = None
-                subtitulo = None
-                data_publicacao_completa = None 
-                data_pura = None 
-                horario = None 
-                link_noticia = None
-                texto_completo = None 
-                link_imagem_principal = None 
-                tem_video = False 
-                nome_reporter = None 
-                tags_noticia_str = None 
-
-                link_tag = noticia_element.find('a', class_='search-results')
-                if link_tag:
-                    link_noticia_rel = link_tag['href']
-                    link_noticia = urljoin(url_base, link_noticia_rel) 
-
-                    titulo_tag = link_tag.find('h2', class_='search-results__texto--title')
-                    if titulo_tag:
-                        titulo = titulo_tag.get_text(separator=' ', strip=True)
-
-                    subtitulo_tag = link_tag.find('h3', class_='search-results__texto--subtitle')
-                    if subtitulo_tag:
-                        subtitulo = subtitulo_tag.get_text(separator=' ', strip=True)
+                titulo, subtitulo, link_noticia = extrair_item_busca(noticia_element, url_base)
 
                 if titulo and link_noticia:
                     print(f"  Acessando notícia {i+1} da página {pagina_log_display} para detalhes: {link_noticia}")
-                    time.sleep(1.5) 
-                    try:
-                        driver.get(link_noticia)
-                        WebDriverWait(driver, 20).until(
-                            EC.presence_of_element_located((By.CLASS_NAME, 'cp023-assinatura-do-artigo')) 
-                        )
-                        
-                        noticia_soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-                        author_info_div = noticia_soup.find('div', class_='cmp__author-info')
-                        if author_info_div:
-                            author_name_span = author_info_div.find('span', class_='cmp__author-name')
-                            if author_name_span:
-                                inner_name_span = author_name_span.find('span') 
-                                if inner_name_span:
-                                    nome_reporter = inner_name_span.get_text(strip=True)
-                                else:
-                                    author_link = author_name_span.find('a')
-                                    if author_link:
-                                        nome_reporter = author_link.get_text(strip=True)
-                                    else:
-                                        nome_reporter = author_name_span.get_text(strip=True)
-
-                                nome_reporter = re.sub(r'^(Por|Redação)\s*', '', nome_reporter, flags=re.IGNORECASE).strip()
-                                nome_reporter = ' '.join(nome_reporter.split())
-                                
-                        publication_span = noticia_soup.find('span', class_='cmp__author-publication')
-                        if publication_span:
-                            date_value_span = publication_span.find('span')
-                            if date_value_span:
-                                data_publicacao_completa = date_value_span.get_text(strip=True)
-                                data_publicacao_completa = data_publicacao_completa.split(' - ')[0].strip()
-                                
-                                if '|' in data_publicacao_completa:
-                                    partes = data_publicacao_completa.split('|')
-                                    data_pura = partes[0].strip()
-                                    horario = partes[1].strip()
-                                else: 
-                                    data_pura = data_publicacao_completa
-                                    horario = "N/A" 
-                        
-                        texto_principal_div = noticia_soup.find('div', class_='read-controller materia__tts article-whole article-body') 
-                        if texto_principal_div:
-                            paragrafos = texto_principal_div.find_all('p')
-                            texto_completo = '\n'.join([p.get_text(strip=True) for p in paragrafos if p.get_text(strip=True)])
-                            
-                        gallery_container = noticia_soup.find('div', class_='gallery__container gallery_highlight')
-                        if gallery_container:
-                            img_tag_principal = gallery_container.find('img', class_='gallery__image')
-                            if img_tag_principal and 'src' in img_tag_principal.attrs:
-                                link_imagem_principal = img_tag_principal['src']
-                                if not link_imagem_principal.startswith('http'):
-                                    link_imagem_principal = urljoin(url_base, link_imagem_principal)
-
-                        video_iframe = noticia_soup.find('iframe', class_='c-video__frame') 
-                        video_tag = noticia_soup.find('video')
-                        
-                        iframes_no_corpo = noticia_soup.find('div', class_='c-news-body')
-                        if iframes_no_corpo:
-                            for iframe in iframes_no_corpo.find_all('iframe'):
-                                src = iframe.get('src', '')
-                                if 'https://www.youtube.com/embed/G8jXv_yjVVI?si=A-jPxoZqLkP8I1Ry' in src or 'vimeo.com' in src or 'cdn.jornalotempo.com.br/videos' in src:
-                                    tem_video = True
-                                    break
-                        if video_iframe or video_tag: 
-                            tem_video = True
-                        
-                        tags_div_container = noticia_soup.find('div', class_='tags')
-                        tags_list = [] 
-                        if tags_div_container:
-                            ul_tagbox = tags_div_container.find('ul', class_='cmp__tagbox')
-                            if ul_tagbox:
-                                tags_a_elements = ul_tagbox.find_all('a', class_='label__tag')
-                                for tag_a in tags_a_elements:
-                                    tags_list.append(tag_a.get_text(strip=True))
-                        tags_noticia_str = ", ".join(tags_list) if tags_list else "N/A"
-
-                    except Exception as e_noticia:
-                        print(f"    Erro ao acessar ou raspar detalhes da notícia {link_noticia}: {e_noticia}")
-                        data_publicacao_completa = "Erro ao coletar data" 
-                        data_pura = "Erro ao coletar data" 
-                        horario = "Erro" 
-                        texto_completo = "Erro ao coletar texto"
-                        link_imagem_principal = "Erro ao coletar imagem"
-                        tem_video = False 
-                        nome_reporter = "Erro ao coletar repórter" 
-                        tags_noticia_str = "Erro ao coletar tags" 
-
-                    lista_noticias.append({
+                    inicio_noticia = time.perf_counter()
+                    metricas.pausa(1.5) 
+                    detalhes = raspar_detalhes_noticia(driver, link_noticia, metricas, url_base, gravador_warc)
+
+                    lista_noticias.acrescentar(Noticia.de_dict({
                         'titulo': titulo,
                         'subtitulo': subtitulo,
-                        'data_pura': data_pura, 
-                        'horario': horario, 
+                        'data_pura': detalhes['data_pura'], 
+                        'horario': detalhes['horario'], 
                         'link_noticia': link_noticia,
-                        'texto_completo': texto_completo, 
-                        'link_imagem_principal': link_imagem_principal, 
-                        'tem_video': tem_video,
-                        'nome_reporter': nome_reporter,
-                        'tags_noticia': tags_noticia_str 
-                    })
-                    time.sleep(0.5) 
+                        'texto_completo': detalhes['texto_completo'], 
+                        'link_imagem_principal': detalhes['link_imagem_principal'], 
+                        'tem_video': detalhes['tem_video'],
+                        'nome_reporter': detalhes['nome_reporter'],
+                        'tags_noticia': detalhes['tags_noticia'] 
+                    }))
+                    metricas.contar('noticias_coletadas')
+                    metricas.pausa(0.5) 
+                    metricas.observar('noticia_total', time.perf_counter() - inicio_noticia)
                     noticias_processadas_nesta_pagina += 1
 
+            metricas.contar('paginas_busca')
+            metricas.observar('pagina_busca_total', time.perf_counter() - inicio_pagina)
+
             if limite_noticias_usuario is not None and len(lista_noticias) >= limite_noticias_usuario:
                 break 
 
@@ -421,14 +461,65 @@ def raspar_noticias_otempo(termo_busca):
             
     except Exception as e:
         print(f"Ocorreu um erro geral no Selenium ou na raspagem: {e}")
-        print("\n**ATENÇÃO:** Erro geral. Navegador permanecerá aberto para inspeção.")
-        time.sleep(300) 
+        if interativo:
+            print("\n**ATENÇÃO:** Erro geral. Navegador permanecerá aberto para inspeção.")
+            with metricas.fora_do_relogio():
+                time.sleep(300) 
     finally:
         if driver:
             driver.quit()
+        if gravador_warc is not None:
+            gravador_warc.fechar()
+        if proxy is not None:
+            proxy.parar()
+            for nome, valor in proxy.resumo().items():
+                metricas.contar(f'proxy_{nome}', valor)
 
     return lista_noticias 
 
+def normalizar_termo(termo_busca):
+    """Converte o termo de busca em um trecho seguro para nomes de arquivo (ex: 'Pão de queijo' -> 'pão_de_queijo')."""
+    return re.sub(r'[^\w\s-]', '', termo_busca).replace(' ', '_').lower()
+
+
+def nome_arquivo_csv(termo_busca):
+    return f'noticias_otempo_{normalizar_termo(termo_busca)}_separado.csv'
+
+
+def salvar_noticias_csv(noticias_raspadas, csv_file_path, metricas=None):
+    """
+    Grava as notícias raspadas (objetos `Noticia`, ou um `LoteNoticias`) em CSV, com as colunas de CAMPOS_CSV.
+    Retorna True se o arquivo foi gravado e False em caso de erro (já exibido no terminal).
+    """
+    if metricas is None:
+        metricas = Instrumentacao()
+    try:
+        fieldnames = CAMPOS_CSV
+
+        with metricas.etapa('gravar_csv'):
+            with open(csv_file_path, mode='w', newline='', encoding='utf-8') as csv_file:
+                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
+                writer.writeheader()
+                writer.writerows(noticia.como_linha_csv() for noticia in noticias_raspadas) 
+        print(f"\nDados salvos com sucesso em '{csv_file_path}'")
+        return True
+    except Exception as e:
+        print(f"\nErro ao salvar os dados no arquivo CSV: {e}")
+        return False
+
+
+def salvar_metricas(metricas, csv_file_path):
+    """Exibe o resumo das métricas e as salva em '<arquivo>_metricas.json' e '<arquivo>_metricas.prom'."""
+    metricas.imprimir_resumo()
+    metricas_base_path = csv_file_path.rsplit('.', 1)[0]
+    try:
+        metricas.exportar_json(f'{metricas_base_path}_metricas.json')
+        metricas.exportar_prometheus(f'{metricas_base_path}_metricas.prom')
+        print(f"Métricas salvas em '{metricas_base_path}_metricas.json' e '{metricas_base_path}_metricas.prom'")
+    except Exception as e:
+        print(f"\nErro ao salvar as métricas: {e}")
+
+
 # Exemplo de uso:
 if __name__ == "__main__":
     print("**********************************************************************************************************************")
@@ -445,30 +536,32 @@ if __name__ == "__main__":
     
     print("\nVamos começar os trabalhos!") 
     termo_digitado = input("Digite o termo de busca para pesquisa (ex: Pão de queijo, Galo, Clube da Esquina, eleições, economia, política, música, poesia): ")
+    termo_para_arquivo = normalizar_termo(termo_digitado)
+
+    gravador_warc = None
+    arquivar = input("Deseja arquivar as páginas baixadas em WARC para reextração futura? (S/N): ").upper().strip()
+    if arquivar == 'S':
+        gravador_warc = GravadorWarc('warc', prefixo=f'otempo_{termo_para_arquivo}')
+        print("As páginas serão arquivadas na pasta 'warc'.")
     print("Faremos a pesquisa no portal e retornaremos o resultado. ")
     
-    noticias_raspadas = raspar_noticias_otempo(termo_digitado) 
+    metricas = Instrumentacao()
+    noticias_raspadas = raspar_noticias_otempo(termo_digitado, metricas=metricas, gravador_warc=gravador_warc) 
 
     if noticias_raspadas: 
         print(f"\n--- {len(noticias_raspadas)} Notícias encontradas no total para '{termo_digitado}' ---")
         
-        termo_para_arquivo = re.sub(r'[^\w\s-]', '', termo_digitado).replace(' ', '_').lower()
-        csv_file_path = f'noticias_otempo_{termo_para_arquivo}_separado.csv' 
+        csv_file_path = nome_arquivo_csv(termo_digitado) 
 
-        try:
-            fieldnames = ['titulo', 'subtitulo', 'data_pura', 'horario', 'link_noticia', 
-                          'texto_completo', 'link_imagem_principal', 'tem_video', 'nome_reporter', 'tags_noticia']
+        salvar_noticias_csv(noticias_raspadas, csv_file_path, metricas)
 
-            with open(csv_file_path, mode='w', newline='', encoding='utf-8') as csv_file:
-                writer = csv.DictWriter(csv_file, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(noticias_raspadas) 
-            print(f"\nDados salvos com sucesso em '{csv_file_path}'")
-        except Exception as e:
-            print(f"\nErro ao salvar os dados no arquivo CSV: {e}")
+        # === MÉTRICAS DE DESEMPENHO DA RASPAGEM ===
+        salvar_metricas(metricas, csv_file_path)
 
         print("\nCaptura de dados concluída. ") 
         print(f"As informações estão salvas em um arquivo CSV: '{csv_file_path}'.")
+        if gravador_warc is not None and gravador_warc.registros:
+            print(f"{gravador_warc.registros} páginas arquivadas em 'warc'. Para reextrair: python arquivo_warc.py novo.csv warc/otempo_{termo_para_arquivo}-*.warc.gz")
         print("Agora você pode utilizar os dados em sua pesquisa!")
         print("Bons estudos!")
     else:
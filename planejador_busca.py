@@ -0,0 +1,335 @@
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+
+from bs4 import BeautifulSoup
+
+from extracao import URL_BASE, extrair_item_busca, total_paginas_busca
+from instrumentacao import Instrumentacao
+from navegador_enxuto import ProxyEnxuto
+from noticia import LoteNoticias, Noticia
+from otemposcrapern13 import (PARAMETRO_DATA_FIM, PARAMETRO_DATA_INICIO, arquivar_pagina, criar_driver,
+                              esperar_pagina_busca, montar_url_busca, raspar_detalhes_noticia)
+
+"""
+Documentação do Script: planejador_busca.py
+
+Propósito:
+----------
+Planejador de busca por fatias de datas, para termos amplos que geram centenas de páginas de resultados.
+
+`raspar_noticias_otempo` percorre as páginas da busca uma a uma, pelo parâmetro `page`. Mecanismos de
+busca como o Algolia, usado pelo site, limitam a profundidade da paginação (por padrão, 1.000 resultados,
+ou 125 páginas de 8 notícias): além desse ponto, a cauda de uma busca ampla fica inacessível. O planejador:
+
+1.  **Sonda** a busca no período inteiro (DATA_INICIAL_PADRAO até hoje) e lê o total de páginas
+    informado no paginador ("Página 1 de N").
+2.  **Divide** ao meio, recursivamente, toda fatia de datas que atinge o limite de paginação
+    (`limite_paginas`), até que cada fatia caiba inteira abaixo do limite. Uma fatia de um único dia
+    que ainda atinge o limite não pode ser dividida e é percorrida até onde o site permitir (com aviso).
+3.  **Percorre em paralelo** as páginas de todas as fatias: cada thread tem o seu próprio Firefox, e
+    sondagens e páginas entram na mesma fila, de modo que o tempo de busca cai com o número de `workers`.
+4.  **Junta** os resultados das fatias, da mais recente para a mais antiga, sem repetir links.
+
+Os mesmos `workers` navegadores são usados na busca e no acesso às notícias (um único pool de
+threads). Uma página de busca que não carrega é tentada de novo até TENTATIVAS_PAGINA vezes; se
+ainda falhar, ela é registrada em `falhas` (e no contador `paginas_busca_perdidas`) e o resultado
+é informado como incompleto. Se as duas metades de uma fatia dividida informam o mesmo total e
+os mesmos primeiros resultados da fatia inteira, o site ignorou o filtro de datas: o planejador
+para com `FiltroDatasIgnorado`, em vez de dividir até fatias de um dia (milhares de sondagens).
+
+A busca por período usa os parâmetros PARAMETRO_DATA_INICIO/PARAMETRO_DATA_FIM de `otemposcrapern13.py`
+(ver `montar_url_busca`); o servidor de fixtures (`servidor_fixtures.py`) aceita os mesmos parâmetros e
+imita o limite de paginação, permitindo testar o planejador offline.
+
+Uso:
+----
+    python planejador_busca.py "eleições" --workers 4 --saida noticias_eleicoes.csv
+    python otempo.py crawl "eleições" --fatiar --workers 4 --headless
+"""
+
+LIMITE_PAGINAS_PADRAO = 125  # paginationLimitedTo padrão do Algolia (1.000 resultados) / 8 notícias por página
+
+DATA_INICIAL_PADRAO = date(1996, 1, 1)  # Fundação do jornal O Tempo.
+
+TENTATIVAS_PAGINA = 3  # Tentativas de carregar cada página de busca antes de registrá-la como falha.
+
+
+class FiltroDatasIgnorado(Exception):
+    """O site devolveu os mesmos resultados para as duas metades de uma fatia: o filtro de datas não teve efeito."""
+
+
+def _busca_sem_resultados(html):
+    """True se a página de busca carregou (contêiner #hits presente), mas sem nenhum resultado."""
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.find(id='hits') is not None and soup.find('li', class_='ais-Hits-item') is None
+
+
+class PlanejadorBusca:
+    """Divide a busca por um termo em fatias de datas abaixo do limite de paginação e as percorre em paralelo."""
+
+    def __init__(self, termo_busca, url_base=URL_BASE, workers=4, limite_paginas=LIMITE_PAGINAS_PADRAO,
+                 data_inicial=DATA_INICIAL_PADRAO, data_final=None, headless=True, porta_proxy=None,
+                 metricas=None, gravador_warc=None):
+        self.termo_busca = termo_busca
+        self.url_base = url_base
+        self.workers = workers
+        self.limite_paginas = limite_paginas
+        self.data_inicial = data_inicial
+        self.data_final = data_final or date.today()
+        self.headless = headless
+        self.porta_proxy = porta_proxy
+        self.metricas = metricas if metricas is not None else Instrumentacao()
+        self.gravador_warc = gravador_warc  # Páginas de busca e de notícias arquivadas para `arquivo_warc.reextrair`.
+        self.fatias = []  # (intervalo, total de páginas) de cada fatia final do plano
+        self.falhas = []  # (intervalo, página) das páginas de busca que não carregaram
+        self.local = threading.local()
+        self.drivers = []
+        self.trava = threading.Lock()
+        # Um único pool para a busca e para as notícias: cada thread mantém o seu Firefox entre as fases.
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _driver(self):
+        """Firefox da thread atual, criado no primeiro uso."""
+        driver = getattr(self.local, 'driver', None)
+        if driver is None:
+            driver = criar_driver(headless=self.headless, enxuto=self.porta_proxy is not None, porta_proxy=self.porta_proxy)
+            self.local.driver = driver
+            with self.trava:
+                self.drivers.append(driver)
+        return driver
+
+    def _ler_pagina(self, intervalo, pagina):
+        """
+        Carrega uma página de busca da fatia; retorna (itens, total de páginas informado no paginador).
+        Uma fatia sem resultados retorna ([], 0); uma página que não carrega após TENTATIVAS_PAGINA
+        tentativas levanta a última exceção.
+        """
+        driver = self._driver()
+        url = montar_url_busca(self.termo_busca, pagina, self.url_base, intervalo)
+        inicio_pagina = time.perf_counter()
+        for tentativa in range(1, TENTATIVAS_PAGINA + 1):
+            with self.metricas.etapa('carregar_busca'):
+                driver.get(url)
+            try:
+                esperar_pagina_busca(driver, pagina, self.metricas)
+                break
+            except Exception:
+                if _busca_sem_resultados(driver.page_source):
+                    self.metricas.contar('paginas_busca_vazias')
+                    return [], 0
+                if tentativa == TENTATIVAS_PAGINA:
+                    arquivar_pagina(driver, url, 'busca', self.gravador_warc, self.metricas)
+                    raise
+                self.metricas.contar('novas_tentativas_busca')
+
+        arquivar_pagina(driver, url, 'busca', self.gravador_warc, self.metricas)
+        with self.metricas.etapa('parse_busca'):
+            soup = BeautifulSoup(driver.page_source, 'html.parser')
+            itens = [extrair_item_busca(item, self.url_base) for item in soup.find_all('li', class_='ais-Hits-item')]
+            total_paginas = total_paginas_busca(soup) or 1
+        self.metricas.contar('paginas_busca')
+        self.metricas.observar('pagina_busca_total', time.perf_counter() - inicio_pagina)
+        return itens, total_paginas
+
+    def _sondar(self, intervalo, fatia_mae=None):
+        itens, total_paginas = self._ler_pagina(intervalo, 1)
+        return 'sondagem', intervalo, 1, itens, total_paginas, fatia_mae
+
+    def _listar(self, intervalo, pagina):
+        itens, _ = self._ler_pagina(intervalo, pagina)
+        return 'pagina', intervalo, pagina, itens, None, None
+
+    def listar_resultados(self):
+        """
+        Executa o plano e retorna os itens da busca (titulo, subtitulo, link_noticia), das fatias
+        mais recentes para as mais antigas, sem links repetidos. Páginas que não carregaram ficam
+        em `falhas`; levanta `FiltroDatasIgnorado` se o site não filtrar a busca pelas datas.
+        """
+        paginas = {}  # (intervalo, pagina) -> itens
+        sondagens_divididas = {}  # intervalo dividido -> (itens da página 1, total de páginas)
+        metades = {}  # intervalo dividido -> sondagens das metades já concluídas (None se a sondagem falhou)
+        tarefas = {}  # futuro -> (intervalo, página, fatia mãe), para registrar as páginas que falharam
+        pendentes = set()
+
+        def enviar(intervalo, pagina, fatia_mae=None):
+            if pagina == 1:
+                futuro = self.executor.submit(self._sondar, intervalo, fatia_mae)
+            else:
+                futuro = self.executor.submit(self._listar, intervalo, pagina)
+            tarefas[futuro] = (intervalo, pagina, fatia_mae)
+            pendentes.add(futuro)
+
+        def tratar_sondagem(intervalo, itens, total_paginas):
+            inicio, fim = intervalo
+            if total_paginas >= self.limite_paginas and inicio < fim:
+                # A fatia atinge o limite de paginação: divide o período ao meio e sonda as metades.
+                meio = inicio + (fim - inicio) // 2
+                print(f"  Fatia {inicio} a {fim}: {total_paginas}+ páginas, acima do limite. Dividindo.")
+                self.metricas.contar('fatias_divididas')
+                sondagens_divididas[intervalo] = (itens, total_paginas)
+                enviar((inicio, meio), 1, intervalo)
+                enviar((meio + timedelta(days=1), fim), 1, intervalo)
+                return
+
+            paginas[(intervalo, 1)] = itens
+            if total_paginas >= self.limite_paginas:
+                print(f"  Aviso: o dia {inicio} sozinho atinge o limite de {self.limite_paginas} páginas; "
+                      "resultados além do limite não podem ser alcançados.")
+                self.metricas.contar('fatias_truncadas')
+            if itens:
+                print(f"  Fatia {inicio} a {fim}: {total_paginas} página(s).")
+                self.fatias.append((intervalo, total_paginas))
+                self.metricas.contar('fatias')
+            for proxima in range(2, total_paginas + 1):
+                enviar(intervalo, proxima)
+
+        def filtro_ignorado(fatia_mae, sondagens):
+            """Metades disjuntas com o total e os primeiros links da fatia inteira: o filtro de datas não teve efeito."""
+            itens_mae, total_mae = sondagens_divididas[fatia_mae]
+            links_mae = [link for _, _, link in itens_mae]
+            return bool(links_mae) and None not in sondagens and all(
+                total == total_mae and [link for _, _, link in itens] == links_mae for _, itens, total in sondagens)
+
+        enviar((self.data_inicial, self.data_final), 1)
+        while pendentes:
+            concluidas, _ = wait(pendentes, return_when=FIRST_COMPLETED)
+            pendentes.difference_update(concluidas)
+            for futuro in concluidas:
+                intervalo, pagina, fatia_mae = tarefas.pop(futuro)
+                try:
+                    tipo, intervalo, pagina, itens, total_paginas, fatia_mae = futuro.result()
+                except Exception as e:
+                    print(f"  Erro: a página {pagina} da fatia {intervalo[0]} a {intervalo[1]} não carregou "
+                          f"após {TENTATIVAS_PAGINA} tentativa(s): {e}")
+                    self.falhas.append((intervalo, pagina))
+                    self.metricas.contar('paginas_busca_perdidas')
+                    if fatia_mae is None:
+                        continue
+                    tipo, itens, total_paginas = 'sondagem', None, None
+                if tipo == 'pagina':
+                    paginas[(intervalo, pagina)] = itens
+                elif fatia_mae is None:
+                    tratar_sondagem(intervalo, itens, total_paginas)
+                else:
+                    # As metades de uma fatia dividida são tratadas juntas, depois que ambas foram sondadas.
+                    sondagens = metades.setdefault(fatia_mae, [])
+                    sondagens.append(None if itens is None else (intervalo, itens, total_paginas))
+                    if len(sondagens) < 2:
+                        continue
+                    if filtro_ignorado(fatia_mae, sondagens):
+                        for pendente in pendentes:
+                            pendente.cancel()
+                        raise FiltroDatasIgnorado(
+                            f"As duas metades de {fatia_mae[0]} a {fatia_mae[1]} trouxeram os mesmos resultados da fatia "
+                            f"inteira: o site ignorou os parâmetros {PARAMETRO_DATA_INICIO}/{PARAMETRO_DATA_FIM}.")
+                    for sondagem in filter(None, sondagens):
+                        tratar_sondagem(*sondagem)
+
+        if self.falhas:
+            print(f"  Atenção: {len(self.falhas)} página(s) de busca não carregaram; a lista de notícias está incompleta.")
+
+        resultados = []
+        links_vistos = set()
+        for (intervalo, pagina) in sorted(paginas, key=lambda chave: (-chave[0][0].toordinal(), chave[1])):
+            for titulo, subtitulo, link_noticia in paginas[(intervalo, pagina)]:
+                if not (titulo and link_noticia) or link_noticia in links_vistos:
+                    continue
+                links_vistos.add(link_noticia)
+                resultados.append((titulo, subtitulo, link_noticia))
+        self.metricas.contar('links_duplicados', sum(len(itens) for itens in paginas.values()) - len(resultados))
+        return resultados
+
+    def raspar_noticias(self, itens_busca, gravador_warc=None):
+        """Acessa as notícias listadas em paralelo (um Firefox por thread) e retorna um `LoteNoticias`."""
+        gravador_warc = gravador_warc or self.gravador_warc
+        def raspar(item):
+            titulo, subtitulo, link_noticia = item
+            inicio_noticia = time.perf_counter()
+            self.metricas.pausa(1.5)
+            detalhes = raspar_detalhes_noticia(self._driver(), link_noticia, self.metricas, self.url_base, gravador_warc)
+            self.metricas.contar('noticias_coletadas')
+            self.metricas.observar('noticia_total', time.perf_counter() - inicio_noticia)
+            return Noticia.de_dict({'titulo': titulo, 'subtitulo': subtitulo, 'link_noticia': link_noticia, **detalhes})
+
+        # O mesmo pool da busca: as threads reaproveitam os navegadores já abertos, sem abrir outros `workers`.
+        return LoteNoticias.de_noticias(self.executor.map(raspar, itens_busca))
+
+    def fechar(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        for driver in self.drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        self.drivers = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fechar()
+
+
+def raspar_noticias_fatiadas(termo_busca, metricas=None, url_base=URL_BASE, workers=4, limite_paginas=LIMITE_PAGINAS_PADRAO,
+                             data_inicial=DATA_INICIAL_PADRAO, data_final=None, headless=True, limite_noticias=None,
+                             gravador_warc=None, enxuto=False):
+    """
+    Equivalente a `raspar_noticias_otempo`, mas com a busca dividida em fatias de datas percorridas
+    em paralelo por `workers` navegadores. `limite_noticias` mantém as notícias das fatias mais recentes.
+    """
+    if metricas is None:
+        metricas = Instrumentacao()
+    proxy = ProxyEnxuto().iniciar() if enxuto else None
+    try:
+        with PlanejadorBusca(termo_busca, url_base, workers, limite_paginas, data_inicial, data_final, headless,
+                             proxy.porta if proxy else None, metricas, gravador_warc) as planejador:
+            print(f"\n--- Planejando a busca por '{termo_busca}' de {planejador.data_inicial} a {planejador.data_final} "
+                  f"com {workers} navegador(es) ---")
+            with metricas.etapa('planejar_busca'):
+                itens_busca = planejador.listar_resultados()
+            print(f"{len(itens_busca)} notícias distintas em {len(planejador.fatias)} fatia(s) de datas.")
+            if limite_noticias is not None:
+                itens_busca = itens_busca[:limite_noticias]
+            return planejador.raspar_noticias(itens_busca)
+    finally:
+        if gravador_warc is not None:
+            gravador_warc.fechar()
+        if proxy is not None:
+            proxy.parar()
+            for nome, valor in proxy.resumo().items():
+                metricas.contar(f'proxy_{nome}', valor)
+
+
+if __name__ == "__main__":
+    from otemposcrapern13 import nome_arquivo_csv, salvar_metricas, salvar_noticias_csv
+
+    parser = argparse.ArgumentParser(description="Raspa uma busca ampla dividindo-a em fatias de datas percorridas em paralelo.")
+    parser.add_argument('termo', help="Termo de busca.")
+    parser.add_argument('--workers', type=int, default=4, help="Navegadores em paralelo (padrão: 4).")
+    parser.add_argument('--limite-paginas', type=int, default=LIMITE_PAGINAS_PADRAO,
+                        help=f"Limite de paginação do site; fatias que o atingem são divididas (padrão: {LIMITE_PAGINAS_PADRAO}).")
+    parser.add_argument('--desde', type=date.fromisoformat, default=DATA_INICIAL_PADRAO, help="Data inicial (AAAA-MM-DD).")
+    parser.add_argument('--ate', type=date.fromisoformat, default=None, help="Data final (AAAA-MM-DD, padrão: hoje).")
+    parser.add_argument('--noticias', type=int, default=None, help="Número máximo de notícias (as mais recentes).")
+    parser.add_argument('--saida', default=None, help="Arquivo CSV de saída (padrão: noticias_otempo_<termo>_separado.csv).")
+    args = parser.parse_args()
+
+    metricas = Instrumentacao()
+    try:
+        noticias = raspar_noticias_fatiadas(args.termo, metricas, workers=args.workers, limite_paginas=args.limite_paginas,
+                                            data_inicial=args.desde, data_final=args.ate, limite_noticias=args.noticias)
+    except FiltroDatasIgnorado as e:
+        print(f"\nErro: {e}")
+        sys.exit(1)
+    if noticias:
+        csv_file_path = args.saida or nome_arquivo_csv(args.termo)
+        salvar_noticias_csv(noticias, csv_file_path, metricas)
+        salvar_metricas(metricas, csv_file_path)
+    else:
+        print(f"\nNenhuma notícia foi raspada para o termo '{args.termo}'.")
+    if metricas.contadores.get('paginas_busca_perdidas'):
+        sys.exit(1)
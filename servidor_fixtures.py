@@ -0,0 +1,199 @@
+import os
+import sys
+import math
+import threading
+import time
+from datetime import date
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from string import Template
+from urllib.parse import parse_qs, urlparse
+
+from corpus_sintetico import gerar_noticia
+from noticia import MESES
+
+"""
+Documentação do Script: servidor_fixtures.py
+
+Propósito:
+----------
+Servidor HTTP local que imita o portal O Tempo para testes e benchmarks offline do raspador.
+As páginas são montadas a partir dos modelos HTML da pasta `fixtures/`, que reproduzem as
+classes e IDs lidos por `otemposcrapern13.py`, com conteúdo gerado por `corpus_sintetico.py`.
+
+Rotas:
+------
+-   `/busca?q=<termo>&page=<n>`: página de resultados (8 notícias por página, como no site).
+    Aceita `data_inicio`/`data_fim` (AAAA-MM-DD) para filtrar as notícias por período e, com
+    `limite_paginas`, imita o limite de paginação profunda do site: o paginador nunca informa
+    nem serve mais do que `limite_paginas` páginas.
+-   `/noticias/materia-<id>`: página de uma notícia.
+
+A latência de cada resposta é configurável, para simular a rede e o tempo de resposta do site.
+
+Uso:
+----
+    python servidor_fixtures.py 8000 0.2   # porta 8000, 200 ms de latência por resposta
+
+    # ou, dentro de outro script:
+    with ServidorFixtures(total_paginas=5, latencia=0.1) as servidor:
+        raspar_noticias_otempo('teste', url_base=servidor.url_base, interativo=False, headless=True)
+"""
+
+PASTA_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+NOTICIAS_POR_PAGINA = 8
+
+
+def _carregar_modelo(nome):
+    with open(os.path.join(PASTA_FIXTURES, nome), encoding='utf-8') as arquivo:
+        return Template(arquivo.read())
+
+
+def _dia_noticia(indice):
+    """Data de publicação da notícia sintética `indice` (a mesma exibida na página da notícia)."""
+    dia, _, mes, _, ano = gerar_noticia(indice, url_base='', taxa_erro=0)['data_pura'].split()
+    return date(int(ano), MESES.index(mes) + 1, int(dia))
+
+
+class _ManipuladorFixtures(BaseHTTPRequestHandler):
+    """Responde às rotas de busca e de notícia a partir dos modelos de `fixtures/`."""
+
+    # Preenchidos por ServidorFixtures ao criar a classe do servidor.
+    total_paginas = 1
+    limite_paginas = None
+    latencia = 0.0
+    modelos = {}
+    dias = []
+
+    def log_message(self, format, *args):
+        pass  # Silencia o log de cada requisição no terminal.
+
+    def do_GET(self):
+        if self.latencia:
+            time.sleep(self.latencia)
+
+        url = urlparse(self.path)
+        if url.path == '/busca':
+            parametros = parse_qs(url.query)
+            try:
+                pagina = int(parametros.get('page', ['1'])[0])
+                inicio = date.fromisoformat(parametros['data_inicio'][0]) if 'data_inicio' in parametros else date.min
+                fim = date.fromisoformat(parametros['data_fim'][0]) if 'data_fim' in parametros else date.max
+            except ValueError:
+                self.send_error(400)
+                return
+            corpo = self._pagina_busca(pagina, inicio, fim)
+        elif url.path.startswith('/noticias/materia-'):
+            try:
+                indice = int(url.path.rsplit('-', 1)[1])
+            except ValueError:
+                self.send_error(404)
+                return
+            corpo = self._pagina_noticia(indice)
+        else:
+            self.send_error(404)
+            return
+
+        dados = corpo.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(dados)))
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def _pagina_busca(self, pagina, inicio, fim):
+        indices = [indice for indice, dia in enumerate(self.dias) if inicio <= dia <= fim]
+        total_paginas = math.ceil(len(indices) / NOTICIAS_POR_PAGINA)
+        if self.limite_paginas is not None:
+            total_paginas = min(total_paginas, self.limite_paginas)
+        itens = []
+        if 1 <= pagina <= total_paginas:
+            primeiro = (pagina - 1) * NOTICIAS_POR_PAGINA
+            for indice in indices[primeiro:primeiro + NOTICIAS_POR_PAGINA]:
+                noticia = gerar_noticia(indice, url_base='')
+                itens.append(self.modelos['item'].substitute(
+                    link=noticia['link_noticia'],
+                    titulo=escape(noticia['titulo']),
+                    subtitulo=escape(noticia['subtitulo']),
+                ))
+        # O paginador usa índice base 0 em data-page (como o Algolia no site).
+        paginador = '\n'.join(
+            f'      <a class="pagination__link{" active" if p == pagina else ""}" data-page="{p - 1}" href="/busca?page={p}">{p}</a>'
+            for p in range(max(1, pagina - 2), min(total_paginas, pagina + 2) + 1)
+        )
+        return self.modelos['busca'].substitute(
+            itens='\n'.join(itens), pagina=pagina, total_paginas=total_paginas, paginador=paginador,
+        )
+
+    def _pagina_noticia(self, indice):
+        noticia = gerar_noticia(indice, url_base='', taxa_erro=0)
+        data_pura = noticia['data_pura']
+        paragrafos = '\n'.join(f'        <p>{escape(p)}</p>' for p in noticia['texto_completo'].split('\n'))
+        tags = '\n'.join(
+            f'        <li><a class="label__tag" href="/tag/{i}">{escape(tag)}</a></li>'
+            for i, tag in enumerate(noticia['tags_noticia'].split(', '))
+        )
+        video = '      <video src="/videos/exemplo.mp4"></video>' if noticia['tem_video'] else ''
+        return self.modelos['noticia'].substitute(
+            titulo=escape(noticia['titulo']),
+            subtitulo=escape(noticia['subtitulo']),
+            reporter=escape(noticia['nome_reporter']),
+            data=data_pura,
+            horario=noticia['horario'],
+            imagem=noticia['link_imagem_principal'],
+            paragrafos=paragrafos,
+            video=video,
+            tags=tags,
+        )
+
+
+class ServidorFixtures:
+    """Servidor local em uma thread própria; use como gerenciador de contexto (`with`)."""
+
+    def __init__(self, porta=0, total_paginas=5, latencia=0.0, limite_paginas=None):
+        atributos = {
+            'total_paginas': total_paginas,
+            'limite_paginas': limite_paginas,
+            'latencia': latencia,
+            'dias': [_dia_noticia(indice) for indice in range(total_paginas * NOTICIAS_POR_PAGINA)],
+            'modelos': {
+                'busca': _carregar_modelo('busca.html'),
+                'item': _carregar_modelo('item_busca.html'),
+                'noticia': _carregar_modelo('noticia.html'),
+            },
+        }
+        manipulador = type('ManipuladorConfigurado', (_ManipuladorFixtures,), atributos)
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', porta), manipulador)
+        self.thread = None
+
+    @property
+    def url_base(self):
+        host, porta = self.servidor.server_address[:2]
+        return f"http://{host}:{porta}"
+
+    def iniciar(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def parar(self):
+        self.servidor.shutdown()
+        self.servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.parar()
+
+
+if __name__ == "__main__":
+    porta = int(sys.argv[1]) if len(sys.argv) > 1 else 8000
+    latencia = float(sys.argv[2]) if len(sys.argv) > 2 else 0.0
+    servidor = ServidorFixtures(porta=porta, latencia=latencia)
+    print(f"Servidor de fixtures em {servidor.url_base} (latência de {latencia} s). Ctrl+C para encerrar.")
+    try:
+        servidor.servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.servidor.server_close()
@@ -0,0 +1,259 @@
+import csv
+
+import numpy as np
+from scipy import sparse
+
+from noticia import interpretar_data
+from tokenizacao import carregar_stopwords, clean_and_tokenize
+
+"""
+Documentação do Script: termos_em_alta.py
+
+Propósito:
+----------
+Motor de "termos em alta" baseado em TF-IDF esparso, organizado por janelas de tempo (meses).
+Em vez de uma única lista global das 50 palavras mais frequentes (em que termos genéricos
+do noticiário dominam), o motor identifica:
+-   **Termos distintivos:** os termos que caracterizam cada mês em relação ao corpus inteiro.
+-   **Termos emergentes:** os termos cujo peso mais cresceu de um mês para o seguinte.
+
+Funcionamento:
+--------------
+-   O texto de cada notícia é tokenizado com as mesmas regras de `50_palavras21.py`
+    (ver `tokenizacao.py`), de modo que os resultados das duas análises são comparáveis.
+-   A matriz documento-termo é esparsa (`scipy.sparse`), guardada em um bloco por mês.
+-   Novos documentos são adicionados de forma incremental com `adicionar_periodo`: apenas os
+    documentos novos são vetorizados. O vocabulário cresce e os blocos antigos apenas
+    ganham colunas vazias; o IDF é recalculado a partir do vetor de frequência
+    de documentos, sem reprocessar nenhum texto. `construir_motor` reconhece as notícias
+    já indexadas pelo link, então notícias que chegam atrasadas a um mês já indexado
+    entram no bloco desse mês.
+-   Os termos emergentes de um mês são calculados em relação ao mês anterior do calendário;
+    meses sem o mês anterior no corpus (lacunas na coleta) não são comparados.
+
+Pré-requisitos:
+---------------
+    pip install pandas numpy scipy nltk
+"""
+
+def periodo_mensal(data_pura):
+    """
+    Converte uma data no formato do site (ex: "11 de junho de 2025") para o período
+    mensal "2025-06". Retorna None se a data não puder ser interpretada.
+    """
+    data = interpretar_data(data_pura) if isinstance(data_pura, str) else None
+    return data.strftime('%Y-%m') if data else None
+
+
+def mes_anterior(periodo):
+    """Período mensal anterior no calendário ("2025-01" -> "2024-12"); None se o período não for um mês."""
+    try:
+        ano, mes = (int(parte) for parte in periodo.split('-'))
+    except (AttributeError, ValueError):
+        return None
+    return f"{ano - 1}-12" if mes == 1 else f"{ano}-{mes - 1:02d}"
+
+
+class MotorTermosEmAlta:
+    """
+    Matriz TF-IDF esparsa do corpus, particionada por período (mês).
+    Cada período guarda apenas as contagens brutas dos seus documentos (CSR);
+    os pesos TF-IDF são calculados sob demanda a partir do IDF atual.
+    """
+
+    def __init__(self, stop_words=None, n=1):
+        self.stop_words = stop_words if stop_words is not None else carregar_stopwords()
+        self.n = n
+        self.vocabulario = {}  # termo -> índice da coluna
+        self.termos = []       # índice da coluna -> termo
+        self.blocos = {}       # período -> matriz CSR (documentos x termos) com contagens
+        self.frequencia_documentos = np.zeros(0, dtype=np.int64)
+        self.total_documentos = 0
+        self.documentos_indexados = set()  # chaves (links) das notícias já indexadas por construir_motor
+
+    def _tokens(self, texto):
+        palavras = clean_and_tokenize(texto, self.stop_words)
+        if self.n == 1:
+            return palavras
+        return [' '.join(palavras[i:i + self.n]) for i in range(len(palavras) - self.n + 1)]
+
+    def _vetorizar(self, textos):
+        """Vetoriza apenas os textos recebidos, ampliando o vocabulário quando necessário."""
+        indices = []
+        dados = []
+        indptr = [0]
+        for texto in textos:
+            contagem = {}
+            if isinstance(texto, str):
+                for termo in self._tokens(texto):
+                    coluna = self.vocabulario.get(termo)
+                    if coluna is None:
+                        coluna = len(self.termos)
+                        self.vocabulario[termo] = coluna
+                        self.termos.append(termo)
+                    contagem[coluna] = contagem.get(coluna, 0) + 1
+            indices.extend(contagem.keys())
+            dados.extend(contagem.values())
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (np.asarray(dados, dtype=np.float64), np.asarray(indices, dtype=np.int64), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(textos), len(self.termos)),
+        )
+
+    def _ajustar_colunas(self, matriz):
+        """Amplia a matriz com colunas vazias para o tamanho atual do vocabulário (sem cópia dos dados)."""
+        if matriz.shape[1] == len(self.termos):
+            return matriz
+        return sparse.csr_matrix((matriz.data, matriz.indices, matriz.indptr), shape=(matriz.shape[0], len(self.termos)))
+
+    def adicionar_periodo(self, periodo, textos):
+        """
+        Adiciona os textos de um período ao motor. Só os textos novos são vetorizados;
+        se o período já existir, os documentos são acrescentados ao bloco existente.
+        """
+        textos = list(textos)
+        if not textos:
+            return
+        novo_bloco = self._vetorizar(textos)
+
+        presenca = np.bincount(novo_bloco.indices, minlength=len(self.termos))
+        if len(self.frequencia_documentos) < len(self.termos):
+            self.frequencia_documentos = np.concatenate(
+                [self.frequencia_documentos, np.zeros(len(self.termos) - len(self.frequencia_documentos), dtype=np.int64)]
+            )
+        self.frequencia_documentos += presenca
+        self.total_documentos += novo_bloco.shape[0]
+
+        if periodo in self.blocos:
+            anterior = self._ajustar_colunas(self.blocos[periodo])
+            self.blocos[periodo] = sparse.vstack([anterior, novo_bloco], format='csr')
+        else:
+            self.blocos[periodo] = novo_bloco
+
+    def periodos(self):
+        return sorted(self.blocos)
+
+    def idf(self):
+        """IDF suavizado: log((1 + N) / (1 + df)) + 1."""
+        return np.log((1 + self.total_documentos) / (1 + self.frequencia_documentos)) + 1
+
+    def _tfidf(self, matriz, idf):
+        """Aplica o IDF e normaliza cada documento (norma L2)."""
+        ponderada = self._ajustar_colunas(matriz).multiply(idf).tocsr()
+        normas = np.sqrt(np.asarray(ponderada.multiply(ponderada).sum(axis=1)).ravel())
+        normas[normas == 0] = 1
+        return sparse.diags(1 / normas).dot(ponderada).tocsr()
+
+    def matriz_tfidf(self):
+        """Retorna a matriz TF-IDF completa (todos os períodos, em ordem cronológica)."""
+        idf = self.idf()
+        blocos = [self._tfidf(self.blocos[p], idf) for p in self.periodos()]
+        if not blocos:
+            return sparse.csr_matrix((0, len(self.termos)))
+        return sparse.vstack(blocos, format='csr')
+
+    def _perfis(self):
+        """Peso TF-IDF médio de cada termo em cada período (um vetor denso por período)."""
+        idf = self.idf()
+        return {p: np.asarray(self._tfidf(self.blocos[p], idf).mean(axis=0)).ravel() for p in self.periodos()}
+
+    def termos_distintivos(self, top_n=20):
+        """Para cada período, os termos de maior peso TF-IDF médio."""
+        resultado = {}
+        for periodo, perfil in self._perfis().items():
+            ordem = np.argsort(perfil)[::-1][:top_n]
+            resultado[periodo] = [(self.termos[i], float(perfil[i])) for i in ordem if perfil[i] > 0]
+        return resultado
+
+    def termos_emergentes(self, top_n=20):
+        """
+        Para cada mês, os termos cujo peso TF-IDF médio mais cresceu em relação ao mês anterior
+        do calendário. Meses cujo mês anterior não está no corpus ficam de fora.
+        """
+        perfis = self._perfis()
+        resultado = {}
+        for atual in perfis:
+            anterior = mes_anterior(atual)
+            if anterior not in perfis:
+                continue
+            diferenca = perfis[atual] - perfis[anterior]
+            ordem = np.argsort(diferenca)[::-1][:top_n]
+            resultado[atual] = [(self.termos[i], float(diferenca[i])) for i in ordem if diferenca[i] > 0]
+        return resultado
+
+
+def construir_motor(df, coluna='texto_completo', motor=None, n=1):
+    """
+    Agrupa o DataFrame por mês de publicação (coluna 'data' ou, se ausente, 'data_pura') e alimenta o motor.
+    Se um motor já existente for passado, apenas as notícias ainda não indexadas (pelo 'link_noticia' ou,
+    sem essa coluna, pelo próprio texto) são adicionadas, inclusive as que chegam a meses já indexados.
+    """
+    if motor is None:
+        motor = MotorTermosEmAlta(n=n)
+    if 'data' in df.columns: # Notícias lidas com noticia.py: a data já vem interpretada.
+        periodos = df['data'].dt.strftime('%Y-%m')
+    else:
+        periodos = df['data_pura'].map(periodo_mensal)
+    chaves = df['link_noticia'] if 'link_noticia' in df.columns else df[coluna]
+    for periodo, grupo in df[coluna].groupby(periodos):
+        grupo = grupo.dropna()
+        novos = [(chave, texto) for chave, texto in zip(chaves[grupo.index], grupo) if chave not in motor.documentos_indexados]
+        if not novos:
+            continue
+        motor.adicionar_periodo(periodo, [texto for _, texto in novos])
+        motor.documentos_indexados.update(chave for chave, _ in novos)
+    return motor
+
+
+def _imprimir_tabela(titulo, resultado):
+    print(f"\n--- {titulo} ---")
+    for periodo, termos in resultado.items():
+        print(f"\n{periodo}")
+        print("Termo           | Peso")
+        print("---------------------------------")
+        for termo, peso in termos:
+            print(f"{termo:<17} | {peso:.4f}")
+
+
+def analisar_termos_em_alta():
+    """
+    Lê um CSV gerado pela raspagem, calcula termos distintivos e emergentes por mês
+    e salva os resultados em '<arquivo>_termos_em_alta.csv'.
+    """
+    import pandas as pd
+
+    csv_file_path = input("Por favor, digite o NOME COMPLETO do arquivo CSV a ser analisado (ex: noticias_otempo_cafe_com_politica_separado.csv): ")
+
+    print(f"\nTentando ler o arquivo CSV: {csv_file_path}")
+
+    try:
+        df = pd.read_csv(csv_file_path, encoding='utf-8')
+        print("\nArquivo CSV lido com sucesso!")
+
+        motor = construir_motor(df)
+        print(f"\n{motor.total_documentos} notícias indexadas em {len(motor.blocos)} meses; vocabulário com {len(motor.termos)} termos.")
+
+        distintivos = motor.termos_distintivos()
+        emergentes = motor.termos_emergentes()
+        _imprimir_tabela("Termos distintivos por mês", distintivos)
+        _imprimir_tabela("Termos emergentes (em relação ao mês anterior)", emergentes)
+
+        results_csv_path = f"{csv_file_path.rsplit('.', 1)[0]}_termos_em_alta.csv"
+        with open(results_csv_path, mode='w', newline='', encoding='utf-8') as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=['Tipo de Análise', 'Período', 'Termo', 'Peso'])
+            writer.writeheader()
+            for tipo, resultado in (('Termos distintivos', distintivos), ('Termos emergentes', emergentes)):
+                for periodo, termos in resultado.items():
+                    for termo, peso in termos:
+                        writer.writerow({'Tipo de Análise': tipo, 'Período': periodo, 'Termo': termo, 'Peso': round(peso, 6)})
+        print(f"\nResultados salvos em '{results_csv_path}'")
+
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{csv_file_path}' não foi encontrado.")
+        print("Verifique se o nome digitado está correto e se o arquivo está na mesma pasta do script.")
+    except Exception as e:
+        print(f"Ocorreu um erro ao ler ou processar o arquivo CSV: {e}")
+
+
+if __name__ == "__main__":
+    analisar_termos_em_alta()
@@ -0,0 +1,65 @@
+import os
+import re
+
+"""
+Regras de limpeza e tokenização compartilhadas pelas análises textuais.
+
+Antes estas regras viviam dentro de `encontrar_palavras_mais_usadas` (50_palavras21.py).
+Foram movidas para cá para que outras análises (como o motor de termos em alta)
+usem exatamente os mesmos critérios de limpeza e as mesmas stopwords.
+"""
+
+# Stopwords adicionais, além da lista padrão do NLTK para o português.
+STOPWORDS_EXTRAS = ['tempo', 'de acordo', 'noticia', 'notícias', 'diz', 'vai', 'pode', 'anos', 'um', 'uma', 'dois', 'duas', 'ser', 'ter', 'fazer', 'são', 'deve', 'feira', 'conforme', 'segundo', 'em'] # Adicionado 'em' também, que é muito comum.
+
+# Cópia local da lista de stopwords do NLTK: evita importar o NLTK (lento) a cada execução.
+CAMINHO_CACHE_STOPWORDS = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'stopwords_portuguese.txt')
+
+PADRAO_CARACTERES_INVALIDOS = re.compile(r'[^a-zA-ZáéíóúãõâêôàçüÁÉÍÓÚÃÕÂÊÔÀÇÜ\s-]')
+
+
+def carregar_stopwords():
+    """
+    Retorna o conjunto de stopwords em português do NLTK acrescido de STOPWORDS_EXTRAS.
+    A lista do NLTK é lida de CAMINHO_CACHE_STOPWORDS; só na primeira execução o NLTK é
+    importado (e a lista baixada, se necessário) para criar essa cópia local.
+    """
+    try:
+        with open(CAMINHO_CACHE_STOPWORDS, encoding='utf-8') as arquivo:
+            stop_words_pt = set(arquivo.read().split('\n'))
+    except FileNotFoundError:
+        stop_words_pt = _stopwords_nltk()
+        try:
+            os.makedirs(os.path.dirname(CAMINHO_CACHE_STOPWORDS), exist_ok=True)
+            with open(CAMINHO_CACHE_STOPWORDS, mode='w', encoding='utf-8') as arquivo:
+                arquivo.write('\n'.join(sorted(stop_words_pt)))
+        except OSError as e:
+            print(f"Aviso: Não foi possível salvar a cópia local das stopwords. Erro: {e}")
+
+    stop_words_pt.update(STOPWORDS_EXTRAS)
+    return stop_words_pt
+
+
+def _stopwords_nltk():
+    import nltk
+    from nltk.corpus import stopwords
+
+    # Garante que as stopwords do NLTK foram baixadas.
+    try:
+        stopwords.words('portuguese')
+    except LookupError:
+        print("Baixando stopwords do NLTK. Isso só acontecerá uma vez.")
+        nltk.download('stopwords')
+
+    return set(stopwords.words('portuguese'))
+
+
+def clean_and_tokenize(text, stop_words):
+    """
+    Remove pontuação e números, converte para minúsculas e descarta stopwords
+    e palavras com até 2 letras. Retorna a lista de palavras restantes.
+    """
+    clean_text = PADRAO_CARACTERES_INVALIDOS.sub('', text).lower()
+    words = clean_text.split()
+    filtered_words = [word for word in words if word not in stop_words and len(word) > 2]
+    return filtered_words
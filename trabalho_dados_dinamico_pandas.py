@@ -1,44 +1,110 @@
-import pandas as pd
-import locale
 import re
+from noticia import MESES, STRINGS_DE_ERRO, formatar_tags, interpretar_data
 
-import matplotlib.pyplot as plt
-import platform
-try:
-    plt.rcParams['font.family'] = 'DejaVu Sans'
-    plt.rcParams['font.sans-serif'] = ['DejaVu Sans']
-except Exception as e:
-    print(f"Aviso: Não foi possível configurar a fonte para 'DejaVu Sans'. Acentuação em gráficos pode não aparecer. Erro: {e}")
+# Este script não gera gráficos; por isso o Matplotlib não é mais importado aqui
+# (a importação e a configuração de fontes custavam segundos a cada execução).
+# O pandas é importado apenas dentro das funções que o usam, como em 50_palavras21.py,
+# para que importar este módulo (ex: pelo otempo.py ou pelo benchmark.py) seja rápido.
+
+
+def adicionar_colunas_de_data(df):
+    """
+    Acrescenta 'data_dt' (data de publicação), 'ano_publicacao', 'mes_publicacao' e 'mes_numero'.
+    Retorna o DataFrame. Usa a coluna 'data' já interpretada (notícias lidas com noticia.py); sem ela,
+    interpreta 'data_pura' (ex: "11 de junho de 2025") com `noticia.interpretar_data`, sem depender do locale.
+    """
+    import pandas as pd
+
+    if 'data' in df.columns:
+        df['data_dt'] = df['data'].dt.normalize()
+    else:
+        df['data_dt'] = pd.to_datetime(df['data_pura'].map(lambda texto: interpretar_data(texto) if isinstance(texto, str) else None))
+
+    df['ano_publicacao'] = df['data_dt'].dt.year.astype('Int64')
+    df['mes_publicacao'] = df['data_dt'].dt.month.map(dict(enumerate(MESES, start=1))) # Nomes em português, sem depender do locale
+    df['mes_numero'] = df['data_dt'].dt.month
+    return df
+
+
+def limpar_dados(df):
+    """
+    Remove linhas sem título ou link, troca as strings de erro do raspador por valores nulos
+    e descarta colunas completamente vazias. Retorna o DataFrame limpo.
+    """
+    import pandas as pd
+
+    print("\n--- Iniciando limpeza de dados inconsistentes ---")
+
+    linhas_antes = len(df)
+    df.dropna(subset=['titulo', 'link_noticia'], inplace=True)
+    linhas_depois = len(df)
+    if linhas_antes > linhas_depois:
+        print(f"  Removidas {linhas_antes - linhas_depois} linhas com título ou link ausentes.")
+
+    df.replace(list(STRINGS_DE_ERRO), pd.NA, inplace=True)
+    print("  Strings de erro substituídas por valores nulos (NaN).")
+
+    cols_before_drop_empty = df.shape[1]
+    df.dropna(axis=1, how='all', inplace=True)
+    cols_after_drop_empty = df.shape[1]
+    if cols_before_drop_empty > cols_after_drop_empty:
+        print(f"  Removidas {cols_before_drop_empty - cols_after_drop_empty} colunas que estavam completamente vazias.")
+
+    print("--- Limpeza de dados concluída ---")
+    return df
+
+
+def limpar_csv_noticias(csv_file_path):
+    """
+    Aplica apenas a limpeza de dados e salva o resultado em '<arquivo>_limpo.csv'.
+    Retorna True se o arquivo limpo foi salvo e False em caso de erro (já exibido no terminal).
+    """
+    import pandas as pd
+
+    output_csv_file_path = f"{csv_file_path.rsplit('.', 1)[0]}_limpo.csv"
     try:
-        if 'Windows' in platform.system():
-            plt.rcParams['font.family'] = 'Arial'
-            plt.rcParams['font.sans-serif'] = ['Arial']
-    except Exception as e_fallback:
-        print(f"Aviso: Fallback para Arial também falhou. Gráficos podem ter problemas de acentuação. Erro: {e_fallback}")
+        df = pd.read_csv(csv_file_path, encoding='utf-8')
+        df = limpar_dados(df)
+        df.to_csv(output_csv_file_path, index=False, encoding='utf-8')
+        print(f"\nDados limpos salvos em '{output_csv_file_path}' ({len(df)} linhas).")
+        return True
+    except FileNotFoundError:
+        print(f"Erro: O arquivo '{csv_file_path}' não foi encontrado.")
+    except Exception as e:
+        print(f"Ocorreu um erro ao ler ou processar o arquivo CSV: {e}")
+    return False
 
 
-def processar_csv_noticias():
+def processar_csv_noticias(csv_file_path=None):
     """
     Processa um arquivo CSV de notícias, realiza limpeza de dados,
     converte e analisa a coluna de data para análises temporais (anual e mensal).
-    Permite ao usuário especificar o nome do arquivo CSV.
+    Se `csv_file_path` não for informado, o nome do arquivo é pedido ao usuário.
+    O arquivo é lido com `carregar_noticias` (noticia.py), que interpreta as datas uma única vez;
+    aceita também um arquivo `.parquet` gravado por `LoteNoticias`, com as datas já interpretadas.
+    Retorna True se a análise e todos os arquivos de saída foram gravados, e False em caso de erro
+    (já exibido no terminal), para que o `otempo.py` encerre com código de erro.
     """
-    csv_file_name_input = input("Por favor, digite o NOME COMPLETO do arquivo CSV a ser analisado (ex: noticias_otempo_cafe_com_politica_separado.csv): ")
+    import pandas as pd
+    from noticia import carregar_noticias
 
-    csv_file_path = csv_file_name_input
+    if csv_file_path is None:
+        csv_file_path = input("Por favor, digite o NOME COMPLETO do arquivo CSV a ser analisado (ex: noticias_otempo_cafe_com_politica_separado.csv): ")
 
-    base_name = csv_file_name_input.rsplit('.', 1)[0]
+    base_name = csv_file_path.rsplit('.', 1)[0]
     output_csv_file_path = f"{base_name}_analisadas.csv"
     
     # Nomes para os arquivos CSV das análises
     output_monthly_count_csv = f"{base_name}_contagem_mensal.csv"
     output_yearly_count_csv = f"{base_name}_contagem_anual.csv"
-
+    sucesso = True
 
     print(f"\nTentando ler o arquivo CSV: {csv_file_path}")
 
     try:
-        df = pd.read_csv(csv_file_path, encoding='utf-8')
+        df = carregar_noticias(csv_file_path).para_pandas()
+        # Tags de volta ao formato de texto do CSV, para o arquivo de saída.
+        df['tags_noticia'] = df['tags'].map(formatar_tags)
 
         print("\nArquivo CSV lido com sucesso!")
         print("\n--- Primeiras 5 linhas do DataFrame (original) ---")
@@ -48,60 +114,20 @@ def processar_csv_noticias():
         df.info()
 
         # === INÍCIO DA LIMPEZA DE DADOS INCONSISTENTES ===
-        print("\n--- Iniciando limpeza de dados inconsistentes ---")
-
-        linhas_antes = len(df)
-        df.dropna(subset=['titulo', 'link_noticia'], inplace=True)
-        linhas_depois = len(df)
-        if linhas_antes > linhas_depois:
-            print(f"  Removidas {linhas_antes - linhas_depois} linhas com título ou link ausentes.")
-
-        df.replace("Erro ao coletar data", pd.NA, inplace=True)
-        df.replace("Erro", pd.NA, inplace=True)
-        df.replace("Erro ao coletar texto", pd.NA, inplace=True)
-        df.replace("Erro ao coletar imagem", pd.NA, inplace=True)
-        df.replace("Erro ao coletar repórter", pd.NA, inplace=True)
-        df.replace("Erro ao coletar tags", pd.NA, inplace=True)
-        print("  Strings de erro substituídas por valores nulos (NaN).")
-
-        cols_before_drop_empty = df.shape[1]
-        df.dropna(axis=1, how='all', inplace=True)
-        cols_after_drop_empty = df.shape[1]
-        if cols_before_drop_empty > cols_after_drop_empty:
-            print(f"  Removidas {cols_before_drop_empty - cols_after_drop_empty} colunas que estavam completamente vazias.")
-
-        print("--- Limpeza de dados concluída ---")
+        df = limpar_dados(df)
         print("\n--- Informações do DataFrame após limpeza ---")
         print(df.info())
         # === FIM DA LIMPEZA DE DADOS INCONSISTENTES ===
 
 
         # === ANÁLISE TEMPORAL: CONVERSÃO PARA DATETIME E AGRUPAMENTO ===
-        print("\n--- Análise Temporal: Convertendo 'data_pura' para datetime ---")
-        try:
-            locale.setlocale(locale.LC_TIME, 'Portuguese_Brazil.1252')
-        except locale.Error:
-            try:
-                locale.setlocale(locale.LC_TIME, 'pt_BR.utf8')
-            except locale.Error:
-                print("Aviso: Não foi possível configurar o local para português. Análises temporais podem ser afetadas.")
-                pass
-
-        df['data_para_dt'] = df['data_pura'].astype(str).str.replace(' de ', ' ', regex=False)
-        df['data_dt'] = pd.to_datetime(df['data_para_dt'], format='%d %B %Y', errors='coerce')
-        df = df.drop(columns=['data_para_dt'])
-
-        df['ano_publicacao'] = df['data_dt'].dt.year.astype('Int64')
-        df['mes_publicacao'] = df['data_dt'].dt.strftime('%B')
-        df['mes_numero'] = df['data_dt'].dt.month
+        print("\n--- Análise Temporal: Datas de publicação ---")
+        df = adicionar_colunas_de_data(df)
 
         print("\n--- Contagem de Notícias por Ano e Mês de Publicação ---")
         contagem_por_ano_mes = df.dropna(subset=['data_dt']).groupby(['ano_publicacao', 'mes_publicacao', 'mes_numero']).size().reset_index(name='total_noticias')
 
-        meses_ordem = ['janeiro', 'fevereiro', 'março', 'abril', 'maio', 'junho', 'julho', 'agosto', 'setembro', 'outubro', 'novembro', 'dezembro']
-        contagem_por_ano_mes['mes_num'] = contagem_por_ano_mes['mes_publicacao'].apply(lambda x: meses_ordem.index(x.lower()))
-
-        contagem_por_ano_mes_ordenada = contagem_por_ano_mes.sort_values(by=['ano_publicacao', 'mes_num']).drop(columns=['mes_num'])
+        contagem_por_ano_mes_ordenada = contagem_por_ano_mes.sort_values(by=['ano_publicacao', 'mes_numero'])
         print(contagem_por_ano_mes_ordenada)
 
         # === Contagem de Notícias por Mês no Período Específico (Jul/2023 a Jun/2025) ===
@@ -125,6 +151,7 @@ def processar_csv_noticias():
             print(f"  Contagem mensal salva em '{output_monthly_count_csv}'")
         except Exception as e:
             print(f"  Erro ao salvar contagem mensal em CSV: {e}")
+            sucesso = False
         # === FIM DO NOVO ===
 
         # === Contagem de Notícias por Ano ===
@@ -138,6 +165,7 @@ def processar_csv_noticias():
             print(f"  Contagem anual salva em '{output_yearly_count_csv}'")
         except Exception as e:
             print(f"  Erro ao salvar contagem anual em CSV: {e}")
+            sucesso = False
         # === FIM DO NOVO ===
 
 
@@ -146,7 +174,7 @@ def processar_csv_noticias():
         colunas_para_salvar = [
             'titulo', 'subtitulo', 'data_pura', 'horario', 'link_noticia',
             'texto_completo', 'link_imagem_principal', 'tem_video', 'nome_reporter', 'tags_noticia',
-            'data_dt', 'ano_publicacao', 'mes_publicacao', 'mes_numero'
+            'data', 'status', 'data_dt', 'ano_publicacao', 'mes_publicacao', 'mes_numero'
         ]
         cols_to_save_exist = [col for col in colunas_para_salvar if col in df.columns]
         df[cols_to_save_exist].to_csv(output_csv_file_path, index=False, encoding='utf-8')
@@ -159,13 +187,14 @@ def processar_csv_noticias():
         print(df.info())
 
         print("\n--- Contagem de notícias por Data (texto) ---")
-        contagem_por_data = df['data_pura'].value_counts().reset_index(name='total_noticias')
+        coluna_data = 'data_pura' if 'data_pura' in df.columns else 'data_dt'
+        contagem_por_data = df[coluna_data].value_counts().reset_index(name='total_noticias')
         contagem_por_data.columns = ['data_publicacao_limpa', 'total_noticias']
         print(contagem_por_data.sort_values(by='data_publicacao_limpa'))
 
         print("\n--- 5 Notícias mais recentes ---")
         print(df.sort_values(by='data_dt', ascending=False).head()[['titulo', 'data_dt', 'link_noticia']])
-
+        return sucesso
 
     except FileNotFoundError:
         print(f"Erro: O arquivo '{csv_file_path}' não foi encontrado.")
@@ -174,6 +203,7 @@ def processar_csv_noticias():
         print(f"Ocorreu um erro ao ler ou processar o arquivo CSV: {e}")
         # import traceback
         # traceback.print_exc()
+    return False
 
 if __name__ == "__main__":
     processar_csv_noticias()
\ No newline at end of file